@@ -0,0 +1,163 @@
+"""Inicialização enxuta do pygame e carregamento preguiçoso de fontes e
+imagens, compartilhados pelos dois jogos.
+
+Importar os jogos não abre janela nem carrega nada: init_display() liga só
+os subsistemas usados (vídeo e fontes, sem áudio nem joystick), e get_font()
+e load_image() carregam no primeiro uso. Os caminhos das fontes do sistema e
+as imagens já redimensionadas ficam num cache em disco (ASSET_CACHE), então
+a busca nas fontes instaladas e o redimensionamento só acontecem uma vez.
+request_image() faz a leitura da imagem no worker de E/S (io_worker), para
+o loop não esperar o disco; init_display() faz o worker postar IO_DONE a
+cada tarefa concluída, o que acorda um loop parado em pygame.event.wait().
+
+Este módulo importa o pygame sem o pkg_resources: o pygame só o usaria para
+achar os próprios arquivos (tem alternativa embutida), e sozinho ele custa
+dezenas de ms da abertura. Por isso os jogos importam assets antes do pygame.
+"""
+import hashlib
+import json
+import os
+import sys
+
+_block_pkg_resources = "pkg_resources" not in sys.modules
+if _block_pkg_resources:
+    sys.modules["pkg_resources"] = None  # import pkg_resources vira ImportError
+try:
+    import pygame
+finally:
+    if _block_pkg_resources:
+        del sys.modules["pkg_resources"]
+
+from io_worker import get_worker
+
+ASSET_CACHE = os.environ.get("ASSET_CACHE", ".asset_cache")
+FONT_INDEX = "fonts.json"
+
+_fonts = {}
+_font_paths = None
+_images = {}
+_image_jobs = {}
+
+IO_DONE = pygame.event.custom_type()  # Uma tarefa do worker de E/S terminou
+
+
+def _post_io_done():
+    try:
+        pygame.event.post(pygame.event.Event(IO_DONE))
+    except pygame.error:
+        pass  # Janela já fechada
+
+
+def init_display(size, caption):
+    """Liga vídeo e fontes e abre a janela; retorna a Surface da tela"""
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    get_worker().wake = _post_io_done
+    return screen
+
+
+def _cache_path(name):
+    return os.path.join(ASSET_CACHE, name)
+
+
+def _write_cache(name, data):
+    """Grava no cache; falhar (ex.: diretório só de leitura) só perde o cache"""
+    try:
+        os.makedirs(ASSET_CACHE, exist_ok=True)
+        mode = "wb" if isinstance(data, bytes) else "w"
+        with open(_cache_path(name), mode) as f:
+            f.write(data)
+    except OSError:
+        pass
+
+
+def find_font(name):
+    """Caminho da fonte do sistema name (None se não houver), pelo cache em
+    disco; só procura nas fontes instaladas quando o nome não está lá"""
+    global _font_paths
+    if _font_paths is None:
+        try:
+            with open(_cache_path(FONT_INDEX)) as f:
+                _font_paths = json.load(f)
+        except (OSError, ValueError):
+            _font_paths = {}
+    path = _font_paths.get(name)
+    if name not in _font_paths or (path is not None and not os.path.exists(path)):
+        path = _font_paths[name] = pygame.font.match_font(name)
+        _write_cache(FONT_INDEX, json.dumps(_font_paths, indent=1))
+    return path
+
+
+def get_font(size, name=None):
+    """Fonte carregada no primeiro uso; name=None é a fonte padrão do pygame"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        path = find_font(name) if name else None
+        font = _fonts[key] = pygame.font.Font(path, size)
+    return font
+
+
+def _read_image(path, size, alpha):
+    """A parte de load_image que toca o disco; roda em qualquer thread"""
+    if size is None:
+        return pygame.image.load(path)
+    stat = os.stat(path)
+    digest = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{size}".encode()).hexdigest()
+    pixel_format = "RGBA" if alpha else "RGB"
+    name = f"{digest}.{pixel_format.lower()}"
+    try:
+        with open(_cache_path(name), "rb") as f:
+            return pygame.image.frombytes(f.read(), size, pixel_format)
+    except (OSError, ValueError):
+        pass
+    image = pygame.transform.scale(pygame.image.load(path), size)
+    _write_cache(name, pygame.image.tobytes(image, pixel_format))
+    return image
+
+
+def _finish_image(key, image):
+    # convert() só funciona depois de display.set_mode; sem tela, a imagem
+    # não é guardada, para a conversão acontecer quando ela existir
+    if pygame.display.get_surface() is not None:
+        image = _images[key] = image.convert_alpha() if key[2] else image.convert()
+    return image
+
+
+def load_image(path, size=None, alpha=False):
+    """Imagem de path, redimensionada para size, no formato da tela se ela já
+    existir. Levanta OSError/pygame.error se o arquivo não puder ser lido.
+
+    Com size, a versão redimensionada é guardada crua no cache em disco (a
+    chave inclui o tamanho e a data do arquivo), e as próximas execuções a
+    leem direto, sem decodificar nem redimensionar de novo.
+    """
+    key = (path, size, alpha)
+    image = _images.get(key)
+    if image is None:
+        image = _finish_image(key, _read_image(path, size, alpha))
+    return image
+
+
+def request_image(path, size=None, alpha=False):
+    """Como load_image, mas sem esperar o disco: a primeira chamada agenda a
+    leitura no worker de E/S e retorna None, assim como as seguintes até o
+    poll() entregar a imagem. Se a leitura falhou, levanta o erro dela."""
+    key = (path, size, alpha)
+    image = _images.get(key)
+    if image is not None:
+        return image
+    job = _image_jobs.get(key)
+    if job is None:
+        # O erro não é impresso: quem pediu a imagem o recebe abaixo
+        job = _image_jobs[key] = get_worker().submit(_read_image, path, size, alpha,
+                                                     on_error=lambda error: None, label=f"ler {path}")
+    if not job.done:
+        return None
+    if job.error is not None:
+        raise job.error
+    return _finish_image(key, job.result)
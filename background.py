@@ -0,0 +1,96 @@
+"""Camadas de fundo pré-desenhadas, compartilhadas pelos dois jogos.
+
+Tudo que é estático é desenhado uma única vez numa Surface; por quadro só
+sobram blits, sem sorteios nem primitivas de desenho.
+"""
+import random
+
+import pygame
+
+
+def _to_display_format(surface, colorkey=None, alpha=None):
+    if colorkey is not None:
+        surface.set_colorkey(colorkey)
+    # convert() só funciona depois de display.set_mode
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    if alpha is not None:
+        surface.set_alpha(alpha)
+    return surface
+
+
+class StaticLayer:
+    """Camada desenhada por render(surface) no primeiro uso e depois só copiada"""
+    def __init__(self, size, render, pos=(0, 0), colorkey=None, alpha=None):
+        self.size = size
+        self.render = render
+        self.pos = pos
+        self.colorkey = colorkey
+        self.alpha = alpha
+        self.surface = None
+
+    def get_surface(self):
+        if self.surface is None:
+            surface = pygame.Surface(self.size)
+            self.render(surface)
+            self.surface = _to_display_format(surface, self.colorkey, self.alpha)
+        return self.surface
+
+    def draw(self, target):
+        return target.blit(self.get_surface(), self.pos)
+
+
+class StarLayer:
+    """Estrelas com a mesma velocidade; as posições são pré-calculadas e cada
+    estrela é só um blit de uma imagem pequena compartilhada"""
+    def __init__(self, size, count, speed, brightness, radius, rng):
+        width, height = size
+        self.height = height
+        self.speed = speed
+        # Uma imagem por nível de brilho, reaproveitada pelas estrelas
+        images = {}
+        # Estrelas pré-calculadas: posição e brilho individual
+        self.stars = []
+        for _ in range(count):
+            value = rng.randint(brightness // 2, brightness)
+            image = images.get(value)
+            if image is None:
+                image = pygame.Surface((radius * 2, radius * 2))
+                pygame.draw.circle(image, (value, value, value), (radius, radius), radius)
+                image = images[value] = _to_display_format(image, (0, 0, 0))
+            self.stars.append((image, rng.randrange(width) - radius, rng.randrange(height) - radius))
+        self.offset = 0.0
+        self.prev_offset = 0.0
+
+    def update(self):
+        self.prev_offset = self.offset
+        self.offset = (self.offset + self.speed) % self.height
+
+    def draw(self, target, alpha=1.0):
+        """Desenha as estrelas e retorna os retângulos alterados"""
+        offset = int(self.prev_offset + self.speed * alpha)
+        height = self.height
+        return target.blits([(image, (x, (y + offset) % height)) for image, x, y in self.stars])
+
+
+class Starfield:
+    """Campo de estrelas com parallax: camadas mais próximas rolam mais rápido"""
+    # (quantidade, velocidade em px/tick, brilho máximo, raio)
+    LAYERS = ((60, 0.25, 120, 1), (30, 0.6, 200, 1), (12, 1.2, 255, 2))
+
+    def __init__(self, size, seed=0):
+        rng = random.Random(seed)
+        self.layers = [StarLayer(size, count, speed, brightness, radius, rng)
+                       for count, speed, brightness, radius in self.LAYERS]
+
+    def update(self):
+        for layer in self.layers:
+            layer.update()
+
+    def draw(self, target, alpha=1.0, skip=0):
+        """Desenha sobre a tela já limpa e retorna os retângulos alterados;
+        skip omite as skip camadas mais distantes (as com mais estrelas)"""
+        rects = []
+        for layer in self.layers[skip:]:
+            rects.extend(layer.draw(target, alpha))
+        return rects
@@ -0,0 +1,76 @@
+"""Compara o tempo por quadro dos fundos antigos (redesenhados a cada
+quadro) com as camadas pré-desenhadas de background.py.
+
+Uso: python benchmarks/backgrounds.py [--frames 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import flappy_bird
+import galaga
+from background import Starfield
+
+
+def legacy_flappy_background(surface):
+    """draw_background + draw_ground como eram antes das camadas"""
+    surface.fill(flappy_bird.BLACK)
+    surface.fill((135, 206, 235))
+    for i in range(0, flappy_bird.SCREEN_HEIGHT, 40):
+        color_intensity = 200 + (i // 40) % 56
+        pygame.draw.line(surface, (color_intensity, color_intensity, 255), (0, i), (flappy_bird.SCREEN_WIDTH, i), 2)
+    height, ground = flappy_bird.SCREEN_HEIGHT, flappy_bird.GROUND_HEIGHT
+    pygame.draw.rect(surface, (139, 69, 19), (0, height - ground, flappy_bird.SCREEN_WIDTH, ground))
+    pygame.draw.rect(surface, flappy_bird.GREEN, (0, height - ground, flappy_bird.SCREEN_WIDTH, 10))
+
+
+def cached_flappy_background(surface):
+    flappy_bird.sky_layer.draw(surface)
+    flappy_bird.ground_layer.draw(surface)
+
+
+def legacy_starfield(surface):
+    """Estrelas sorteadas a cada quadro, como no loop antigo do galaga"""
+    surface.fill(galaga.BLACK)
+    for _ in range(50):
+        x = random.randint(0, galaga.SCREEN_WIDTH)
+        y = random.randint(0, galaga.SCREEN_HEIGHT)
+        pygame.draw.circle(surface, galaga.WHITE, (x, y), 1)
+
+
+def time_per_frame(draw, surface, frames):
+    draw(surface)  # Aquecimento (monta os caches)
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw(surface)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+    
+    flappy_surface = pygame.display.set_mode((flappy_bird.SCREEN_WIDTH, flappy_bird.SCREEN_HEIGHT))
+    galaga_surface = pygame.Surface((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT)).convert()
+    starfield = Starfield((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT))
+    
+    def cached_starfield(surface):
+        starfield.update()
+        starfield.draw(surface)
+    
+    cases = (
+        ("flappy: céu + chão", flappy_surface, legacy_flappy_background, cached_flappy_background),
+        ("galaga: estrelas", galaga_surface, legacy_starfield, cached_starfield),
+    )
+    print(f"{'fundo':<20} {'antigo (ms)':>12} {'camadas (ms)':>13} {'ganho':>7}")
+    for name, surface, legacy, cached in cases:
+        before = time_per_frame(legacy, surface, args.frames)
+        after = time_per_frame(cached, surface, args.frames)
+        print(f"{name:<20} {before:>12.4f} {after:>13.4f} {before / after:>6.1f}x")
@@ -0,0 +1,93 @@
+"""Benchmark: quadros por segundo da captura sem tela, por sink, contra o
+tempo real (FPS quadros por segundo).
+
+Uma demonstração do jogo (capture.demo_replay) é desenhada com cada sink:
+"nenhum" só desenha (o custo da cena e do pipeline), "visão" entrega a
+visão NumPy de cada quadro a uma função que lê os pixels (como um modelo de
+visão), "cópia" faz o mesmo com pygame.surfarray.array3d (uma cópia por
+quadro), e raw/png/ffmpeg gravam numa pasta temporária (ffmpeg só se estiver
+instalado).
+
+Uso: python benchmarks/capture.py [--game galaga] [--ticks 600] [--sinks raw png]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import capture
+from replay import GAME_NAMES
+
+
+class NullSink:
+    """Descarta os quadros"""
+    def open(self, size, pixel_format, fps):
+        pass
+
+    def write(self, surface):
+        pass
+
+    def close(self):
+        pass
+
+
+def brightness(pixels):
+    """Leitura leve de todos os quadros, como um modelo faria"""
+    return int(pixels[::8, ::8].sum())
+
+
+class CopySink(capture.ArraySink):
+    """Como ArraySink, mas com uma cópia do quadro (array3d) antes"""
+    def write(self, surface):
+        self.function(pygame.surfarray.array3d(surface).transpose(1, 0, 2))
+
+
+def make_sink(name, directory):
+    if name == "nenhum":
+        return NullSink()
+    if name == "visão":
+        return capture.ArraySink(brightness)
+    if name == "cópia":
+        return CopySink(brightness)
+    if name == "raw":
+        return capture.RawSink(os.path.join(directory, "clip.raw"))
+    if name == "png":
+        return capture.PngSink(os.path.join(directory, "frames"))
+    return capture.FfmpegSink(os.path.join(directory, "clip.mp4"))
+
+
+SINKS = ("nenhum", "visão", "cópia", "raw", "png", "ffmpeg")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", choices=list(GAME_NAMES.values()), default="galaga")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--sinks", nargs="+", choices=SINKS, default=list(SINKS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = next(game for game, name in GAME_NAMES.items() if name == args.game)
+    replay = capture.demo_replay(game, args.ticks, args.seed)
+    fps = capture.SCENES[game].fps
+    print(f"{args.game}: {replay.ticks} quadros")
+    print(f"{'sink':<8} {'quadros/s':>10} {'x tempo real':>13} {'esperas':>8}")
+    for name in args.sinks:
+        if name == "ffmpeg" and shutil.which(capture.FFMPEG) is None:
+            print(f"{name:<8} {'(ffmpeg não encontrado)':>33}")
+            continue
+        directory = tempfile.mkdtemp(prefix="bench-capture-")
+        try:
+            sink = make_sink(name, directory)
+            start = time.perf_counter()
+            pipeline = capture.capture(replay, sink)
+            rate = pipeline.frames / (time.perf_counter() - start)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        print(f"{name:<8} {rate:>10.0f} {rate / fps:>12.1f}x {pipeline.stalls:>8}")
@@ -0,0 +1,126 @@
+"""Benchmark: custo das colisões por máscara (retângulos + pixels) contra
+só retângulos, em ondas de nível alto (meta: no máximo MAX_OVERHEAD a mais).
+
+Consultas: uma partida no modo "rect" roda a partir de --level com o piloto
+automático (e vidas sem fim), e a cada tick, logo antes das colisões de
+verdade, as três consultas de colisão (tiros x inimigos, tiros inimigos x
+jogador, inimigos x jogador) são medidas nos dois modos, sem remover
+ninguém: os dois modos veem exatamente o mesmo estado. Tick inteiro: cada modo roda a própria
+partida (os resultados divergem), nos dois motores; como menos tiros acertam
+no modo "mask", sobram mais inimigos para mover, e a tabela mostra a média
+de inimigos de cada partida. No motor de arrays, "pixels" é o tempo da
+narrowphase (as tabelas de sobreposição) dentro do tick.
+
+Uso: python benchmarks/collisions.py [--level 20] [--ticks 3000]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import galaga
+from spatial_hash import groupcollide, spritecollide
+
+MAX_OVERHEAD = 0.10
+LIVES = 10 ** 9  # A partida não termina durante a medida
+
+
+class MeasuredGame(galaga.GalagaGame):
+    """Partida "rect" que mede as consultas dos dois modos antes de colidir"""
+    def __init__(self, difficulty, seed, collision):
+        self.modes = ((None, [0.0, 0]), (pygame.sprite.collide_mask, [0.0, 0]))
+        super().__init__(difficulty, seed, collision)
+
+    def collide(self):
+        # Alterna a ordem, para nenhum modo ficar sempre com o cache quente
+        for collided, totals in (self.modes if self.ticks % 2 else self.modes[::-1]):
+            start = time.perf_counter()
+            totals[1] += collision_queries(self, collided)
+            totals[0] += time.perf_counter() - start
+        super().collide()
+
+
+def start_game(engine, collision, level, seed=0):
+    game_class = MeasuredGame if engine == "measured" else galaga.get_engine(engine)
+    game = game_class("Difícil", seed, collision)
+    game.level = level
+    game.lives = LIVES
+    game.create_enemy_wave()
+    return game
+
+
+def collision_queries(game, collided):
+    """As consultas de GalagaGame.collide, sem remover nada; retorna quantos
+    pares colidiram"""
+    hits = groupcollide(game.bullets, game.enemies, False, False, collided)
+    count = sum(len(enemies) for enemies in hits.values())
+    count += len(spritecollide(game.player, game.enemy_bullets, False, collided))
+    count += len(spritecollide(game.player, game.enemies, False, collided))
+    return count
+
+
+def measure_queries(level, ticks):
+    """(µs rect, µs mask, pares rect, pares mask, inimigos) por tick"""
+    game = start_game("measured", "rect", level)
+    enemies = 0
+    for _ in range(ticks):
+        enemies += len(game.enemies)
+        game.step(galaga.autopilot(game))
+    (rect_time, rect_pairs), (mask_time, mask_pairs) = (totals for _, totals in game.modes)
+    return rect_time / ticks * 1e6, mask_time / ticks * 1e6, rect_pairs, mask_pairs, enemies / ticks
+
+
+def measure_steps(engine, collision, level, ticks):
+    """(µs por tick inteiro, µs de narrowphase do motor de arrays, inimigos)
+    por tick de uma partida no modo collision"""
+    game = start_game(engine, collision, level)
+    narrowphase = [0.0]
+    if engine == "arrays":
+        for name in ("touching_pixels", "touching_player"):
+            setattr(game, name, timed(getattr(game, name), narrowphase))
+    enemies = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        enemies += len(game.enemies)
+        game.step(galaga.autopilot(game))
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks * 1e6, narrowphase[0] / ticks * 1e6, enemies / ticks
+
+
+def timed(function, total):
+    def wrapper(*args):
+        start = time.perf_counter()
+        result = function(*args)
+        total[0] += time.perf_counter() - start
+        return result
+    return wrapper
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--level", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=3000)
+    args = parser.parse_args()
+
+    rect_us, mask_us, rect_pairs, mask_pairs, enemies = measure_queries(args.level, args.ticks)
+    overhead = mask_us / rect_us - 1
+    print(f"Nível {args.level}, {args.ticks} ticks, {enemies:.0f} inimigos em média")
+    print(f"{'consultas':<16} {'µs/tick':>9} {'pares':>7}")
+    print(f"{'rect':<16} {rect_us:>9.2f} {rect_pairs:>7}")
+    print(f"{'mask':<16} {mask_us:>9.2f} {mask_pairs:>7}   {overhead:+.1%} (meta: até +{MAX_OVERHEAD:.0%})")
+
+    print(f"{'tick inteiro':<16} {'rect (µs)':>10} {'mask (µs)':>10} {'diferença':>10} "
+          f"{'pixels (µs)':>12} {'inimigos rect/mask':>19}")
+    for engine in galaga.ENGINES:
+        rect_step, _, rect_enemies = measure_steps(engine, "rect", args.level, args.ticks)
+        mask_step, pixels, mask_enemies = measure_steps(engine, "mask", args.level, args.ticks)
+        pixels_text = f"{pixels:.2f}" if engine == "arrays" else "-"
+        print(f"{engine:<16} {rect_step:>10.1f} {mask_step:>10.1f} {mask_step / rect_step - 1:>+10.1%} "
+              f"{pixels_text:>12} {rect_enemies:>9.1f}/{mask_enemies:<9.1f}")
+
+    if overhead > MAX_OVERHEAD:
+        sys.exit(1)
@@ -0,0 +1,68 @@
+"""Micro-benchmark: tempo de GalagaGame.step com ondas enormes, motor de
+sprites contra o motor de arrays NumPy (galaga_arrays.py).
+
+Cada onda tem ENEMIES inimigos espalhados pela metade de cima da tela; o
+jogador usa o autopilot e não morre (vidas infinitas), para medir sempre a
+mesma carga. Mede média e p99 de step() por tick, sem desenho, e confere
+que os dois motores terminam com o mesmo score.
+
+Uso: python benchmarks/entities.py [--enemies 500 1000 2000 5000] [--ticks 300]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import galaga
+
+BUDGET_MS = 2.0
+
+
+def build(engine, enemies, seed=0):
+    game = galaga.get_engine(engine)(galaga.DEFAULT_DIFFICULTY, seed)
+    game.enemies.empty()
+    game.lives = float("inf")
+    rng = random.Random(seed)
+    for _ in range(enemies):
+        game.add_enemy(rng.randrange(1, galaga.SCREEN_WIDTH - 31), rng.randrange(galaga.SCREEN_HEIGHT // 2),
+                       rng.choices([0, 1, 2], weights=[60, 30, 10])[0])
+    return game
+
+
+def run(engine, enemies, ticks):
+    game = build(engine, enemies)
+    step_times = []
+    for _ in range(ticks):
+        actions = galaga.autopilot(game)
+        start = time.perf_counter()
+        game.step(actions)
+        step_times.append(time.perf_counter() - start)
+    step_times.sort()
+    return {
+        "mean_ms": statistics.mean(step_times) * 1000,
+        "p99_ms": step_times[int(len(step_times) * 0.99) - 1] * 1000,
+        "score": game.score,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--enemies", type=int, nargs="+", default=[500, 1000, 2000, 5000])
+    parser.add_argument("--ticks", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"step() por tick, {args.ticks} ticks, orçamento {BUDGET_MS:.0f} ms")
+    print(f"{'inimigos':>8} {'motor':<8} {'média (ms)':>11} {'p99 (ms)':>9} {'score':>7}")
+    for enemies in args.enemies:
+        results = {engine: run(engine, enemies, args.ticks) for engine in galaga.ENGINES}
+        for engine, result in results.items():
+            print(f"{enemies:>8} {engine:<8} {result['mean_ms']:>11.3f} {result['p99_ms']:>9.3f} {result['score']:>7}")
+        sprites, arrays = results["sprites"], results["arrays"]
+        status = "ok" if arrays["mean_ms"] <= BUDGET_MS else "ACIMA DO ORÇAMENTO"
+        same = "iguais" if sprites["score"] == arrays["score"] else "DIFERENTES"
+        print(f"{'':>8} {sprites['mean_ms'] / arrays['mean_ms']:.1f}x mais rápido, scores {same}, {status}")
@@ -0,0 +1,131 @@
+"""Micro-benchmark: explosões com quadros pré-calculados + pool contra a
+implementação antiga, que criava uma Surface nova a cada tick.
+
+Mantém EXPLOSIONS explosões vivas ao mesmo tempo (as que terminam são
+repostas no mesmo quadro) e mede, por quadro, o tempo de update + draw, as
+Surfaces alocadas e os objetos Explosion criados.
+
+Uso: python benchmarks/explosions.py [--explosions 200] [--frames 600]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import galaga
+
+
+class LegacyExplosion(pygame.sprite.Sprite):
+    """Cópia da Explosion original, para comparação"""
+    def __init__(self, x, y):
+        super().__init__()
+        self.size = 30
+        self.image = pygame.Surface((self.size, self.size))
+        self.image.fill(galaga.YELLOW)
+        self.rect = self.image.get_rect()
+        self.rect.center = (x, y)
+        self.lifetime = 20
+        
+    def update(self, game):
+        self.lifetime -= 1
+        self.size += 2
+        self.image = pygame.Surface((self.size, self.size))
+        alpha = int(255 * (self.lifetime / 20))
+        color = (255, 255 - (20 - self.lifetime) * 10, 0)
+        self.image.fill(color)
+        self.rect = self.image.get_rect(center=self.rect.center)
+        
+        if self.lifetime <= 0:
+            self.kill()
+
+
+class _Game:
+    """O mínimo de GalagaGame que Explosion.update usa"""
+    def __init__(self):
+        self.explosion_pool = galaga.SpritePool(galaga.Explosion)
+        self.legacy_created = 0
+
+
+class _CountingSurface:
+    """Substitui pygame.Surface durante a medição para contar alocações"""
+    count = 0
+    
+    def __new__(cls, *args, **kwargs):
+        _CountingSurface.count += 1
+        return _SURFACE(*args, **kwargs)
+
+
+_SURFACE = pygame.Surface
+
+
+def run(screen, spawn, explosions, frames, seed=0):
+    rng = random.Random(seed)
+    game = _Game()
+    group = pygame.sprite.Group()
+    
+    def spawn_one():
+        group.add(spawn(game, rng.randrange(galaga.SCREEN_WIDTH), rng.randrange(galaga.SCREEN_HEIGHT)))
+    
+    # Começa com idades escalonadas, como numa sequência de abates
+    for i in range(explosions):
+        spawn_one()
+        for _ in range(i % galaga.EXPLOSION_LIFETIME):
+            group.update(game)
+    while len(group) < explosions:
+        spawn_one()
+    
+    frame_times = []
+    _CountingSurface.count = 0
+    created_before = game.explosion_pool.created + game.legacy_created
+    pygame.Surface = _CountingSurface
+    try:
+        for _ in range(frames):
+            start = time.perf_counter()
+            group.update(game)
+            while len(group) < explosions:
+                spawn_one()
+            screen.fill(galaga.BLACK)
+            group.draw(screen)
+            frame_times.append(time.perf_counter() - start)
+    finally:
+        pygame.Surface = _SURFACE
+    
+    frame_times.sort()
+    return {
+        "mean_ms": statistics.mean(frame_times) * 1000,
+        "p99_ms": frame_times[int(len(frame_times) * 0.99) - 1] * 1000,
+        "surfaces_per_frame": _CountingSurface.count / frames,
+        "objects_created": game.explosion_pool.created + game.legacy_created - created_before,
+    }
+
+
+def spawn_legacy(game, x, y):
+    game.legacy_created += 1
+    return LegacyExplosion(x, y)
+
+
+def spawn_pooled(game, x, y):
+    return game.explosion_pool.acquire(x, y)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--explosions", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+    
+    screen = pygame.display.set_mode((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT))
+    galaga.get_atlas().convert()
+    
+    print(f"{args.explosions} explosões simultâneas, {args.frames} quadros")
+    print(f"{'implementação':<14} {'média (ms)':>11} {'p99 (ms)':>9} {'Surfaces/quadro':>16} {'objetos novos':>14}")
+    for name, spawn in (("antiga", spawn_legacy), ("atlas + pool", spawn_pooled)):
+        result = run(screen, spawn, args.explosions, args.frames)
+        print(f"{name:<14} {result['mean_ms']:>11.3f} {result['p99_ms']:>9.3f} "
+              f"{result['surfaces_per_frame']:>16.1f} {result['objects_created']:>14}")
@@ -0,0 +1,150 @@
+"""Benchmark: quanto a thread principal espera o disco num disco lento
+(ex.: compartilhamento de rede), com as funções originais síncronas do
+placar e da imagem de fundo contra o worker de E/S.
+
+Cada abertura, leitura ou troca de arquivo (e a leitura da imagem) ganha
+LATÊNCIA ms de espera. A sequência imita uma sessão: abrir o jogo com a
+imagem de fundo, terminar uma partida (is_high_score), gravar o nome
+(add_high_score) e mostrar o placar. Cada passo é um quadro, e com o worker
+cada quadro também chama poll(); os quadros seguintes, até tudo chegar, só
+fazem poll(). A tabela mostra o pior quadro e o total de espera na thread
+principal.
+
+Uso: python benchmarks/io_latency.py [--latency 0 5 50]
+"""
+import argparse
+import builtins
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import assets
+import pygame
+import high_scores
+from io_worker import IOWorker
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BACKGROUND = os.path.join(ROOT, "background_Flappy_bird.png")
+DIFFICULTY = "Médio"
+
+
+@contextmanager
+def slow_disk(latency):
+    """Atrasa open, os.replace e pygame.image.load em latency segundos"""
+    originals = builtins.open, os.replace, pygame.image.load
+
+    def delayed(function):
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return function(*args, **kwargs)
+        return wrapper
+
+    builtins.open, os.replace, pygame.image.load = (delayed(function) for function in originals)
+    try:
+        yield
+    finally:
+        builtins.open, os.replace, pygame.image.load = originals
+
+
+# Cópia das funções originais do placar: ler e regravar o arquivo inteiro
+def legacy_load_high_scores(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def legacy_add_high_score(path, name, score):
+    scores = legacy_load_high_scores(path)
+    scores.append({"name": name, "score": score})
+    scores.sort(key=lambda x: x["score"], reverse=True)
+    scores = scores[:10]
+    with open(path, 'w') as f:
+        json.dump(scores, f, indent=2)
+    return scores
+
+
+def legacy_is_high_score(path, score):
+    scores = legacy_load_high_scores(path)
+    return len(scores) < 10 or score > min(s["score"] for s in scores) if scores else True
+
+
+def legacy_session(path):
+    return [
+        lambda: pygame.image.load(BACKGROUND),
+        lambda: legacy_is_high_score(path, 500),
+        lambda: legacy_add_high_score(path, "BENCH", 500),
+        lambda: legacy_load_high_scores(path),
+    ]
+
+
+def worker_session(path, worker):
+    state = {}
+
+    def start():
+        state["store"] = high_scores.open_store(path, DIFFICULTY, worker=worker)
+        worker.submit(assets._read_image, BACKGROUND, None, False)
+
+    return [
+        start,
+        lambda: state["store"].is_high_score(500, DIFFICULTY),
+        lambda: state["store"].add("BENCH", 500, DIFFICULTY),
+        lambda: state["store"].top(DIFFICULTY),
+    ], state
+
+
+def run(frames, poll=None, pending=None):
+    """(pior quadro, total) em ms na thread principal"""
+    times = []
+    for frame in frames:
+        start = time.perf_counter()
+        frame()
+        if poll is not None:
+            poll()
+        times.append(time.perf_counter() - start)
+    while pending is not None and pending():
+        start = time.perf_counter()
+        poll()
+        times.append(time.perf_counter() - start)
+        time.sleep(0.001)  # O resto do quadro
+    return max(times) * 1000, sum(times) * 1000
+
+
+def make_scores(path):
+    with open(path, "w") as f:
+        json.dump([{"name": f"P{i}", "score": i * 100, "difficulty": DIFFICULTY} for i in range(10)], f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, nargs="+", default=[0, 5, 50], metavar="MS")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-io-")
+    path = os.path.join(directory, "high_scores.json")
+    print(f"{'latência (ms)':>13} {'versão':<9} {'pior quadro (ms)':>17} {'total (ms)':>11}")
+    try:
+        for latency in args.latency:
+            make_scores(path)
+            with slow_disk(latency / 1000):
+                worst, total = run(legacy_session(path))
+            print(f"{latency:>13g} {'síncrona':<9} {worst:>17.2f} {total:>11.2f}")
+
+            make_scores(path)
+            worker = IOWorker("bench-io")
+            frames, state = worker_session(path, worker)
+            with slow_disk(latency / 1000):
+                worst, total = run(frames, worker.poll, lambda: worker.pending)
+                state["store"].close()
+                worker.close()
+            print(f"{latency:>13g} {'worker':<9} {worst:>17.2f} {total:>11.2f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
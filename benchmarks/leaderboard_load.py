@@ -0,0 +1,134 @@
+"""Benchmark: carga no servidor de placar (leaderboard.py), com e sem lotes.
+
+Para cada valor de --max-batch, sobe o servidor num processo separado
+(banco novo numa pasta temporária) e abre --clients conexões asyncio; cada
+uma manda --submissions submits, com até --window deles sem resposta. A
+latência de um submit vai do envio à resposta, que só sai depois do commit
+no SQLite. max-batch 1 é uma transação por submit (sem lotes).
+
+Com --address, mede um servidor já rodando (uma rodada, sem subir outro).
+
+Uso: python benchmarks/leaderboard_load.py [--clients 32] [--submissions 1000]
+     [--window 8] [--max-batch 1 512] [--address tcp://127.0.0.1:8765]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import leaderboard
+
+DIFFICULTIES = ("Fácil", "Médio", "Difícil")
+GAME = "bench"
+
+
+async def run_client(address, client, count, window, latencies):
+    reader, writer = await leaderboard.open_connection(address)
+    rng = random.Random(client)
+    slots = asyncio.Semaphore(window)
+    sent = deque()
+
+    async def receive():
+        for _ in range(count):
+            line = await reader.readline()
+            latencies.append(time.perf_counter() - sent.popleft())
+            slots.release()
+            response = json.loads(line)
+            if "error" in response:
+                raise leaderboard.LeaderboardError(response["error"])
+
+    receiver = asyncio.create_task(receive())
+    for _ in range(count):
+        await slots.acquire()
+        sent.append(time.perf_counter())
+        writer.write(leaderboard.encode({"op": "submit", "game": GAME, "name": f"C{client}",
+                                         "difficulty": rng.choice(DIFFICULTIES),
+                                         "score": rng.randrange(100000)}))
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+
+async def stats(address):
+    reader, writer = await leaderboard.open_connection(address)
+    writer.write(leaderboard.encode({"op": "stats"}))
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+async def load(address, clients, count, window):
+    """(submits/s, latências em s, submits e lotes gravados pelo servidor)"""
+    before = await stats(address)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(address, client, count, window, latencies) for client in range(clients)))
+    elapsed = time.perf_counter() - start
+    after = await stats(address)
+    return (clients * count / elapsed, latencies,
+            after["submitted"] - before["submitted"], after["batches"] - before["batches"])
+
+
+def start_server(directory, max_batch):
+    """Sobe o servidor numa porta livre; retorna (processo, endereço)"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "leaderboard.py"), "--listen", "tcp://127.0.0.1:0",
+         "--db", os.path.join(directory, f"batch-{max_batch}.db"), "--max-batch", str(max_batch)],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if "ouvindo em" not in line:
+        process.kill()
+        raise RuntimeError(f"o servidor não subiu: {line!r}")
+    return process, line.split("ouvindo em ")[1].split()[0]
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(label, result):
+    throughput, latencies, submitted, batches = result
+    latencies.sort()
+    p50, p99 = (percentile(latencies, fraction) * 1000 for fraction in (0.5, 0.99))
+    print(f"{label:<10} {throughput:>10.0f} {p50:>8.2f} {p99:>8.2f} {latencies[-1] * 1000:>8.2f} "
+          f"{submitted / max(batches, 1):>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--submissions", type=int, default=1000, help="por cliente")
+    parser.add_argument("--window", type=int, default=8, help="submits sem resposta por cliente")
+    parser.add_argument("--max-batch", type=int, nargs="+", default=[1, leaderboard.MAX_BATCH])
+    parser.add_argument("--address", help="servidor já rodando (não sobe outro)")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clientes x {args.submissions} submits, janela {args.window}")
+    print(f"{'max-batch':<10} {'submits/s':>10} {'p50 (ms)':>8} {'p99 (ms)':>8} {'máx (ms)':>8} "
+          f"{'média/lote':>12}")
+    if args.address:
+        report("externo", asyncio.run(load(args.address, args.clients, args.submissions, args.window)))
+        sys.exit()
+
+    directory = tempfile.mkdtemp(prefix="bench-leaderboard-")
+    try:
+        for max_batch in args.max_batch:
+            process, address = start_server(directory, max_batch)
+            try:
+                report(str(max_batch), asyncio.run(load(address, args.clients, args.submissions, args.window)))
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
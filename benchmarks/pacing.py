@@ -0,0 +1,108 @@
+"""Benchmark: velocidade do jogo numa máquina lenta, com um tick por quadro
+(loop antigo) contra o FramePacer (ticks fixos, pulo de quadros e qualidade
+adaptativa).
+
+Uma partida do Galaga roda com o piloto automático por --seconds segundos
+de relógio, desenhando numa tela dummy. Para imitar uma máquina N vezes mais
+lenta no desenho, cada quadro desenhado espera mais (N - 1) vezes o que o
+desenho levou; assim, desenhar menos (qualidade reduzida) também custa
+menos. Velocidade 1.00x é o jogo no ritmo certo (FPS ticks por segundo).
+
+Uso: python benchmarks/pacing.py [--slowdown 1 15 40] [--seconds 3] [--level 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import galaga
+from assets import get_font, init_display
+from background import Starfield
+from pacing import QUALITY_FULL, QUALITY_NAMES, FramePacer
+from renderer import Renderer
+
+LIVES = 10 ** 9  # A partida não termina durante a medida
+
+
+class Session:
+    """Partida, tela e desenho com a lentidão simulada"""
+    def __init__(self, screen, level, slowdown):
+        self.game = galaga.GalagaGame("Difícil", 0)
+        self.game.level = level
+        self.game.lives = LIVES
+        self.game.create_enemy_wave()
+        self.starfield = Starfield((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT))
+        self.renderer = Renderer(screen, galaga.BLACK)
+        self.fonts = get_font(36), get_font(24)
+        self.slowdown = slowdown
+        self.frames = 0
+
+    def step(self):
+        self.game.step(galaga.autopilot(self.game))
+        self.starfield.update()
+
+    def draw(self, alpha, quality):
+        start = time.perf_counter()
+        galaga.draw_playing(self.renderer, *self.fonts, self.game, self.starfield, alpha, quality)
+        time.sleep((time.perf_counter() - start) * (self.slowdown - 1))
+        self.frames += 1
+
+
+def run_legacy(session, seconds):
+    """Um tick por quadro, como o loop antigo; retorna os ticks rodados"""
+    clock = pygame.time.Clock()
+    ticks = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        session.step()
+        ticks += 1
+        session.draw(1.0, QUALITY_FULL)
+        clock.tick(galaga.FPS)
+    return ticks
+
+
+def run_paced(session, seconds):
+    """O loop de galaga.main com o FramePacer; retorna o pacer"""
+    clock = pygame.time.Clock()
+    pacer = FramePacer(galaga.FPS)
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pacer.begin_frame()
+        while pacer.tick():
+            session.step()
+        if pacer.render:
+            session.draw(pacer.alpha, pacer.quality)
+        pacer.end_frame()
+        clock.tick(galaga.RENDER_FPS)
+    return pacer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slowdown", type=float, nargs="+", default=[1, 15, 40])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--level", type=int, default=20)
+    args = parser.parse_args()
+
+    screen = init_display((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT), "bench")
+    galaga.get_atlas().convert()
+    expected = galaga.FPS * args.seconds
+    print(f"Nível {args.level}, {args.seconds:g} s por rodada")
+    print(f"{'lentidão':>8} {'loop':<8} {'velocidade':>10} {'desenhos/s':>10} {'pulados':>8} "
+          f"{'atrasados':>9} {'qualidade final':>15}")
+    for slowdown in args.slowdown:
+        session = Session(screen, args.level, slowdown)
+        ticks = run_legacy(session, args.seconds)
+        print(f"{slowdown:>7g}x {'por tick':<8} {ticks / expected:>9.2f}x {session.frames / args.seconds:>10.1f} "
+              f"{'-':>8} {'-':>9} {QUALITY_NAMES[QUALITY_FULL]:>15}")
+
+        session = Session(screen, args.level, slowdown)
+        pacer = run_paced(session, args.seconds)
+        stats = pacer.stats()
+        print(f"{slowdown:>7g}x {'pacer':<8} {stats['ticks'] / expected:>9.2f}x "
+              f"{stats['rendered'] / args.seconds:>10.1f} {stats['skipped'] / stats['frames']:>8.1%} "
+              f"{stats['late']:>9} {QUALITY_NAMES[pacer.quality]:>15}")
@@ -0,0 +1,111 @@
+"""Micro-benchmark: custo de update_game do Flappy Bird conforme o número de
+canos na tela, contra a versão anterior (todos os canos movidos e testados a
+cada tick, com Rects novos para o pássaro e para cada cano).
+
+Espaçamentos menores e velocidades maiores põem mais canos na tela ao mesmo
+tempo. "novos" é a fração de ticks com um cano novo: cada cano custa um pouco
+uma vez (nascer, entrar e sair da coluna, pontuar, expirar), mas um tick do
+update_game novo não depende de quantos canos há na tela. O pássaro é "fantasma": volta ao meio da tela a cada tick e não
+morre, para medir sempre a carga cheia. Score e colisão de cada tick são
+comparados entre as duas versões.
+
+Uso: python benchmarks/pipes.py [--ticks 5000] [--settings 200x3 10x3 2x3 50x40]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import flappy_bird as fb
+from pools import RingBuffer
+
+
+class LegacyPipe(fb.Pipe):
+    """Cano da versão anterior: posição própria, movida em update()"""
+    x = 0  # Sobrepõe a propriedade de fb.Pipe
+
+    def reset(self, x, rng=random, *args):
+        super().reset(x, rng)
+        self.x = x
+
+    def update(self):
+        self.x -= fb.PIPE_SPEED
+
+
+def legacy_update_game(bird, pipes, score, rng):
+    """Cópia do update_game anterior: todos os canos, Rects novos por cano"""
+    game_over = False
+    bird.update()
+    if pipes[-1].x < fb.SCREEN_WIDTH - fb.PIPE_SPACING:
+        pipes.append(fb.SCREEN_WIDTH, rng)
+    for pipe in pipes:
+        pipe.update()
+        if not pipe.passed and pipe.x + fb.PIPE_WIDTH < bird.x:
+            pipe.passed = True
+            score += 1
+        bird_rect = bird.get_rect()
+        top_rect = pygame.Rect(pipe.x, 0, fb.PIPE_WIDTH, pipe.height)
+        bottom_rect = pygame.Rect(pipe.x, pipe.height + fb.PIPE_GAP, fb.PIPE_WIDTH,
+                                  fb.SCREEN_HEIGHT - pipe.height - fb.PIPE_GAP - fb.GROUND_HEIGHT)
+        if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
+            game_over = True
+        if bird.y - bird.radius <= 0 or bird.y + bird.radius >= fb.SCREEN_HEIGHT - fb.GROUND_HEIGHT:
+            game_over = True
+    while pipes and pipes[0].x + fb.PIPE_WIDTH < 0:
+        pipes.popleft()
+    return score, game_over
+
+
+def legacy_pipes(rng):
+    pipes = RingBuffer(fb.PIPE_CAPACITY, LegacyPipe)
+    pipes.append(fb.SCREEN_WIDTH, rng)
+    return pipes
+
+
+def run(update, new_pipes, ticks, seed=0):
+    """(µs por tick, média de canos na tela, [(score, game_over)] por tick)"""
+    rng = random.Random(seed)
+    bird = fb.Bird()
+    pipes = new_pipes(rng)
+    score = 0
+    results = []
+    pipe_count = 0
+    elapsed = 0.0
+    for _ in range(ticks):
+        bird.y, bird.velocity = fb.SCREEN_HEIGHT // 2, 0
+        start = time.perf_counter()
+        score, game_over = update(bird, pipes, score, rng)
+        elapsed += time.perf_counter() - start
+        results.append((score, game_over))
+        pipe_count += len(pipes)
+    return elapsed / ticks * 1e6, pipe_count / ticks, results
+
+
+def parse_setting(text):
+    spacing, speed = text.split("x")
+    return int(spacing), int(speed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--settings", type=parse_setting, nargs="+", metavar="ESPAÇAMENTOxVELOCIDADE",
+                        default=[(200, 3), (50, 3), (10, 3), (2, 3), (50, 40)])
+    args = parser.parse_args()
+
+    print(f"update_game por tick, {args.ticks} ticks")
+    print(f"{'espaçamento':>11} {'veloc.':>6} {'canos':>6} {'novos':>6} {'antigo (µs)':>12} {'novo (µs)':>10} "
+          f"{'ganho':>7}")
+    for spacing, speed in args.settings:
+        with fb.game_settings(spacing=spacing, speed=speed):
+            spawns = 1 / fb.SPAWN_INTERVAL
+            legacy_us, pipes, expected = run(legacy_update_game, legacy_pipes, args.ticks)
+            new_us, _, results = run(fb.update_game, fb.new_pipes, args.ticks)
+        same = "" if results == expected else "  RESULTADOS DIFERENTES"
+        print(f"{spacing:>11} {speed:>6} {pipes:>6.1f} {spawns:>6.2f} {legacy_us:>12.2f} {new_us:>10.2f} "
+              f"{legacy_us / new_us:>6.1f}x{same}")
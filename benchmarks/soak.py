@@ -0,0 +1,189 @@
+"""Teste de longa duração: pressão no coletor de lixo e variação do tempo de
+quadro, com e sem reaproveitamento de tiros (Galaga) e canos (Flappy Bird).
+
+Cada quadro é um tick de lógica + desenho numa Surface fora da tela, com o
+autopilot jogando e reiniciando a partida a cada game over. "sem pool" é o
+comportamento antigo: um objeto novo por tiro (pools com capacity=0) e a
+lista de canos percorrida por cópia com list.remove. "objetos" conta os
+tiros/canos construídos durante a execução.
+
+Uso: python benchmarks/soak.py [--ticks 36000] [--game galaga flappy]
+"""
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import flappy_bird as fb
+import galaga
+
+
+class GCMonitor:
+    """Conta as coletas do gc por geração e o tempo gasto nelas"""
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pauses = []
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.collections[info["generation"]] += 1
+            self.pauses.append(time.perf_counter() - self._start)
+
+    def __enter__(self):
+        gc.collect()
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+class InstanceCounter:
+    """Conta objetos construídos das classes dadas durante a medição"""
+    def __init__(self, *classes):
+        self.classes = classes
+        self.count = 0
+        self._inits = {}
+
+    def _wrap(self, init):
+        def counting_init(obj, *args, **kwargs):
+            self.count += 1
+            init(obj, *args, **kwargs)
+        return counting_init
+
+    def __enter__(self):
+        for cls in self.classes:
+            self._inits[cls] = cls.__init__
+            cls.__init__ = self._wrap(cls.__init__)
+        return self
+
+    def __exit__(self, *exc):
+        for cls, init in self._inits.items():
+            cls.__init__ = init
+
+
+class LegacyPipe(fb.Pipe):
+    """Cano da versão anterior: posição própria, movida em update()"""
+    x = 0  # Sobrepõe a propriedade de fb.Pipe
+
+    def reset(self, x, rng=random, *args):
+        super().reset(x, rng)
+        self.x = x
+
+    def update(self):
+        self.x -= fb.PIPE_SPEED
+
+
+def legacy_update_game(bird, pipes, score, rng):
+    """Cópia do update_game original, com lista de canos"""
+    game_over = False
+    bird.update()
+    if pipes[-1].x < fb.SCREEN_WIDTH - fb.PIPE_SPACING:
+        pipes.append(LegacyPipe(fb.SCREEN_WIDTH, rng))
+    for pipe in pipes[:]:
+        pipe.update()
+        if pipe.x + fb.PIPE_WIDTH < 0:
+            pipes.remove(pipe)
+        if not pipe.passed and pipe.x + fb.PIPE_WIDTH < bird.x:
+            pipe.passed = True
+            score += 1
+        bird_rect = bird.get_rect()
+        top_rect = pygame.Rect(pipe.x, 0, fb.PIPE_WIDTH, pipe.height)
+        bottom_rect = pygame.Rect(pipe.x, pipe.height + fb.PIPE_GAP, fb.PIPE_WIDTH,
+                                  fb.SCREEN_HEIGHT - pipe.height - fb.PIPE_GAP - fb.GROUND_HEIGHT)
+        if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
+            game_over = True
+        if bird.y - bird.radius <= 0 or bird.y + bird.radius >= fb.SCREEN_HEIGHT - fb.GROUND_HEIGHT:
+            game_over = True
+    return score, game_over
+
+
+def galaga_frames(pooled, seed=0):
+    game = galaga.GalagaGame("Difícil", seed)
+    if not pooled:
+        game.bullet_pool.capacity = game.enemy_bullet_pool.capacity = 0
+    surface = pygame.Surface((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT))
+    seeds = random.Random(seed)
+    while True:
+        game.step(galaga.autopilot(game))
+        if game.game_over:
+            game.reset(seeds.randrange(2 ** 63))
+        surface.fill(galaga.BLACK)
+        game.draw(surface)
+        yield
+
+
+def flappy_frames(pooled, seed=0):
+    seeds = random.Random(seed)
+    surface = pygame.Surface((fb.SCREEN_WIDTH, fb.SCREEN_HEIGHT))
+    update = fb.update_game if pooled else legacy_update_game
+    while True:
+        rng = random.Random(seeds.randrange(2 ** 63))
+        bird = fb.Bird()
+        pipes = fb.new_pipes(rng) if pooled else [LegacyPipe(fb.SCREEN_WIDTH, rng)]
+        score = 0
+        game_over = False
+        while not game_over:
+            pipe = min((p for p in pipes if p.x + fb.PIPE_WIDTH >= bird.x - bird.radius), key=lambda p: p.x)
+            if bird.y > pipe.height + fb.PIPE_GAP // 2 + 20 and bird.velocity >= 0:
+                bird.jump()
+            score, game_over = update(bird, pipes, score, rng)
+            surface.fill(fb.BLACK)
+            fb.draw_game(surface, bird, pipes, score)
+            yield
+
+
+# Jogo -> (gerador de quadros, classes reaproveitadas)
+GAMES = {
+    "galaga": (galaga_frames, (galaga.Bullet, galaga.EnemyBullet)),
+    "flappy": (flappy_frames, (fb.Pipe,)),
+}
+
+
+def run(frames, classes, ticks):
+    frame_times = []
+    with InstanceCounter(*classes) as created, GCMonitor() as monitor:
+        for _ in range(ticks):
+            start = time.perf_counter()
+            next(frames)
+            frame_times.append(time.perf_counter() - start)
+    frame_times.sort()
+    return {
+        "mean_ms": statistics.mean(frame_times) * 1000,
+        "stdev_ms": statistics.stdev(frame_times) * 1000,
+        "p99_ms": frame_times[int(len(frame_times) * 0.99) - 1] * 1000,
+        "max_ms": frame_times[-1] * 1000,
+        "collections": monitor.collections,
+        "gc_ms": sum(monitor.pauses) * 1000,
+        "gc_max_ms": max(monitor.pauses, default=0) * 1000,
+        "created": created.count,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=36000, help="quadros por execução (36000 = 10 min a 60 FPS)")
+    parser.add_argument("--game", nargs="+", choices=list(GAMES), default=list(GAMES))
+    args = parser.parse_args()
+
+    print(f"{args.ticks} quadros por execução")
+    print(f"{'jogo':<7} {'versão':<8} {'média':>7} {'desvio':>7} {'p99':>7} {'máx':>7} "
+          f"{'coletas gen0/1/2':>17} {'gc total':>9} {'gc máx':>7} {'objetos':>8}   (ms)")
+    for name in args.game:
+        frames, classes = GAMES[name]
+        for label, pooled in (("sem pool", False), ("pool", True)):
+            result = run(frames(pooled), classes, args.ticks)
+            collections = "/".join(str(count) for count in result["collections"])
+            print(f"{name:<7} {label:<8} {result['mean_ms']:>7.3f} {result['stdev_ms']:>7.3f} "
+                  f"{result['p99_ms']:>7.3f} {result['max_ms']:>7.3f} {collections:>17} "
+                  f"{result['gc_ms']:>9.2f} {result['gc_max_ms']:>7.3f} {result['created']:>8}")
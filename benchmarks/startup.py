@@ -0,0 +1,102 @@
+"""Benchmark: tempo de abertura dos jogos, do início do processo até o
+primeiro quadro na tela (meta: STARTUP_TARGET_MS).
+
+Cada execução é um processo novo, com o import do pygame e dos jogos a
+frio. display.flip/update são embrulhados para marcar o primeiro quadro, e o
+processo termina logo em seguida. Os tempos vêm de time.perf_counter, que é
+o relógio monotônico do sistema e vale entre processos. A abertura é medida
+com o cache de assets vazio (primeira execução) e já preenchido; o Flappy
+Bird roda com background_Flappy_bird.png como background.png, para o cache
+da imagem redimensionada entrar na conta.
+
+Uso: python benchmarks/startup.py [--runs 10] [--game galaga]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STARTUP_TARGET_MS = 150
+GAMES = ("flappy_bird", "galaga")
+BACKGROUND = os.path.join(ROOT, "background_Flappy_bird.png")
+
+# Roda no processo filho; imprime os instantes do fim dos imports e do
+# primeiro quadro
+CHILD = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+import {game} as game
+imported = time.perf_counter()
+import pygame
+
+def first_frame(*args):
+    print("STARTUP", imported, time.perf_counter(), flush=True)
+    os._exit(0)
+
+pygame.display.flip = pygame.display.update = first_frame
+game.main()
+"""
+
+
+def launch(game, workdir, cache):
+    """Abre o jogo num processo novo; retorna (ms até o fim dos imports, ms
+    até o primeiro quadro), contados do disparo do processo"""
+    env = dict(os.environ, ASSET_CACHE=cache, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD.format(root=os.path.abspath(ROOT), game=game)],
+                            cwd=workdir, env=env, capture_output=True, text=True, check=True).stdout
+    line = next(line for line in output.splitlines() if line.startswith("STARTUP"))
+    _, imported, frame = line.split()
+    return (float(imported) - start) * 1000, (float(frame) - start) * 1000
+
+
+def measure(game, runs, workdir, warm_cache):
+    """[(imports, primeiro quadro)] de runs aberturas; warm_cache=None usa um
+    cache vazio novo em cada abertura"""
+    results = []
+    for _ in range(runs):
+        if warm_cache is None:
+            cache = tempfile.mkdtemp(prefix="bench-assets-")
+            try:
+                results.append(launch(game, workdir, cache))
+            finally:
+                shutil.rmtree(cache, ignore_errors=True)
+        else:
+            results.append(launch(game, workdir, warm_cache))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--game", choices=GAMES, nargs="+", default=list(GAMES))
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    warm_cache = os.path.join(workdir, "cache")
+    shutil.copy(BACKGROUND, os.path.join(workdir, "background.png"))
+    over_target = 0
+    print(f"{args.runs} aberturas por caso, meta de {STARTUP_TARGET_MS} ms até o primeiro quadro")
+    print(f"{'jogo':<12} {'cache':<6} {'imports (ms)':>13} {'1º quadro (ms)':>15} {'pior (ms)':>10}")
+    try:
+        for game in args.game:
+            launch(game, workdir, warm_cache)  # Preenche o cache quente
+            for label, cache in (("vazio", None), ("cheio", warm_cache)):
+                results = measure(game, args.runs, workdir, cache)
+                imports = statistics.median(imported for imported, _ in results)
+                frame = statistics.median(frame for _, frame in results)
+                status = "ok" if frame <= STARTUP_TARGET_MS else "ACIMA DA META"
+                over_target += label == "cheio" and frame > STARTUP_TARGET_MS
+                print(f"{game:<12} {label:<6} {imports:>13.1f} {frame:>15.1f} "
+                      f"{max(frame for _, frame in results):>10.1f} {status}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if over_target:
+        sys.exit(1)
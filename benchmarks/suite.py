@@ -0,0 +1,302 @@
+"""Suíte de benchmarks dos caminhos quentes dos dois jogos, sem tela.
+
+Cada caso monta o seu estado (fora da medição) e repete uma operação
+`number` vezes por rodada; o resultado é o tempo por operação da melhor
+rodada. Os resultados são comparados com os de referência guardados em
+benchmarks/baseline.json: um caso mais lento que referência x (1 + limite)
+é uma regressão, e o comando sai com código 1.
+
+A referência só vale para o código que a gravou: um commit que muda o que um
+caso mede (a lógica do jogo, o estado montado) grava a referência de novo,
+e a mensagem do commit diz isso.
+
+Casos:
+    flappy_tick                  Bird.update + canos/colisão (update_game)
+    galaga_tick[dific.-Lnível]   autopilot + GalagaGame.step numa onda do nível
+    groupcollide[N]              índice espacial + groupcollide com N inimigos
+    wave[Lnível]                 create_enemy_wave
+    explosions[N]                update + desenho de N explosões simultâneas
+    scores_load/save[formato]    abrir o placar com 1000 scores / add + flush
+
+Uso:
+    python benchmarks/suite.py [--filter galaga] [--rounds 5]
+    python benchmarks/suite.py --save-baseline      (grava a referência)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import flappy_bird as fb
+import galaga
+import high_scores
+import spatial_hash
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.2  # 20% mais lento que a referência é regressão
+DEFAULT_ROUNDS = 5
+
+# Nome -> (setup, number): setup() monta o estado e retorna a operação medida
+CASES = {}
+
+
+def case(name, number):
+    def register(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return register
+
+
+def flappy_tick():
+    state = {}
+
+    def restart():
+        rng = random.Random(len(state))
+        state.update(rng=rng, bird=fb.Bird(), pipes=fb.new_pipes(rng), score=0)
+
+    def tick():
+        bird, pipes = state["bird"], state["pipes"]
+        # Mesma política do flappy_sim, para as partidas durarem
+        pipe = next(p for p in pipes if p.x + fb.PIPE_WIDTH >= bird.x - bird.radius)
+        if bird.y > pipe.height + fb.PIPE_GAP // 2 + 20 and bird.velocity >= 0:
+            bird.jump()
+        state["score"], game_over = fb.update_game(bird, pipes, state["score"], state["rng"])
+        if game_over:
+            restart()
+
+    restart()
+    return tick
+
+
+case("flappy_tick", 5000)(flappy_tick)
+
+
+def galaga_game(difficulty, level, seed=0):
+    """Partida com a onda do nível pedido e vidas infinitas"""
+    game = galaga.GalagaGame(difficulty, seed)
+    game.lives = float("inf")
+    game.level = level
+    game.create_enemy_wave()
+    return game
+
+
+def galaga_tick(difficulty, level):
+    def setup():
+        game = galaga_game(difficulty, level)
+        return lambda: game.step(galaga.autopilot(game))
+    return setup
+
+
+for _difficulty in galaga.DIFFICULTIES:
+    for _level in (1, 5, 10, 20):
+        case(f"galaga_tick[{_difficulty}-L{_level}]", 300)(galaga_tick(_difficulty, _level))
+
+
+def groupcollide(enemies):
+    def setup():
+        rng = random.Random(enemies)
+        enemy_group = spatial_hash.SpatialGroup()
+        for _ in range(enemies):
+            enemy_group.add(galaga.Enemy(rng.randrange(galaga.SCREEN_WIDTH - 30),
+                                         rng.randrange(galaga.SCREEN_HEIGHT - 30), rng=rng))
+        bullets = pygame.sprite.Group(galaga.Bullet(rng.randrange(galaga.SCREEN_WIDTH),
+                                                    rng.randrange(galaga.SCREEN_HEIGHT)) for _ in range(20))
+
+        def collide():
+            enemy_group.refresh()
+            spatial_hash.groupcollide(bullets, enemy_group, False, False)
+        return collide
+    return setup
+
+
+for _enemies in (100, 1000, 10000):
+    case(f"groupcollide[{_enemies}]", 50)(groupcollide(_enemies))
+
+
+def wave(level):
+    def setup():
+        game = galaga_game(galaga.DEFAULT_DIFFICULTY, level)
+
+        def create():
+            game.all_sprites.remove(game.enemies)
+            game.create_enemy_wave()
+        return create
+    return setup
+
+
+for _level in (1, 20):
+    case(f"wave[L{_level}]", 50)(wave(_level))
+
+
+def explosions(count):
+    def setup():
+        game = galaga.GalagaGame(galaga.DEFAULT_DIFFICULTY, 0)
+        surface = pygame.Surface((galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT))
+        rng = random.Random(count)
+
+        def spawn():
+            game.add_explosion(rng.randrange(galaga.SCREEN_WIDTH), rng.randrange(galaga.SCREEN_HEIGHT))
+
+        # Idades escalonadas, como numa sequência de abates
+        for i in range(count):
+            spawn()
+            for _ in range(i % galaga.EXPLOSION_LIFETIME):
+                game.explosions.update(game)
+        while len(game.explosions) < count:
+            spawn()
+
+        def frame():
+            game.explosions.update(game)
+            while len(game.explosions) < count:
+                spawn()
+            surface.fill(galaga.BLACK)
+            game.explosions.draw(surface)
+        return frame
+    return setup
+
+
+case("explosions[200]", 200)(explosions(200))
+
+
+class ScoreFiles:
+    """Placares temporários com 1000 scores, um por formato"""
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="bench-scores-")
+        self.paths = {}
+
+    def get(self, extension):
+        if extension not in self.paths:
+            path = os.path.join(self.directory, "scores" + extension)
+            rng = random.Random(0)
+            store = high_scores.open_store(path, galaga.DEFAULT_DIFFICULTY)
+            for i in range(1000):
+                store.add(f"P{i}", rng.randrange(10000), rng.choice(list(galaga.DIFFICULTIES)))
+            store.close()
+            self.paths[extension] = path
+        return self.paths[extension]
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+score_files = ScoreFiles()
+
+
+def scores_load(extension):
+    def setup():
+        path = score_files.get(extension)
+        return lambda: high_scores.open_store(path, galaga.DEFAULT_DIFFICULTY).close()
+    return setup
+
+
+def scores_save(extension):
+    def setup():
+        store = high_scores.open_store(score_files.get(extension), galaga.DEFAULT_DIFFICULTY)
+        store.flush()  # A leitura do placar fica fora da medida
+        rng = random.Random(1)
+
+        def save():
+            store.add("BENCH", rng.randrange(10000), galaga.DEFAULT_DIFFICULTY)
+            store.flush()
+        return save
+    return setup
+
+
+for _extension in (".json", ".db"):
+    case(f"scores_load[{_extension[1:]}]", 20)(scores_load(_extension))
+    case(f"scores_save[{_extension[1:]}]", 20)(scores_save(_extension))
+
+
+def measure(setup, number, rounds):
+    """Segundos por operação na melhor de rounds rodadas"""
+    best = float("inf")
+    for _ in range(rounds):
+        op = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def machine():
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(seconds, reference, threshold):
+    if reference is None:
+        return "", "sem referência"
+    ratio = seconds / reference
+    if ratio > 1 + threshold:
+        return f"{ratio:.2f}x", "REGRESSÃO"
+    if ratio < 1 - threshold:
+        return f"{ratio:.2f}x", "melhor"
+    return f"{ratio:.2f}x", "ok"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="só casos cujo nome contém o texto")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fração acima da referência tolerada (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como referência")
+    parser.add_argument("--list", action="store_true", help="lista os casos e sai")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        sys.exit()
+
+    baseline = load_baseline(args.baseline)
+    references = baseline["cases"] if baseline and not args.save_baseline else {}
+    if baseline and not args.save_baseline and baseline.get("machine") != machine():
+        print("Aviso: a referência foi gravada em outra máquina/versão")
+
+    results = {}
+    regressions = 0
+    print(f"{'caso':<28} {'ms/op':>10} {'ops/s':>12} {'vs ref':>8}")
+    try:
+        for name in names:
+            setup, number = CASES[name]
+            seconds = results[name] = measure(setup, number, args.rounds)
+            ratio, status = compare(seconds, references.get(name), args.threshold)
+            regressions += status == "REGRESSÃO"
+            print(f"{name:<28} {seconds * 1000:>10.4f} {1 / seconds:>12,.0f} {ratio:>8} {status}")
+    finally:
+        score_files.cleanup()
+
+    if args.save_baseline:
+        cases = dict(baseline["cases"]) if baseline else {}
+        cases.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine(), "cases": cases}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Referência gravada em {args.baseline}")
+    elif regressions:
+        print(f"{regressions} regressão(ões) acima de {args.threshold:.0%}")
+        sys.exit(1)
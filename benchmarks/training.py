@@ -0,0 +1,55 @@
+"""Benchmark: episódios/s da avaliação de populações do Flappy Bird
+(flappy_env.evaluate_population) conforme o número de processos.
+
+A mesma população aleatória e as mesmas sementes são avaliadas com 1, 2, 4...
+até todos os núcleos; a tabela mostra a vazão e o ganho sobre 1 processo, e
+confere que os resultados não dependem da divisão entre processos.
+
+Uso: python benchmarks/training.py [--agents 2000] [--episodes 3] [--workers 1 2 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import flappy_env
+
+
+def default_workers():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    population = [flappy_env.LinearPolicy.random(rng) for _ in range(args.agents)]
+    seeds = [rng.randrange(2 ** 63) for _ in range(args.episodes)]
+    episodes = args.agents * args.episodes
+
+    print(f"{args.agents} agentes x {args.episodes} episódios, {os.cpu_count()} núcleos")
+    print(f"{'processos':>9} {'tempo (s)':>10} {'episódios/s':>12} {'ganho':>6}")
+    baseline = reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = flappy_env.evaluate_population(population, seeds, workers)
+        elapsed = time.perf_counter() - start
+        rate = episodes / elapsed
+        if baseline is None:
+            baseline, reference = rate, results
+        status = "" if results == reference else "  RESULTADOS DIFERENTES"
+        print(f"{workers:>9} {elapsed:>10.2f} {rate:>12,.0f} {rate / baseline:>5.1f}x{status}")
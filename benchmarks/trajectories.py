@@ -0,0 +1,103 @@
+"""Micro-benchmark: Enemy.update com trajetórias pré-calculadas contra a
+implementação antiga, que comparava o padrão como texto e chamava math.sin
+a cada tick nos inimigos 'zigzag'.
+
+Cada rodada avança ENEMIES inimigos por TICKS ticks (só o update dos
+inimigos, sem colisões nem desenho) e mede o tempo por inimigo por tick.
+Os casos "antigo" e "tabelas" usam os três padrões originais; "swoop +
+loop" usa todos os padrões, com o voo de entrada das ondas novas.
+
+Uso: python benchmarks/trajectories.py [--enemies 1000] [--ticks 600]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import galaga
+
+LEGACY_PATTERNS = ('straight', 'zigzag', 'dive')
+
+
+class LegacyEnemy(galaga.Enemy):
+    """Enemy com o update original, para comparação"""
+    def __init__(self, x, y, enemy_type=0, difficulty="Médio", rng=random, patterns=LEGACY_PATTERNS, entry=None):
+        super().__init__(x, y, enemy_type, difficulty, rng, patterns)
+        self.time = 0
+
+    def update(self, game):
+        self.time += 1
+
+        if self.move_pattern == 'straight':
+            self.rect.x += self.speed_x
+        elif self.move_pattern == 'zigzag':
+            self.rect.x += self.speed_x
+            self.rect.y += math.sin(self.time * 0.1) * galaga.ZIGZAG_AMPLITUDE
+        elif self.move_pattern == 'dive' and self.time > galaga.DIVE_DELAY:
+            self.rect.y += galaga.DIVE_SPEED
+            if self.rect.y > galaga.SCREEN_HEIGHT:
+                self.kill()
+
+        if self.rect.right >= galaga.SCREEN_WIDTH or self.rect.left <= 0:
+            self.speed_x *= -1
+            self.rect.y += galaga.EDGE_DROP
+
+        self.shoot_cooldown -= 1
+        if self.shoot_cooldown <= 0 and game.rng.random() < galaga.DIFFICULTIES[self.difficulty]["bullet_frequency"]:
+            self.shoot(game)
+            self.shoot_cooldown = game.rng.randint(*galaga.SHOOT_COOLDOWN)
+
+
+class _Game:
+    """O mínimo de GalagaGame que Enemy.update usa; os tiros só são contados"""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.shots = 0
+
+    def add_enemy_bullet(self, x, y):
+        self.shots += 1
+
+
+def run(enemy_class, enemies, ticks, patterns, entry=False, seed=0):
+    """Microssegundos por inimigo por tick"""
+    rng = random.Random(seed)
+    group = pygame.sprite.Group()
+    for i in range(enemies):
+        x = 100 + (i % 8) * 70
+        y = 50 + (i // 8) % 6 * 50
+        side = 'swoop_left' if i % 8 < 4 else 'swoop_right'
+        group.add(enemy_class(x, y, rng.choice([0, 1, 2]), galaga.DEFAULT_DIFFICULTY, rng, patterns,
+                              side if entry else None))
+    game = _Game(seed)
+    updates = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        updates += len(group)
+        group.update(game)
+    return (time.perf_counter() - start) / updates * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--enemies", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=600)
+    args = parser.parse_args()
+
+    cases = (
+        ("antigo", LegacyEnemy, LEGACY_PATTERNS, False),
+        ("tabelas", galaga.Enemy, LEGACY_PATTERNS, False),
+        ("swoop + loop", galaga.Enemy, galaga.MOVE_PATTERNS, True),
+    )
+    print(f"{args.enemies} inimigos, {args.ticks} ticks")
+    print(f"{'implementação':<14} {'µs/inimigo/tick':>16} {'ganho':>7}")
+    baseline = None
+    for name, enemy_class, patterns, entry in cases:
+        micros = run(enemy_class, args.enemies, args.ticks, patterns, entry)
+        baseline = baseline or micros
+        print(f"{name:<14} {micros:>16.3f} {baseline / micros:>6.2f}x")
@@ -0,0 +1,376 @@
+"""Captura de quadros sem tela: replays dos dois jogos viram vídeo ou arrays.
+
+A partida é refeita tick a tick a partir do replay (como em replay.verify) e
+cada tick é desenhado direto numa Surface de captura, com as mesmas funções
+de desenho do jogo, sem janela nem flip. Os quadros nunca são copiados no
+loop de desenho:
+
+- CapturePipeline: anel de Surfaces + fila limitada para uma thread
+  escritora. O loop desenha numa Surface livre e a põe na fila; a thread a
+  entrega ao sink e a devolve ao anel. Com a fila cheia, o loop espera
+  (contado em stalls), então a memória não cresce se o disco for lento.
+- Sinks: RawSink (um arquivo rawvideo com os bytes da Surface), PngSink
+  (uma PNG por quadro), FfmpegSink (os bytes da Surface num pipe para o
+  ffmpeg local) e ArraySink (função chamada com a visão NumPy de cada
+  quadro, ex.: para um modelo de visão).
+- iter_frames: gerador da visão NumPy (altura, largura, 3) RGB de cada
+  quadro, via pygame.surfarray.pixels3d.
+
+Uma visão NumPy trava a Surface e só vale até o próximo quadro: quem
+precisar guardar um quadro deve copiá-lo. NumPy só é necessário para as
+visões (ArraySink e iter_frames).
+
+Uso: python capture.py REPLAY.rpl --out clip.mp4   (.raw: rawvideo; pasta: PNGs)
+     python capture.py --demo galaga --ticks 1800 --out clip.mp4
+"""
+import argparse
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from assets import get_font, init_display  # Antes do pygame (ver assets)
+import pygame
+
+import flappy_bird as fb
+import galaga
+from background import Starfield
+from io_worker import get_worker
+from renderer import FLIP, Renderer
+from replay import FLAP, FLAPPY_BIRD, GALAGA, GAME_NAMES, Replay, ReplayError
+
+QUEUE_DEPTH = 8  # Quadros esperando a thread escritora, no máximo
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov", ".avi", ".gif")
+FFMPEG = os.environ.get("FFMPEG", "ffmpeg")
+
+
+def new_surface(size):
+    """Surface de captura no formato da tela (32 bits, sem padding por linha)"""
+    return pygame.Surface(size).convert()
+
+
+def pixel_format(surface):
+    """Nome no ffmpeg (ex.: "bgr0") da ordem dos bytes de um pixel de 32 bits"""
+    if surface.get_bytesize() != 4:
+        raise ValueError(f"Surface de {surface.get_bitsize()} bits: a captura usa 32 bits")
+    channels = ["0"] * 4
+    for name, mask, shift in zip("rgba", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            channels[shift // 8] = name
+    if sys.byteorder == "big":
+        channels.reverse()
+    return "".join(channels)
+
+
+class SurfaceRenderer(Renderer):
+    """Renderer que desenha na Surface em screen (trocada a cada quadro) e
+    não apresenta nada: não há janela"""
+    def __init__(self, background):
+        super().__init__(None, background, FLIP)
+
+    def present(self):
+        self.dirty = []
+
+
+# Cenas: uma partida refeita a partir do replay, desenhada numa Surface
+class FlappyScene:
+    fps = fb.FPS
+
+    def __init__(self, replay):
+        self.size = (fb.SCREEN_WIDTH, fb.SCREEN_HEIGHT)
+        self.rng = random.Random(replay.seed)
+        self.bird = fb.Bird()
+        self.pipes = fb.new_pipes(self.rng)
+        self.score = 0
+        self.game_over = False
+        self.background = None
+
+    def prepare(self):
+        # A imagem de fundo chega pelo worker de E/S; aqui dá para esperar
+        fb.get_background()
+        get_worker().flush()
+        self.background = fb.get_background()
+
+    def step(self, actions):
+        if actions & FLAP:
+            self.bird.jump()
+        self.score, self.game_over = fb.update_game(self.bird, self.pipes, self.score, self.rng)
+
+    def draw(self, surface):
+        surface.blit(self.background, (0, 0))
+        fb.draw_game(surface, self.bird, self.pipes, self.score)
+        if self.game_over:
+            fb.show_game_over(surface, self.score)
+
+
+class GalagaScene:
+    fps = galaga.FPS
+
+    def __init__(self, replay):
+        self.size = (galaga.SCREEN_WIDTH, galaga.SCREEN_HEIGHT)
+        self.game = galaga.GalagaGame(replay.difficulty, replay.seed, replay.collision)
+        self.starfield = Starfield(self.size)
+        self.renderer = SurfaceRenderer(galaga.BLACK)
+        self.fonts = None
+
+    def prepare(self):
+        galaga.get_atlas().convert()
+        self.fonts = get_font(36), get_font(24)
+
+    def step(self, actions):
+        self.game.step(actions)
+        self.starfield.update()
+
+    def draw(self, surface):
+        self.renderer.screen = surface
+        galaga.draw_playing(self.renderer, *self.fonts, self.game, self.starfield)
+
+
+SCENES = {FLAPPY_BIRD: FlappyScene, GALAGA: GalagaScene}
+
+
+def open_scene(replay):
+    """Cena do replay, pronta para desenhar; abre a tela (dummy, sem janela,
+    com SDL_VIDEODRIVER=dummy) se ainda não houver uma"""
+    scene_class = SCENES.get(replay.game)
+    if scene_class is None:
+        raise ReplayError(f"Jogo desconhecido: {replay.game}")
+    scene = scene_class(replay)
+    if pygame.display.get_surface() is None:
+        init_display(scene.size, "Captura")
+    scene.prepare()
+    return scene
+
+
+# Sinks: open(size, formato do pixel, fps), write(surface) na thread
+# escritora, close() no fim
+class RawSink:
+    """Arquivo rawvideo: os bytes de cada Surface, um quadro depois do outro"""
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def open(self, size, pixel_format, fps):
+        self._file = open(self.path, "wb")
+        width, height = size
+        print(f"Para ver: ffplay -f rawvideo -pixel_format {pixel_format} "
+              f"-video_size {width}x{height} -framerate {fps} {self.path}")
+
+    def write(self, surface):
+        self._file.write(surface.get_view("0"))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class PngSink:
+    """Uma PNG por quadro (frame_000000.png, ...) numa pasta"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.frame = 0
+
+    def open(self, size, pixel_format, fps):
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, surface):
+        pygame.image.save(surface, os.path.join(self.directory, f"frame_{self.frame:06d}.png"))
+        self.frame += 1
+
+    def close(self):
+        """Nada a fechar: cada quadro é um arquivo"""
+
+
+class FfmpegSink:
+    """Vídeo codificado pelo ffmpeg local, lendo os quadros crus por um pipe"""
+    def __init__(self, path, executable=FFMPEG, codec_args=("-pix_fmt", "yuv420p")):
+        self.path = path
+        self.executable = executable
+        self.codec_args = codec_args
+        self._process = None
+
+    def open(self, size, pixel_format, fps):
+        width, height = size
+        self._process = subprocess.Popen(
+            [self.executable, "-loglevel", "error", "-y", "-f", "rawvideo", "-pixel_format", pixel_format,
+             "-video_size", f"{width}x{height}", "-framerate", str(fps), "-i", "-",
+             *self.codec_args, self.path],
+            stdin=subprocess.PIPE)
+
+    def write(self, surface):
+        self._process.stdin.write(surface.get_view("0"))
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        if self._process.wait():
+            raise RuntimeError(f"ffmpeg terminou com código {self._process.returncode}")
+
+
+class ArraySink:
+    """Chama function(pixels) com a visão NumPy (altura, largura, 3) RGB de
+    cada quadro, na thread escritora; a visão não vale depois da chamada"""
+    def __init__(self, function):
+        self.function = function
+
+    def open(self, size, pixel_format, fps):
+        """Nada a abrir"""
+
+    def write(self, surface):
+        self.function(pygame.surfarray.pixels3d(surface).transpose(1, 0, 2))
+
+    def close(self):
+        """Nada a fechar"""
+
+
+class CapturePipeline:
+    """Anel de Surfaces de captura e fila limitada para a thread escritora.
+
+    acquire() dá uma Surface livre para desenhar (esperando, se todas estão
+    na fila ou com o sink) e submit() a entrega à thread; um erro do sink
+    aparece no submit() seguinte e em close().
+    """
+    def __init__(self, sink, size, fps, depth=QUEUE_DEPTH):
+        self.sink = sink
+        self.frames = 0
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.error = None
+        self._queue = queue.Queue(maxsize=depth)
+        self._free = queue.SimpleQueue()
+        # Na fila, com o sink e sendo desenhada
+        surfaces = [new_surface(size) for _ in range(depth + 2)]
+        for surface in surfaces:
+            self._free.put(surface)
+        sink.open(size, pixel_format(surfaces[0]), fps)
+        self._thread = threading.Thread(target=self._write, name="capture-writer", daemon=True)
+        self._thread.start()
+
+    def acquire(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            start = time.perf_counter()
+            surface = self._free.get()
+            self.stalls += 1
+            self.stall_time += time.perf_counter() - start
+            return surface
+
+    def submit(self, surface):
+        if self.error is not None:
+            raise self.error
+        self._queue.put(surface)
+        self.frames += 1
+
+    def _write(self):
+        while (surface := self._queue.get()) is not None:
+            if self.error is None:
+                try:
+                    self.sink.write(surface)
+                except Exception as error:
+                    self.error = error
+            self._free.put(surface)
+
+    def close(self):
+        """Espera a thread escrever tudo e fecha o sink"""
+        self._queue.put(None)
+        self._thread.join()
+        self.sink.close()
+        if self.error is not None:
+            raise self.error
+
+
+def capture(replay, sink, depth=QUEUE_DEPTH):
+    """Desenha cada tick do replay e o entrega ao sink; retorna o pipeline
+    (frames, stalls, stall_time)"""
+    scene = open_scene(replay)
+    pipeline = CapturePipeline(sink, scene.size, scene.fps, depth)
+    try:
+        for actions in replay.actions:
+            scene.step(actions)
+            surface = pipeline.acquire()
+            scene.draw(surface)
+            pipeline.submit(surface)
+    finally:
+        pipeline.close()
+    return pipeline
+
+
+def iter_frames(replay):
+    """Visão NumPy (altura, largura, 3) RGB de cada tick do replay, sem
+    cópia. Duas Surfaces se alternam: a visão anterior pode continuar viva
+    enquanto o quadro seguinte é desenhado, mas não mais que isso."""
+    scene = open_scene(replay)
+    surfaces = [new_surface(scene.size) for _ in range(2)]
+    for index, actions in enumerate(replay.actions):
+        surface = surfaces[index % 2]
+        scene.step(actions)
+        scene.draw(surface)
+        yield pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+
+def demo_replay(game, ticks, seed=0, difficulty=galaga.DEFAULT_DIFFICULTY, collision=galaga.COLLISION_MODE):
+    """Replay de demonstração com até ticks ticks: o piloto automático no
+    Galaga e o caminho com menos pulos do resolvedor no Flappy Bird"""
+    if game == GALAGA:
+        session = galaga.GalagaGame(difficulty, seed, collision)
+        replay = Replay(GALAGA, seed, difficulty, flags=Replay.collision_flags(collision))
+        while replay.ticks < ticks and not session.game_over:
+            actions = galaga.autopilot(session)
+            replay.record(actions)
+            session.step(actions)
+        replay.finish(session.score, session.level)
+        return replay
+    from flappy_solver import Solver, pipe_heights
+    actions = Solver().min_flap_path(pipe_heights(seed, ticks // fb.SPAWN_INTERVAL + 2))
+    if actions is None:
+        raise ValueError(f"A semente {seed} não tem caminho que passe os canos")
+    return Replay(FLAPPY_BIRD, seed, actions=actions[:ticks])
+
+
+def open_sink(path, output_format=None):
+    """Sink pelo formato ou, sem formato, pela extensão: .raw, vídeo
+    (ffmpeg) ou pasta de PNGs"""
+    extension = os.path.splitext(path)[1].lower()
+    if output_format is None:
+        output_format = "raw" if extension == ".raw" else "ffmpeg" if extension in VIDEO_EXTENSIONS else "png"
+    if output_format == "raw":
+        return RawSink(path)
+    if output_format == "ffmpeg":
+        return FfmpegSink(path)
+    return PngSink(path)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("replay", nargs="?", help="arquivo .rpl")
+    parser.add_argument("--demo", choices=[GAME_NAMES[FLAPPY_BIRD], GAME_NAMES[GALAGA]],
+                        help="sem replay: grava uma partida de demonstração")
+    parser.add_argument("--ticks", type=int, default=1800, help="tamanho da demonstração")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--collision", choices=galaga.COLLISION_MODES, default=galaga.COLLISION_MODE,
+                        help="modo de colisão da demonstração do Galaga")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--format", choices=("raw", "png", "ffmpeg"))
+    parser.add_argument("--depth", type=int, default=QUEUE_DEPTH, help="quadros na fila da thread escritora")
+    args = parser.parse_args()
+    if (args.replay is None) == (args.demo is None):
+        parser.error("informe um replay ou --demo")
+
+    if args.demo:
+        game = next(game for game, name in GAME_NAMES.items() if name == args.demo)
+        replay = demo_replay(game, args.ticks, args.seed, collision=args.collision)
+    else:
+        replay = Replay.load(args.replay)
+    start = time.perf_counter()
+    pipeline = capture(replay, open_sink(args.out, args.format), args.depth)
+    elapsed = time.perf_counter() - start
+    fps = SCENES[replay.game].fps
+    print(f"{pipeline.frames} quadros de {GAME_NAMES[replay.game]} em {elapsed:.2f}s "
+          f"({pipeline.frames / elapsed:.0f} quadros/s, {pipeline.frames / fps / elapsed:.1f}x o tempo real); "
+          f"{pipeline.stalls} esperas pela escrita ({pipeline.stall_time * 1000:.0f} ms)")
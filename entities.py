@@ -0,0 +1,67 @@
+"""Armazenamento structure-of-arrays para entidades numerosas.
+
+Em vez de um objeto por entidade, cada campo (x, y, vida...) é uma coluna
+NumPy com uma posição por entidade; a lógica de um tick vira poucas operações
+vetorizadas sobre colunas inteiras, sem chamadas Python por entidade.
+"""
+import numpy as np
+
+DEFAULT_CAPACITY = 64
+
+
+class EntityArrays:
+    """Entidades de um mesmo tipo, uma coluna NumPy por campo.
+
+    arrays[campo] é a fatia viva da coluna, na ordem de inserção; operações
+    in-place nela (arrays["y"] += 5) alteram as entidades. As colunas dobram
+    de tamanho quando enchem e remoções compactam preservando a ordem.
+    """
+    def __init__(self, fields, capacity=DEFAULT_CAPACITY):
+        self.fields = dict(fields)
+        self.count = 0
+        self._columns = {name: np.zeros(capacity, dtype) for name, dtype in self.fields.items()}
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        return self._columns[name][:self.count]
+
+    def __setitem__(self, name, values):
+        self._columns[name][:self.count] = values
+
+    @property
+    def capacity(self):
+        return len(next(iter(self._columns.values())))
+
+    def _reserve(self, count):
+        capacity = self.capacity
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, column.dtype)
+            grown[:self.count] = column[:self.count]
+            self._columns[name] = grown
+
+    def add(self, **values):
+        """Acrescenta uma entidade (campos omitidos ficam zerados); retorna o índice"""
+        index = self.count
+        self._reserve(index + 1)
+        for name, column in self._columns.items():
+            column[index] = values.get(name, 0)
+        self.count += 1
+        return index
+
+    def keep(self, mask):
+        """Remove as entidades onde mask é False, mantendo a ordem das demais"""
+        count = int(np.count_nonzero(mask))
+        if count == self.count:
+            return
+        for column in self._columns.values():
+            column[:count] = column[:self.count][mask]
+        self.count = count
+
+    def empty(self):
+        self.count = 0
@@ -1,15 +1,23 @@
-import pygame
 import random
 import sys
+from collections import deque
+from contextlib import contextmanager
+
+from assets import get_font, init_display, request_image  # Antes do pygame (ver assets)
+import pygame
 
-# Inicialização
-pygame.init()
+from background import StaticLayer
+from io_worker import get_worker
+from pacing import QUALITY_FULL, FramePacer
+from pools import RingBuffer
+from profiler import profiler
+from renderer import RENDER_MODE, Renderer
+from replay import FLAP, FLAPPY_BIRD, Replay, save_to_replay_dir
+from text_cache import render_text, text_cache
 
-# Configurações da tela
+# Configurações da tela (a janela só é aberta em main)
 SCREEN_WIDTH = 400
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Flappy Bird Clone")
 
 # Cores
 WHITE = (255, 255, 255)
@@ -20,27 +28,54 @@ RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
 
 # Variáveis do jogo
-clock = pygame.time.Clock()
-FPS = 60
+FPS = 60  # Ticks de lógica por segundo (as velocidades são por tick)
 GRAVITY = 0.5
 JUMP_STRENGTH = -8
 PIPE_WIDTH = 70
 PIPE_GAP = 150
 PIPE_SPEED = 3
+PIPE_SPACING = 200  # Novo cano quando o último passa de SCREEN_WIDTH - PIPE_SPACING
 GROUND_HEIGHT = 50
+PIPE_MIN_HEIGHT = 100
+
+def derive_settings(spacing, speed, gap):
+    """Configurações que derivam das dos canos, na ordem de DERIVED_SETTINGS:
+    de quantos em quantos ticks nasce um cano (todos andam juntos, então o
+    último sempre passa de SCREEN_WIDTH - spacing no mesmo ritmo), a altura
+    máxima do cano de cima e quantos canos ficam vivos ao mesmo tempo, no
+    máximo (um a cada spawn_interval * speed px na tela, mais o que nasce
+    antes de o mais antigo sair)"""
+    spawn_interval = spacing // speed + 1
+    max_height = SCREEN_HEIGHT - gap - GROUND_HEIGHT - 100
+    capacity = (SCREEN_WIDTH + PIPE_WIDTH) // (spawn_interval * speed) + 2
+    return spawn_interval, max_height, capacity
+
+DERIVED_SETTINGS = ("SPAWN_INTERVAL", "PIPE_MAX_HEIGHT", "PIPE_CAPACITY")
+SPAWN_INTERVAL, PIPE_MAX_HEIGHT, PIPE_CAPACITY = derive_settings(PIPE_SPACING, PIPE_SPEED, PIPE_GAP)
+
+@contextmanager
+def game_settings(spacing=None, speed=None, gap=None, gravity=None, jump=None):
+    """Troca as configurações dadas (None mantém a atual), e as que derivam
+    delas, durante o bloco. As funções do jogo leem as globais na hora em
+    que rodam, então valem para o que for criado e rodado dentro do bloco"""
+    settings = globals()
+    values = {"PIPE_SPACING": spacing, "PIPE_SPEED": speed, "PIPE_GAP": gap,
+              "GRAVITY": gravity, "JUMP_STRENGTH": jump}
+    values = {name: value for name, value in values.items() if value is not None}
+    previous = {name: settings[name] for name in list(values) + list(DERIVED_SETTINGS)}
+    settings.update(values)
+    settings.update(zip(DERIVED_SETTINGS, derive_settings(PIPE_SPACING, PIPE_SPEED, PIPE_GAP)))
+    try:
+        yield
+    finally:
+        settings.update(previous)
 
-# Fonte
-font = pygame.font.SysFont(None, 36)
+# Fontes (carregadas no primeiro uso, por get_font)
+FONT_SIZE = 36
+OVERLAY_FONT_SIZE = 20  # Overlay de desempenho (F3)
 
-# Carregar imagem de fundo
-try:
-    background_img = pygame.image.load("background.png")
-    background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    has_background = True
-except:
-    # Se não encontrar a imagem, usar fundo padrão
-    has_background = False
-    print("Imagem de fundo não encontrada. Usando fundo padrão.")
+# Imagem de fundo, carregada no primeiro uso
+BACKGROUND_IMAGE = "background.png"
 
 class Bird:
     def __init__(self):
@@ -58,146 +93,356 @@ class Bird:
         self.y += self.velocity
         
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius)
+        rect = pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius)
         pygame.draw.circle(surface, BLACK, (self.x + 5, self.y - 5), 4)  # Olho
         pygame.draw.polygon(surface, RED, [(self.x - 10, self.y), (self.x, self.y + 5), (self.x - 10, self.y + 10)])  # Bico
+        return rect  # Olho e bico ficam dentro do círculo
         
     def get_rect(self):
         return pygame.Rect(self.x - self.radius, self.y - self.radius, 
                           self.radius * 2, self.radius * 2)
 
 class Pipe:
-    def __init__(self, x):
-        self.x = x
-        self.height = random.randint(100, SCREEN_HEIGHT - PIPE_GAP - GROUND_HEIGHT - 100)
+    def __init__(self, x, rng=random, tick=0, scroll=None):
+        # Retângulos de colisão, criados uma vez e só ajustados
+        self.top_rect = pygame.Rect(x, 0, PIPE_WIDTH, 0)
+        self.bottom_rect = pygame.Rect(x, 0, PIPE_WIDTH, 0)
+        self.reset(x, rng, tick, scroll)
+        
+    def reset(self, x, rng=random, tick=0, scroll=None):
+        """Sorteia a altura; usado também ao reaproveitar o cano. O cano
+        nasce em x no tick dado de scroll (a PipeQueue) e anda com ele"""
+        self.spawn_x = x
+        self.spawn_tick = tick
+        self.scroll = scroll
+        self.height = rng.randint(PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT)
         self.passed = False
+        self.top_rect.height = self.height
+        self.bottom_rect.y = self.height + PIPE_GAP
+        self.bottom_rect.height = SCREEN_HEIGHT - self.height - PIPE_GAP - GROUND_HEIGHT
         
-    def update(self):
-        self.x -= PIPE_SPEED
+    @property
+    def x(self):
+        """Posição derivada do deslocamento comum: nenhum cano é atualizado
+        por tick (sem scroll, o cano fica parado onde nasceu)"""
+        if self.scroll is None:
+            return self.spawn_x
+        return self.spawn_x - (self.scroll.tick - self.spawn_tick) * PIPE_SPEED
         
     def draw(self, surface):
+        x = self.x
         # Cano superior
-        pygame.draw.rect(surface, GREEN, (self.x, 0, PIPE_WIDTH, self.height))
-        pygame.draw.rect(surface, BLUE, (self.x - 5, self.height - 30, PIPE_WIDTH + 10, 30))
+        pygame.draw.rect(surface, GREEN, (x, 0, PIPE_WIDTH, self.height))
+        pygame.draw.rect(surface, BLUE, (x - 5, self.height - 30, PIPE_WIDTH + 10, 30))
         
         # Cano inferior
         bottom_y = self.height + PIPE_GAP
-        pygame.draw.rect(surface, GREEN, (self.x, bottom_y, PIPE_WIDTH, SCREEN_HEIGHT - bottom_y - GROUND_HEIGHT))
-        pygame.draw.rect(surface, BLUE, (self.x - 5, bottom_y, PIPE_WIDTH + 10, 30))
+        pygame.draw.rect(surface, GREEN, (x, bottom_y, PIPE_WIDTH, SCREEN_HEIGHT - bottom_y - GROUND_HEIGHT))
+        pygame.draw.rect(surface, BLUE, (x - 5, bottom_y, PIPE_WIDTH + 10, 30))
+        return pygame.Rect(x - 5, 0, PIPE_WIDTH + 10, SCREEN_HEIGHT - GROUND_HEIGHT)
         
     def get_rects(self):
-        top_rect = pygame.Rect(self.x, 0, PIPE_WIDTH, self.height)
-        bottom_rect = pygame.Rect(self.x, self.height + PIPE_GAP, PIPE_WIDTH, SCREEN_HEIGHT - self.height - PIPE_GAP - GROUND_HEIGHT)
-        return top_rect, bottom_rect
+        """Retângulos de colisão (top, bottom) na posição atual; são sempre os
+        mesmos objetos, atualizados a cada chamada"""
+        self.top_rect.x = self.bottom_rect.x = self.x
+        return self.top_rect, self.bottom_rect
+
+class PipeQueue(RingBuffer):
+    """Canos de uma partida, do mais antigo (mais à esquerda) ao mais novo.
+    
+    Como todos andam juntos, a fila guarda o deslocamento comum (tick, os
+    ticks já andados) e a posição de cada cano é derivada dele (Pipe.x).
+    Pelo mesmo motivo, o próximo cano tem tick marcado (spawn_in) e os canos
+    cruzam o pássaro na ordem da fila, então tudo o que update_game consulta
+    é um índice que só avança:
+    
+    - unpassed: o primeiro cano que ainda não pontuou;
+    - ahead e entered: a coluna do pássaro é a janela [ahead, entered), dos
+      canos que já chegaram nela e ainda não saíram por inteiro;
+    - tallest e shortest: os canos da janela que ainda podem vir a ser o mais
+      alto e o mais baixo dela (filas monotônicas), os únicos que decidem a
+      colisão.
+    """
+    def __init__(self, capacity):
+        super().__init__(capacity, Pipe)
+        self.tick = 0
+        self.spawn_in = SPAWN_INTERVAL
+        self.unpassed = 0
+        self.ahead = 0
+        self.entered = 0
+        self.tallest = deque()
+        self.shortest = deque()
+        
+    def append(self, x, rng=random):
+        """Cano novo em x, andando a partir do tick atual"""
+        return super().append(x, rng, self.tick, self)
+        
+    def enter_column(self):
+        """O próximo cano chega à coluna do pássaro"""
+        pipe = self[self.entered]
+        while self.tallest and self.tallest[-1].height <= pipe.height:
+            self.tallest.pop()
+        self.tallest.append(pipe)
+        while self.shortest and self.shortest[-1].height >= pipe.height:
+            self.shortest.pop()
+        self.shortest.append(pipe)
+        self.entered += 1
+        
+    def leave_column(self):
+        """O cano mais antigo da coluna sai dela por inteiro"""
+        pipe = self[self.ahead]
+        if self.tallest[0] is pipe:
+            self.tallest.popleft()
+        if self.shortest[0] is pipe:
+            self.shortest.popleft()
+        self.ahead += 1
+        
+    def popleft(self):
+        self.unpassed = max(0, self.unpassed - 1)
+        self.ahead = max(0, self.ahead - 1)
+        self.entered = max(0, self.entered - 1)
+        return super().popleft()
+        
+    def clear(self):
+        super().clear()
+        self.unpassed = self.ahead = self.entered = 0
+        self.tallest.clear()
+        self.shortest.clear()
+
+def render_sky(surface):
+    """Fundo padrão com gradiente de céu"""
+    surface.fill((135, 206, 235))  # Azul céu
+    # Adicionar algumas nuvens simples
+    for i in range(0, SCREEN_HEIGHT, 40):
+        color_intensity = 200 + (i // 40) % 56
+        pygame.draw.line(surface, (color_intensity, color_intensity, 255), (0, i), (SCREEN_WIDTH, i), 2)
+
+def render_ground(surface):
+    pygame.draw.rect(surface, (139, 69, 19), (0, 0, SCREEN_WIDTH, GROUND_HEIGHT))
+    pygame.draw.rect(surface, GREEN, (0, 0, SCREEN_WIDTH, 10))
+
+# Camadas estáticas, desenhadas uma vez e depois só copiadas
+sky_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), render_sky)
+ground_layer = StaticLayer((SCREEN_WIDTH, GROUND_HEIGHT), render_ground, pos=(0, SCREEN_HEIGHT - GROUND_HEIGHT))
+
+# Véu escuro por cima do jogo na tela de game over
+overlay_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), lambda surface: surface.fill(BLACK), alpha=128)
+
+_background = None
+
+def get_background():
+    """Surface de fundo do jogo, do tamanho da tela. A imagem é lida em
+    segundo plano; até ela chegar, o fundo é o céu padrão."""
+    global _background
+    if _background is None:
+        try:
+            image = request_image(BACKGROUND_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        except (OSError, pygame.error):
+            # Se não encontrar a imagem, usar fundo padrão
+            print("Imagem de fundo não encontrada. Usando fundo padrão.")
+            image = sky_layer.get_surface()
+        if image is None:
+            return sky_layer.get_surface()
+        _background = image
+    return _background
 
 def draw_background(surface):
     """Desenha o fundo do jogo"""
-    if has_background:
-        surface.blit(background_img, (0, 0))
-    else:
-        # Fundo padrão com gradiente de céu
-        surface.fill((135, 206, 235))  # Azul céu
-        # Adicionar algumas nuvens simples
-        for i in range(0, SCREEN_HEIGHT, 40):
-            color_intensity = 200 + (i // 40) % 56
-            pygame.draw.line(surface, (color_intensity, color_intensity, 255), (0, i), (SCREEN_WIDTH, i), 2)
+    surface.blit(get_background(), (0, 0))
 
 def draw_ground(surface):
-    pygame.draw.rect(surface, (139, 69, 19), (0, SCREEN_HEIGHT - GROUND_HEIGHT, SCREEN_WIDTH, GROUND_HEIGHT))
-    pygame.draw.rect(surface, GREEN, (0, SCREEN_HEIGHT - GROUND_HEIGHT, SCREEN_WIDTH, 10))
+    return ground_layer.draw(surface)
+
+def draw_game(surface, bird, pipes, score):
+    """Desenha canos, pássaro, chão e pontuação; retorna os retângulos alterados"""
+    rects = [pipe.draw(surface) for pipe in pipes]
+    rects.append(bird.draw(surface))
+    rects.append(draw_ground(surface))
+    profiler.mark("sprites")
+    
+    # Mostrar pontuação
+    score_text = render_text(get_font(FONT_SIZE), str(score), WHITE)
+    rects.append(surface.blit(score_text, (10, 10)))
+    profiler.mark("hud")
+    return rects
 
 def show_game_over(surface, score):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    overlay.set_alpha(128)
-    overlay.fill(BLACK)
-    surface.blit(overlay, (0, 0))
+    overlay_layer.draw(surface)
     
-    game_over_text = font.render("GAME OVER", True, RED)
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    restart_text = font.render("Press SPACE to restart", True, WHITE)
+    font = get_font(FONT_SIZE)
+    game_over_text = render_text(font, "GAME OVER", RED)
+    score_text = render_text(font, f"Score: {score}", WHITE)
+    restart_text = render_text(font, "Press SPACE to restart", WHITE)
     
     surface.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 60))
     surface.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
     surface.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 60))
 
-def main():
-    bird = Bird()
-    pipes = [Pipe(SCREEN_WIDTH)]
+def update_game(bird, pipes, score, rng=random):
+    """Avança um tick da lógica do jogo e retorna (score, game_over).
+    
+    pipes é a PipeQueue de new_pipes(): os canos andam pelo tick comum da
+    fila, e pontuação e colisão só olham os canos que cruzam o pássaro neste
+    tick e os extremos da coluna dele, então o custo não cresce com o número
+    de canos na tela.
+    """
+    game_over = False
+    bird.update()
+    
+    # Gerar novos canos, no tick marcado
+    pipes.spawn_in -= 1
+    if pipes.spawn_in <= 0:
+        pipes.append(SCREEN_WIDTH, rng)
+        pipes.spawn_in = SPAWN_INTERVAL
+    
+    # Atualizar canos: um tick a mais no deslocamento comum move todos
+    pipes.tick += 1
+    
+    # Verificar pontuação
+    count = len(pipes)
+    while pipes.unpassed < count and pipes[pipes.unpassed].x + PIPE_WIDTH < bird.x:
+        pipes[pipes.unpassed].passed = True
+        pipes.unpassed += 1
+        score += 1
+    
+    # Atualizar a coluna do pássaro: primeiro entram os canos que chegaram
+    # nela, depois saem os que ficaram inteiros à esquerda (numa velocidade
+    # alta, o mesmo cano pode entrar e sair no mesmo tick)
+    bird_rect = bird.get_rect()
+    while pipes.entered < count and pipes[pipes.entered].x < bird_rect.right:
+        pipes.enter_column()
+    while pipes.ahead < pipes.entered and pipes[pipes.ahead].x + PIPE_WIDTH <= bird_rect.left:
+        pipes.leave_column()
+    
+    # Verificar colisão: o mesmo teste de colliderect com os retângulos de
+    # Pipe.get_rects, mas só contra o cano de cima mais comprido e o de
+    # baixo mais alto da coluna
+    if pipes.tallest:
+        if bird_rect.top < pipes.tallest[0].height and bird_rect.bottom > 0:
+            game_over = True
+        if (bird_rect.bottom > pipes.shortest[0].height + PIPE_GAP
+                and bird_rect.top < SCREEN_HEIGHT - GROUND_HEIGHT):
+            game_over = True
+    
+    # Verificar colisão com chão/teto
+    if bird.y - bird.radius <= 0 or bird.y + bird.radius >= SCREEN_HEIGHT - GROUND_HEIGHT:
+        game_over = True
+    
+    # Remover canos fora da tela: todos andam juntos, então são sempre os
+    # mais antigos, no início da fila
+    while pipes and pipes[0].x + PIPE_WIDTH < 0:
+        pipes.popleft()
+    
+    return score, game_over
+
+def new_pipes(rng=random):
+    """Fila de canos de uma partida, já com o primeiro cano"""
+    pipes = PipeQueue(PIPE_CAPACITY)
+    pipes.append(SCREEN_WIDTH, rng)
+    # O primeiro cano nasce antes do primeiro tick, e anda nele também
+    pipes.spawn_in = SPAWN_INTERVAL + 1
+    return pipes
+
+def new_game():
+    """Partida nova com semente própria; retorna (bird, pipes, rng, replay)"""
+    seed = random.randrange(2 ** 63)
+    rng = random.Random(seed)
+    return Bird(), new_pipes(rng), rng, Replay(FLAPPY_BIRD, seed)
+
+def main(render_mode=RENDER_MODE):
+    screen = init_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Flappy Bird Clone")
+    clock = pygame.time.Clock()
+    renderer = Renderer(screen, get_background(), render_mode)
+    bird, pipes, rng, replay = new_game()
     score = 0
     game_over = False
+    flap = False
+    # Sem detalhes opcionais a cortar: com atraso, o pacer só pula quadros
+    pacer = FramePacer(FPS, max_quality=QUALITY_FULL)
+    
+    profiler.watch("text_renders", lambda: text_cache.misses)
+    profiler.watch("skipped_frames", lambda: pacer.skipped)
     
     running = True
     while running:
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        
+        # Na tela de game over já desenhada, dorme até chegar uma entrada
+        if renderer.idle:
+            events = [pygame.event.wait()] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        
+        for event in events:
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                elif event.key == pygame.K_SPACE:
                     if not game_over:
-                        bird.jump()
+                        flap = True
                     else:
                         # Reiniciar jogo
-                        bird = Bird()
-                        pipes = [Pipe(SCREEN_WIDTH)]
+                        bird, pipes, rng, replay = new_game()
                         score = 0
                         game_over = False
+        profiler.mark("events")
         
+        # Entrega o que o worker de E/S terminou (ex.: a imagem de fundo)
+        get_worker().poll()
+        renderer.set_background(get_background())
+        profiler.mark("io")
+        
+        # Lógica em ticks fixos: um quadro lento não deixa o jogo mais lento,
+        # só faz o quadro seguinte rodar mais ticks (ver pacing)
+        pacer.begin_frame()
         if not game_over:
-            # Atualizar elementos
-            bird.update()
-            
-            # Gerar novos canos
-            if pipes[-1].x < SCREEN_WIDTH - 200:
-                pipes.append(Pipe(SCREEN_WIDTH))
-            
-            # Atualizar canos
-            for pipe in pipes[:]:
-                pipe.update()
-                
-                # Remover canos fora da tela
-                if pipe.x + PIPE_WIDTH < 0:
-                    pipes.remove(pipe)
-                
-                # Verificar pontuação
-                if not pipe.passed and pipe.x + PIPE_WIDTH < bird.x:
-                    pipe.passed = True
-                    score += 1
-                
-                # Verificar colisão
-                bird_rect = bird.get_rect()
-                top_rect, bottom_rect = pipe.get_rects()
-                
-                if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
-                    game_over = True
-                
-                # Verificar colisão com chão/teto
-                if bird.y - bird.radius <= 0 or bird.y + bird.radius >= SCREEN_HEIGHT - GROUND_HEIGHT:
-                    game_over = True
-        
-        # Desenhar elementos
-        screen.fill(BLACK)
-        
-        # Desenhar fundo
-        draw_background(screen)
-        
-        # Desenhar elementos do jogo
-        for pipe in pipes:
-            pipe.draw(screen)
-        
-        bird.draw(screen)
-        draw_ground(screen)
-        
-        # Mostrar pontuação
-        score_text = font.render(str(score), True, WHITE)
-        screen.blit(score_text, (10, 10))
-        
-        # Mostrar game over se necessário
+            while pacer.tick():
+                # Atualizar elementos, gravando a entrada do tick para o replay
+                if flap:
+                    bird.jump()
+                replay.record(FLAP if flap else 0)
+                flap = False
+                score, game_over = update_game(bird, pipes, score, rng)
+                if game_over:
+                    replay.finish(score)
+                    save_to_replay_dir(replay)
+                    break
+            profiler.count("pipes", len(pipes))
+        else:
+            pacer.reset()
+        profiler.mark("update")
+        
         if game_over:
-            show_game_over(screen, score)
+            # Tela estática: só é redesenhada se a pontuação mudar
+            def draw_game_over(surface):
+                draw_background(surface)
+                draw_game(surface, bird, pipes, score)
+                show_game_over(surface, score)
+            renderer.static(score, draw_game_over)
+            profiler.mark("draw")
+        elif pacer.render:
+            # Desenhar elementos do jogo (o renderer apaga com o fundo)
+            renderer.begin()
+            profiler.mark("background")
+            renderer.add(draw_game(screen, bird, pipes, score))
+            profiler.draw_overlay(renderer, get_font(OVERLAY_FONT_SIZE))
+            profiler.mark("overlay")
+            renderer.present()
+            profiler.mark("flip")
         
-        pygame.display.flip()
+        pacer.end_frame()
         clock.tick(FPS)
+        profiler.mark("wait")
+        profiler.end_frame()
     
+    print(f"Ritmo: {pacer.report()}")
+    path = profiler.export()
+    if path:
+        print(f"Perfil de {profiler.frame} quadros gravado em {path}")
+    get_worker().close()  # Termina de gravar os replays pendentes
     pygame.quit()
     sys.exit()
 
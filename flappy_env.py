@@ -0,0 +1,179 @@
+"""Ambiente no estilo gym para treinar agentes do Flappy Bird, e avaliação de
+populações inteiras em paralelo.
+
+FlappyEnv embrulha Bird/Pipe/update_game sem tela: reset(seed) devolve a
+primeira observação e step(action) devolve (observação, recompensa, done,
+info). evaluate_population() divide os agentes entre processos; todos jogam
+as mesmas sementes, então as pontuações são comparáveis entre si.
+
+Uso: python flappy_env.py [--agents 1000] [--episodes 3] [--workers N]
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import flappy_bird as fb
+from replay import FLAP
+
+# Observação: (y do pássaro, velocidade, distância até o próximo cano,
+# altura do centro da abertura relativa ao pássaro), normalizados
+OBSERVATION_SIZE = 4
+
+# Recompensas por tick
+REWARD_ALIVE = 0.1
+REWARD_PIPE = 1.0
+REWARD_DEATH = -1.0
+
+MAX_TICKS = 10000  # Limite de um episódio (~2min45s de jogo)
+
+
+class FlappyEnv:
+    """Uma partida do Flappy Bird controlada por ações FLAP/0 a cada tick"""
+    def __init__(self, max_ticks=MAX_TICKS):
+        self.max_ticks = max_ticks
+        self.reset()
+
+    def reset(self, seed=None):
+        """Começa um episódio novo; retorna a primeira observação"""
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.bird = fb.Bird()
+        self.pipes = fb.new_pipes(self.rng)
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        return self.observation()
+
+    def next_pipe(self):
+        """Primeiro cano que o pássaro ainda não passou"""
+        left = self.bird.x - self.bird.radius
+        for pipe in self.pipes:
+            if pipe.x + fb.PIPE_WIDTH >= left:
+                return pipe
+        return self.pipes[-1]
+
+    def observation(self):
+        bird = self.bird
+        pipe = self.next_pipe()
+        gap_center = pipe.height + fb.PIPE_GAP / 2
+        return (bird.y / fb.SCREEN_HEIGHT,
+                bird.velocity / -fb.JUMP_STRENGTH,
+                (pipe.x - bird.x) / fb.SCREEN_WIDTH,
+                (gap_center - bird.y) / fb.SCREEN_HEIGHT)
+
+    def step(self, action):
+        """Avança um tick; retorna (observação, recompensa, done, info)"""
+        if self.done:
+            raise RuntimeError("step() depois do fim do episódio; chame reset()")
+        if action & FLAP:
+            self.bird.jump()
+        previous_score = self.score
+        self.score, game_over = fb.update_game(self.bird, self.pipes, self.score, self.rng)
+        self.ticks += 1
+        if game_over:
+            reward = REWARD_DEATH
+        else:
+            reward = REWARD_ALIVE + REWARD_PIPE * (self.score - previous_score)
+        truncated = not game_over and self.ticks >= self.max_ticks
+        self.done = game_over or truncated
+        info = {"score": self.score, "ticks": self.ticks, "truncated": truncated}
+        return self.observation(), reward, self.done, info
+
+
+class LinearPolicy:
+    """Política mínima para evolução: pula se pesos . observação + viés > 0.
+
+    weights tem OBSERVATION_SIZE + 1 valores (o último é o viés); é uma
+    lista simples, fácil de mutar, cruzar e enviar para outros processos.
+    """
+    def __init__(self, weights):
+        if len(weights) != OBSERVATION_SIZE + 1:
+            raise ValueError(f"Esperados {OBSERVATION_SIZE + 1} pesos, recebidos {len(weights)}")
+        self.weights = list(weights)
+
+    def __call__(self, observation):
+        total = self.weights[-1]
+        for weight, value in zip(self.weights, observation):
+            total += weight * value
+        return FLAP if total > 0 else 0
+
+    @classmethod
+    def random(cls, rng=random):
+        return cls([rng.uniform(-1, 1) for _ in range(OBSERVATION_SIZE + 1)])
+
+
+def run_episode(env, policy, seed):
+    """Joga um episódio; retorna (score, ticks sobrevividos)"""
+    observation = env.reset(seed)
+    done = False
+    while not done:
+        observation, _, done, _ = env.step(policy(observation))
+    return env.score, env.ticks
+
+
+def evaluate_agents(policies, seeds, max_ticks=MAX_TICKS):
+    """Avalia no processo atual; para cada agente, (scores, ticks) por semente"""
+    env = FlappyEnv(max_ticks)
+    results = []
+    for policy in policies:
+        episodes = [run_episode(env, policy, seed) for seed in seeds]
+        results.append((tuple(score for score, _ in episodes), tuple(ticks for _, ticks in episodes)))
+    return results
+
+
+def _evaluate_shard(args):
+    return evaluate_agents(*args)
+
+
+def evaluate_population(policies, seeds, workers=None, max_ticks=MAX_TICKS):
+    """Avalia todos os agentes nas mesmas sementes, dividindo-os entre
+    workers processos (padrão: todos os núcleos).
+
+    As políticas precisam ser serializáveis com pickle (ex.: LinearPolicy).
+    Retorna, na ordem de policies, (scores, ticks) com um valor por semente.
+    """
+    policies = list(policies)
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(policies) <= 1:
+        return evaluate_agents(policies, seeds, max_ticks)
+    # Vários pedaços por worker equilibram agentes que vivem mais que outros
+    shard_size = max(1, len(policies) // (workers * 4))
+    shards = [(policies[start:start + shard_size], seeds, max_ticks)
+              for start in range(0, len(policies), shard_size)]
+    with ProcessPoolExecutor(workers) as executor:
+        return [result for shard in executor.map(_evaluate_shard, shards) for result in shard]
+
+
+def fitness(result):
+    """Score médio, desempatado pela sobrevivência média"""
+    scores, ticks = result
+    return sum(scores) / len(scores), sum(ticks) / len(ticks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia uma população aleatória de agentes")
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--episodes", type=int, default=3, help="sementes jogadas por todos os agentes")
+    parser.add_argument("--workers", type=int, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    population = [LinearPolicy.random(rng) for _ in range(args.agents)]
+    seeds = [rng.randrange(2 ** 63) for _ in range(args.episodes)]
+
+    start = time.perf_counter()
+    results = evaluate_population(population, seeds, args.workers, args.max_ticks)
+    elapsed = time.perf_counter() - start
+    print(f"{args.agents} agentes x {args.episodes} episódios em {elapsed:.2f}s "
+          f"({args.agents * args.episodes / elapsed:,.0f} episódios/s)")
+    ranking = sorted(range(len(population)), key=lambda i: fitness(results[i]), reverse=True)
+    for i in ranking[:5]:
+        score, ticks = fitness(results[i])
+        weights = ", ".join(f"{weight:+.2f}" for weight in population[i].weights)
+        print(f"  agente {i}: score médio {score:.1f}, {ticks:.0f} ticks  [{weights}]")
@@ -0,0 +1,194 @@
+"""Simulador em lote (headless) do Flappy Bird usando NumPy.
+
+Avança N pássaros independentes, cada um com o seu próprio fluxo de canos,
+numa única chamada de step(). A física é a de Bird.update, os canos nascem
+no ritmo de update_game (um a cada fb.SPAWN_INTERVAL ticks, até
+fb.PIPE_CAPACITY vivos) e andam fb.PIPE_SPEED por tick, e a colisão reproduz
+Bird.get_rect/Pipe.get_rects, então o resultado é idêntico ao loop por
+objeto (update_game) para a mesma semente.
+
+Uso: python flappy_sim.py [--birds N] [--ticks T]
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import flappy_bird as fb
+
+# Geometria do pássaro, lida da própria classe Bird
+_template = fb.Bird()
+BIRD_X = _template.x
+BIRD_START_Y = _template.y
+BIRD_RADIUS = _template.radius
+BIRD_LEFT = BIRD_X - BIRD_RADIUS
+BIRD_RIGHT = BIRD_X + BIRD_RADIUS
+del _template
+
+FLOOR_Y = fb.SCREEN_HEIGHT - fb.GROUND_HEIGHT
+
+
+class BatchSimulator:
+    """N partidas simultâneas guardadas em arrays (uma linha por pássaro)"""
+
+    def __init__(self, seeds):
+        self.reset(seeds)
+
+    def reset(self, seeds):
+        seeds = list(seeds)
+        n = len(seeds)
+        self.n = n
+        # Um gerador por pássaro, como o rng de cada partida do jogo
+        self.rngs = [random.Random(seed) for seed in seeds]
+        self._rows = np.arange(n)
+
+        self.y = np.full(n, BIRD_START_Y, dtype=np.float64)
+        self.velocity = np.zeros(n, dtype=np.float64)
+        self.alive = np.ones(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        # Máximo de canos vivos ao mesmo tempo por pássaro, como a PipeQueue
+        self.capacity = capacity = fb.PIPE_CAPACITY
+        self.pipe_x = np.zeros((n, capacity), dtype=np.int64)
+        self.pipe_height = np.zeros((n, capacity), dtype=np.int64)
+        self.pipe_passed = np.zeros((n, capacity), dtype=bool)
+        self.pipe_active = np.zeros((n, capacity), dtype=bool)
+        self.last_pipe = np.full(n, capacity - 1, dtype=np.intp)
+
+        self._spawn(self._rows)
+
+    def _spawn(self, idx):
+        """Cria um cano novo na borda direita para os pássaros em idx"""
+        slot = (self.last_pipe[idx] + 1) % self.capacity
+        rngs = self.rngs
+        heights = [rngs[i].randint(fb.PIPE_MIN_HEIGHT, fb.PIPE_MAX_HEIGHT) for i in idx.tolist()]
+        self.pipe_x[idx, slot] = fb.SCREEN_WIDTH
+        self.pipe_height[idx, slot] = heights
+        self.pipe_passed[idx, slot] = False
+        self.pipe_active[idx, slot] = True
+        self.last_pipe[idx] = slot
+
+    def step(self, flap=None):
+        """Avança um tick; flap é uma máscara booleana de pulos (opcional)"""
+        alive = self.alive.copy()
+        if not alive.any():
+            return alive
+
+        # Pássaro (mesma ordem de Bird.jump + Bird.update)
+        if flap is not None:
+            self.velocity[flap & alive] = fb.JUMP_STRENGTH
+        np.add(self.velocity, fb.GRAVITY, out=self.velocity, where=alive)
+        np.add(self.y, self.velocity, out=self.y, where=alive)
+
+        # Gerar novos canos, no tick marcado: o primeiro nasce em reset e os
+        # outros a cada SPAWN_INTERVAL ticks, como em new_pipes/update_game
+        spawn = alive & (self.ticks > 0) & (self.ticks % fb.SPAWN_INTERVAL == 0)
+        if spawn.any():
+            self._spawn(np.flatnonzero(spawn))
+
+        # Atualizar canos
+        live = self.pipe_active & alive[:, None]
+        self.pipe_x -= fb.PIPE_SPEED * live
+        pipe_right = self.pipe_x + fb.PIPE_WIDTH
+
+        # Verificar pontuação
+        scored = live & ~self.pipe_passed & (pipe_right < BIRD_X)
+        self.pipe_passed |= scored
+        self.score += scored.sum(axis=1)
+
+        # Verificar colisão (pygame.Rect trunca coordenadas float)
+        bird_top = np.trunc(self.y - BIRD_RADIUS).astype(np.int64)[:, None]
+        bird_bottom = bird_top + 2 * BIRD_RADIUS
+        overlap_x = (BIRD_LEFT < pipe_right) & (self.pipe_x < BIRD_RIGHT)
+        hit_top = (bird_top < self.pipe_height) & (0 < bird_bottom)
+        hit_bottom = (self.pipe_height + fb.PIPE_GAP < bird_bottom) & (bird_top < FLOOR_Y)
+        hit = (live & overlap_x & (hit_top | hit_bottom)).any(axis=1)
+
+        # Verificar colisão com chão/teto
+        hit |= (self.y - BIRD_RADIUS <= 0) | (self.y + BIRD_RADIUS >= FLOOR_Y)
+
+        # Remover canos fora da tela
+        self.pipe_active &= ~(live & (pipe_right < 0))
+
+        self.ticks += alive
+        self.alive &= ~hit
+        return self.alive
+
+    def next_pipe(self):
+        """Retorna (x, altura) do próximo cano à frente de cada pássaro"""
+        ahead = self.pipe_active & (self.pipe_x + fb.PIPE_WIDTH >= BIRD_LEFT)
+        idx = np.where(ahead, self.pipe_x, np.iinfo(np.int64).max).argmin(axis=1)
+        return self.pipe_x[self._rows, idx], self.pipe_height[self._rows, idx]
+
+    def run(self, policy, max_ticks):
+        """Roda até todos morrerem ou max_ticks; policy(sim) -> máscara de pulos"""
+        for _ in range(max_ticks):
+            if not self.step(policy(self)).any():
+                break
+        return self.score, self.ticks
+
+
+def heuristic_policy(sim):
+    """Pula quando o pássaro cai abaixo do meio da abertura do próximo cano"""
+    _, height = sim.next_pipe()
+    return (sim.y > height + fb.PIPE_GAP // 2 + 20) & (sim.velocity >= 0)
+
+
+def run_reference(seed, max_ticks):
+    """Uma partida com os objetos Bird/Pipe originais e a mesma política"""
+    rng = random.Random(seed)
+    bird = fb.Bird()
+    pipes = fb.new_pipes(rng)
+    score = 0
+    for tick in range(1, max_ticks + 1):
+        pipe = min((p for p in pipes if p.x + fb.PIPE_WIDTH >= BIRD_LEFT), key=lambda p: p.x)
+        if bird.y > pipe.height + fb.PIPE_GAP // 2 + 20 and bird.velocity >= 0:
+            bird.jump()
+        score, game_over = fb.update_game(bird, pipes, score, rng)
+        if game_over:
+            break
+    return score, tick, bird.y, bird.velocity
+
+
+def verify(seeds, max_ticks):
+    """Compara o simulador em lote com o loop por objeto, bit a bit"""
+    sim = BatchSimulator(seeds)
+    sim.run(heuristic_policy, max_ticks)
+    mismatches = 0
+    for i, seed in enumerate(seeds):
+        expected = run_reference(seed, max_ticks)
+        got = (int(sim.score[i]), int(sim.ticks[i]), float(sim.y[i]), float(sim.velocity[i]))
+        if got != expected:
+            mismatches += 1
+            print(f"Divergência na semente {seed}: esperado {expected}, obtido {got}")
+    return mismatches
+
+
+def benchmark(n_birds, ticks):
+    sim = BatchSimulator(range(n_birds))
+    flap = np.zeros(n_birds, dtype=bool)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        # Mantém todos vivos para medir o custo cheio de cada tick
+        sim.alive[:] = True
+        flap[:] = heuristic_policy(sim)
+        sim.step(flap)
+    elapsed = time.perf_counter() - start
+    return n_birds * ticks / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulador em lote do Flappy Bird")
+    parser.add_argument("--birds", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--verify", type=int, default=200, help="partidas comparadas com o loop original")
+    args = parser.parse_args()
+
+    mismatches = verify(range(args.verify), 5000)
+    print(f"Verificação: {args.verify - mismatches}/{args.verify} partidas idênticas")
+    rate = benchmark(args.birds, args.ticks)
+    print(f"{args.birds} pássaros x {args.ticks} ticks: {rate:,.0f} bird-steps/s")
@@ -0,0 +1,506 @@
+"""Solver offline do Flappy Bird: diz quantos canos de uma sequência dá para
+passar e qual o caminho com o mínimo de pulos ("jogo perfeito").
+
+O estado do pássaro é (y, velocidade) numa grade discreta, mais o tick dentro
+do cano atual. Com GRAVITY, JUMP_STRENGTH e a altura inicial múltiplos de
+y_step (0.5 px nos valores padrão), toda posição e velocidade do jogo cai
+exatamente na grade e o resultado é exato; com valores que não são frações
+de potência de 2 (ex.: 0.45), as somas em float do jogo arredondam diferente
+da grade e o resultado é aproximado (--verify mostra as divergências). A
+física vem de Bird.update e Bird.jump, a colisão de Bird.get_rect e
+Pipe.get_rects e as alturas de Pipe.reset (PIPE_MIN_HEIGHT..PIPE_MAX_HEIGHT):
+tudo é chamado uma vez só, para montar as tabelas.
+
+Cada velocidade é uma linha, e as alturas alcançáveis com ela formam um
+inteiro usado como bitset (bit i: y = i * y_step). Sem pulo, a linha inteira
+passa para a velocidade seguinte e anda o mesmo tanto; com pulo, todas vão
+para a velocidade do pulo. Um tick custa algumas operações por linha, para
+todos os estados de uma vez.
+
+Os canos andam juntos, então a coluna do pássaro é ocupada sempre no mesmo
+ritmo: a partida é dividida em segmentos, um por cano, que terminam quando o
+cano sai da coluna. O conjunto ao fim de um segmento só depende do conjunto
+do começo e da altura do cano, e essa transição fica memorizada. Depois de
+alguns canos o conjunto volta a ser o mesmo para a mesma altura, então uma
+sequência nova custa uma consulta por cano. O mínimo de pulos não tem essa
+memória (ver Solver._min_flap_layers) e simula a sequência inteira.
+
+Uso: python flappy_solver.py [--seeds 2000] [--rounds 3] [--pipes 20]
+     [--paths 100] [--verify 50] [--gap 150] [--gravity 0.5] [--jump -8]
+     [--speed 3]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from fractions import Fraction
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import flappy_bird as fb
+from replay import FLAP
+
+MAX_DENOMINATOR = 1000  # Maior denominador aceito para o passo da grade
+MAX_CORES = 4  # Núcleos guardados por trecho (ver Solver._bounded)
+
+
+class _ScriptedRng:
+    """Faz Pipe.reset sortear os valores dados, em ordem"""
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def randint(self, low, high):
+        return next(self._values)
+
+
+def pipe_heights(seed, count):
+    """Alturas dos count primeiros canos da partida com esta semente"""
+    rng = random.Random(seed)
+    return [fb.Pipe(fb.SCREEN_WIDTH, rng).height for _ in range(count)]
+
+
+class Solver:
+    """Tabelas de física e colisão para as configurações atuais de
+    flappy_bird, com as transições por segmento memorizadas.
+
+    exact diz se a grade representa o jogo sem arredondamento (vale quando
+    GRAVITY e JUMP_STRENGTH são frações com denominador potência de 2, como
+    os valores padrão). Canos além da sequência consultada não contam.
+    """
+    def __init__(self):
+        bird = fb.Bird()
+        self.start_y, self.start_velocity = bird.y, bird.velocity
+        raw = (fb.GRAVITY, fb.JUMP_STRENGTH, self.start_y)
+        values = [Fraction(value).limit_denominator(MAX_DENOMINATOR) for value in raw]
+        self.exact = all(value == Fraction(exact) for value, exact in zip(values, raw))
+        denominator = math.lcm(*(value.denominator for value in values))
+        self.y_step = Fraction(math.gcd(*(int(value * denominator) for value in values)), denominator)
+        self._build_rows(bird)
+        self._build_masks(bird)
+
+        self._segments = []  # Por cano: canos na coluna a cada tick, relativos a ele
+        self._segment_runs = []  # Por cano: os dois trechos memorizados (ver _advance)
+        self._runs = {}  # Ticks de um trecho -> (id, ticks, canos que ele enxerga)
+        self._sets = {}  # Bitsets por linha -> id
+        self._set_list = []
+        self._memo = {}
+        self._bounds = {}
+        self._alive = (self.wall_mask,) * len(self.velocities)
+        self.empty = self._intern((0,) * len(self.velocities))
+        rows = [0] * len(self.velocities)
+        rows[self.start_row] = 1 << self._cells(self.start_y)
+        self.start = self._intern(tuple(rows))
+
+    # --- Tabelas -------------------------------------------------------
+
+    def _cells(self, value):
+        return round(Fraction(value).limit_denominator(MAX_DENOMINATOR) / self.y_step)
+
+    def _build_rows(self, bird):
+        """Velocidades possíveis (linhas), a linha seguinte sem pulo e quanto
+        y anda ao chegar em cada uma, tudo a partir de Bird.update"""
+        def after(velocity, flap):
+            bird.velocity = velocity
+            if flap:
+                bird.jump()
+            bird.update()
+            return bird.velocity
+
+        self.velocities, self.next_row, index = [], [], {}
+        # Uma cadeia acaba quando o pássaro já teria percorrido mais que a
+        # altura livre entre teto e chão: dali em diante ele sempre morre
+        free_height = fb.SCREEN_HEIGHT - fb.GROUND_HEIGHT - 2 * bird.radius
+        for velocity in (self.start_velocity, after(self.start_velocity, True)):
+            position = lowest = highest = 0
+            previous = None
+            while velocity not in index and highest - lowest < free_height:
+                index[velocity] = len(self.velocities)
+                self.velocities.append(velocity)
+                self.next_row.append(None)
+                if previous is not None:
+                    self.next_row[previous] = index[velocity]
+                previous = index[velocity]
+                velocity = after(velocity, False)
+                position += velocity
+                lowest, highest = min(lowest, position), max(highest, position)
+            if previous is not None and velocity in index:
+                self.next_row[previous] = index[velocity]  # Cadeia que se junta à outra
+
+        self.shifts = [self._cells(velocity) for velocity in self.velocities]
+        self.start_row = index[self.start_velocity]
+        self.flap_row = index[after(self.start_velocity, True)]
+        self.previous_rows = [[] for _ in self.velocities]
+        for row, following in enumerate(self.next_row):
+            if following is not None:
+                self.previous_rows[following].append(row)
+        # Sem pulo, (linha seguinte, deslocamento para cima, para baixo); os
+        # dois deslocamentos evitam testar o sinal a cada tick
+        self._moves = [None if following is None else
+                       (following, max(self.shifts[following], 0), max(-self.shifts[following], 0))
+                       for following in self.next_row]
+        # Só estas linhas recebem estados de mais de uma origem
+        self._merge_rows = [row for row, previous in enumerate(self.previous_rows)
+                            if len(previous) > 1 or row == self.flap_row]
+
+    def _build_masks(self, bird):
+        """Alturas vivas: sem tocar teto/chão (como em update_game) e, para
+        cada altura de cano na coluna, sem colidir com os rects dele"""
+        floor = fb.SCREEN_HEIGHT - fb.GROUND_HEIGHT
+        ys = [float(cell * self.y_step) for cell in range(self._cells(fb.SCREEN_HEIGHT) + 1)]
+        # Camadas de custo lado a lado no mesmo inteiro, com folga para um
+        # deslocamento não invadir a camada vizinha
+        self.layer_bits = len(ys) + max(abs(shift) for shift in self.shifts) + 1
+        self._replicators = [0]
+        self.wall_mask = 0
+        for cell, y in enumerate(ys):
+            if not (y - bird.radius <= 0 or y + bird.radius >= floor):
+                self.wall_mask |= 1 << cell
+        self.pipe_masks = {}
+        for height in range(fb.PIPE_MIN_HEIGHT, fb.PIPE_MAX_HEIGHT + 1):
+            pipe = fb.Pipe(bird.x - fb.PIPE_WIDTH // 2, _ScriptedRng([height]))
+            top_rect, bottom_rect = pipe.get_rects()
+            mask = 0
+            for cell, y in enumerate(ys):
+                bird.y = y
+                bird_rect = bird.get_rect()
+                if not (bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect)):
+                    mask |= 1 << cell
+            self.pipe_masks[height] = mask & self.wall_mask
+
+    def _extend_schedule(self, count):
+        """Roda update_game com um pássaro fantasma e canos numerados (a
+        "altura" sorteada é o índice do cano) até o cano count - 1 sair da
+        coluna, anotando quais canos ocupam a coluna a cada tick"""
+        if len(self._segments) >= count:
+            return
+        count = max(count, 2 * len(self._segments))
+        numbers = _ScriptedRng(itertools.count())
+        bird = fb.Bird()
+        pipes = fb.new_pipes(numbers)
+        columns = []
+        gone = {}  # Cano -> último tick na coluna
+        while count - 1 not in gone:
+            bird.y, bird.velocity = self.start_y, self.start_velocity
+            fb.update_game(bird, pipes, 0, numbers)
+            bird_rect = bird.get_rect()
+            column = []
+            for pipe in pipes:
+                if pipe.x + fb.PIPE_WIDTH <= bird_rect.left:
+                    gone.setdefault(pipe.height, len(columns))
+                elif pipe.x < bird_rect.right:
+                    column.append(pipe.height)
+            columns.append(column)
+
+        self._segments, self._segment_runs = [], []
+        start = 0
+        for index in range(count):
+            end = gone[index]
+            segment = tuple(tuple(pipe - index for pipe in column) for column in columns[start:end])
+            # Os ticks antes do cano chegar à coluna não dependem da altura
+            # dele, então ficam num trecho à parte
+            free = next((tick for tick, column in enumerate(segment) if column), len(segment))
+            self._segments.append(segment)
+            self._segment_runs.append(tuple(self._intern_run(run) for run in (segment[:free], segment[free:])))
+            start = end
+
+    def _intern_run(self, columns):
+        run = self._runs.get(columns)
+        if run is None:
+            offsets = tuple(sorted({offset for column in columns for offset in column}))
+            run = self._runs[columns] = (len(self._runs), columns, offsets)
+        return run
+
+    # --- Conjuntos -------------------------------------------------------
+
+    def _intern(self, rows):
+        set_id = self._sets.get(rows)
+        if set_id is None:
+            set_id = self._sets[rows] = len(self._set_list)
+            self._set_list.append(rows)
+        return set_id
+
+    def _allowed(self, column, heights, first):
+        mask = self.wall_mask
+        for offset in column:
+            if 0 <= first + offset < len(heights):
+                mask &= self.pipe_masks[heights[first + offset]]
+        return mask
+
+    def _key(self, run, heights, index):
+        """O trecho do cano index e as alturas que ele enxerga"""
+        run_id, _, offsets = run
+        return run_id, tuple(heights[index + offset] if 0 <= index + offset < len(heights) else None
+                             for offset in offsets)
+
+    def _tick(self, rows, allowed, flap_layer=0):
+        """Estados vivos depois de um tick, com e sem pulo; o pulo também
+        anda flap_layer bits (uma camada de custo, em _layered_tick)"""
+        moves = self._moves
+        new = [0] * len(rows)
+        flapped = 0
+        for row, mask in enumerate(rows):
+            if mask:
+                flapped |= mask
+                move = moves[row]
+                if move is not None:
+                    following, up, down = move
+                    new[following] |= (mask << up >> down) & allowed
+        if flapped:
+            shift = self.shifts[self.flap_row]
+            new[self.flap_row] |= (flapped << max(shift, 0) + flap_layer >> max(-shift, 0)) & allowed
+        return new
+
+    def _layered_tick(self, rows, allowed, layers):
+        """Como _tick, com cada estado na camada do mínimo de pulos até ele:
+        a camada c (bits a partir de c * layer_bits) tem c pulos a mais que a
+        camada 0. layers é o número de camadas ocupadas mais uma, e volta
+        atualizado junto com as linhas."""
+        while len(self._replicators) <= layers:
+            self._replicators.append(self._replicators[-1] << self.layer_bits | 1)
+        rows = self._tick(rows, allowed * self._replicators[layers], self.layer_bits)
+        for row in self._merge_rows:
+            # Fica só a camada mais baixa de cada estado
+            mask = rows[row]
+            lower, span = mask << self.layer_bits, 1
+            while span < layers:
+                lower |= lower << span * self.layer_bits
+                span *= 2
+            rows[row] = mask & ~lower
+        # Camada nova só aparece com o pulo
+        return rows, max(layers, rows[self.flap_row].bit_length() // self.layer_bits + 2)
+
+    def _drop_empty_layers(self, rows):
+        """(camadas sem as vazias do começo, quantas foram tiradas, layers)"""
+        lowest = min(((mask & -mask).bit_length() - 1 for mask in rows if mask), default=0) // self.layer_bits
+        rows = tuple(mask >> lowest * self.layer_bits for mask in rows)
+        return rows, lowest, max(mask.bit_length() for mask in rows) // self.layer_bits + 2
+
+    def _simulate(self, rows, columns, heights, index):
+        for column in columns:
+            if not any(rows):
+                break
+            rows = self._tick(rows, self._allowed(column, heights, index))
+        return tuple(rows)
+
+    def _simulate_layered(self, rows, columns, heights, index):
+        """(linhas, camadas vazias tiradas, layers) ao fim dos ticks columns"""
+        layers = max(mask.bit_length() for mask in rows) // self.layer_bits + 2
+        for column in columns:
+            rows, layers = self._layered_tick(rows, self._allowed(column, heights, index), layers)
+        return self._drop_empty_layers(rows)
+
+    def _bounded(self, key, rows, simulate):
+        """simulate(rows), a transição de um trecho, sem simular quando der.
+
+        A transição é monótona (mais estados no começo, mais no fim) e todo
+        conjunto está contido em _alive. Se rows contém um "núcleo" C com
+        simulate(C) == simulate(_alive), o resultado fica espremido entre os
+        dois e é esse mesmo. Os núcleos saem dos próprios conjuntos
+        consultados e da interseção entre eles; na prática um só cobre todos
+        os conjuntos que aparecem depois dos primeiros canos.
+        """
+        bound = self._bounds.get(key)
+        if bound is None:
+            bound = self._bounds[key] = (simulate(self._alive), [])
+        top, cores = bound
+        for core in cores:
+            if not any(core_mask & ~mask for core_mask, mask in zip(core, rows)):
+                return top
+        result = simulate(rows)
+        if result == top:
+            candidate = tuple(a & b for a, b in zip(cores[0], rows)) if cores else None
+            if candidate is not None and simulate(candidate) == top:
+                cores[0] = candidate
+            elif len(cores) < MAX_CORES:
+                cores.append(rows)
+        return result
+
+    def _run(self, set_id, run, heights, index):
+        """Conjunto depois dos ticks do trecho run do cano index, a partir de
+        set_id"""
+        key = self._key(run, heights, index)
+        result = self._memo.get((set_id, key))
+        if result is None:
+            def simulate(rows):
+                return self._intern(self._simulate(rows, run[1], heights, index))
+
+            result = self._memo[(set_id, key)] = self._bounded(key, self._set_list[set_id], simulate)
+        return result
+
+    def _advance(self, set_id, heights, index):
+        """Conjunto ao fim do segmento do cano index, a partir de set_id"""
+        for run in self._segment_runs[index]:
+            set_id = self._run(set_id, run, heights, index)
+        return set_id
+
+    # --- Consultas --------------------------------------------------------
+
+    def passable(self, heights):
+        """Quantos canos da sequência dá para passar; len(heights) quando ela
+        é vencível. Um cano conta quando sai da coluna do pássaro."""
+        self._extend_schedule(len(heights))
+        set_id = self.start
+        for index in range(len(heights)):
+            set_id = self._advance(set_id, heights, index)
+            if set_id == self.empty:
+                return index
+        return len(heights)
+
+    def beatable(self, heights):
+        return self.passable(heights) == len(heights)
+
+    def min_flaps(self, heights):
+        """Mínimo de pulos para passar todos os canos (None se impossível)"""
+        path = self._min_flap_layers(heights)
+        return None if path is None else sum(dropped for _, dropped, _ in path)
+
+    def _min_flap_layers(self, heights):
+        """(linhas, camadas vazias tiradas, layers) no começo de cada segmento
+        e no fim; None se impossível.
+
+        Ao contrário dos conjuntos sem custo, os conjuntos em camadas quase
+        não se repetem entre sequências (o custo relativo de cada estado
+        carrega a história toda), então aqui não há memória: cada segmento é
+        simulado, e a consulta em memória só descarta antes as sequências
+        impossíveis.
+        """
+        if not self.beatable(heights):
+            return None
+        path = [(self._set_list[self.start], 0, 2)]
+        for index in range(len(heights)):
+            path.append(self._simulate_layered(path[-1][0], self._segments[index], heights, index))
+        return path
+
+    def min_flap_path(self, heights):
+        """Ações de cada tick (FLAP ou 0, como Replay.actions) de um caminho
+        com o mínimo de pulos que passa todos os canos; None se impossível"""
+        path = self._min_flap_layers(heights)
+        if path is None:
+            return None
+
+        # Do fim para o começo: um estado da camada 0 no fim e, a cada tick,
+        # um estado anterior que chega nele sem aumentar o custo. Só as
+        # camadas do começo de cada segmento ficam guardadas; as dos ticks
+        # são recalculadas segmento a segmento.
+        layer_mask = (1 << self.layer_bits) - 1
+        row, mask = next((row, mask & layer_mask) for row, mask in enumerate(path[-1][0]) if mask & layer_mask)
+        cell = (mask & -mask).bit_length() - 1
+        layer = 0
+        actions = bytearray()
+        for index in reversed(range(len(heights))):
+            rows, _, layers = path[index]
+            ticks = [rows]
+            for column in self._segments[index]:
+                rows, layers = self._layered_tick(rows, self._allowed(column, heights, index), layers)
+                ticks.append(rows)
+            layer += path[index + 1][1]
+            for rows in reversed(ticks[:-1]):
+                row, cell, layer, action = self._previous(rows, row, cell, layer)
+                actions.append(action)
+        actions.reverse()
+        return actions
+
+    def _previous(self, rows, row, cell, layer):
+        """Estado (row, cell, layer) do tick anterior que leva a (row, cell)
+        com o custo de layer, e a ação tomada"""
+        cell -= self.shifts[row]
+        if cell >= 0:
+            bit = layer * self.layer_bits + cell
+            for previous in self.previous_rows[row]:
+                if rows[previous] >> bit & 1:
+                    return previous, cell, layer, 0
+            bit -= self.layer_bits
+            if row == self.flap_row and bit >= 0:
+                for previous, mask in enumerate(rows):
+                    if mask >> bit & 1:
+                        return previous, cell, layer - 1, FLAP
+        raise AssertionError("estado sem antecessor no caminho")
+
+    def stats(self):
+        """Tamanho das tabelas memorizadas"""
+        return {"conjuntos": len(self._set_list), "transições": len(self._memo)}
+
+
+def play(seed, actions):
+    """Joga a partida da semente com as ações dadas (uma por tick); retorna
+    (score, tick do game over ou None)"""
+    rng = random.Random(seed)
+    bird = fb.Bird()
+    pipes = fb.new_pipes(rng)
+    score = 0
+    for tick, action in enumerate(actions, 1):
+        if action & FLAP:
+            bird.jump()
+        score, game_over = fb.update_game(bird, pipes, score, rng)
+        if game_over:
+            return score, tick
+    return score, None
+
+
+def verify(solver, seeds, count):
+    """Joga em update_game o caminho de mínimo de pulos de cada semente;
+    retorna quantas falharam (morreu, pontuou menos, gastou outro número de
+    pulos ou as consultas discordam)"""
+    failures = 0
+    for seed in seeds:
+        heights = pipe_heights(seed, count)
+        path = solver.min_flap_path(heights)
+        flaps = solver.min_flaps(heights)
+        if path is None:
+            failures += solver.beatable(heights) or flaps is not None
+            continue
+        score, game_over = play(seed, path)
+        if (game_over is not None or score != count or not solver.beatable(heights)
+                or sum(action & FLAP for action in path) != flaps):
+            failures += 1
+    return failures
+
+
+def benchmark(query, sequences):
+    """(sequências por segundo, resultados)"""
+    start = time.perf_counter()
+    results = [query(heights) for heights in sequences]
+    return len(sequences) / (time.perf_counter() - start), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solver de alcançabilidade do Flappy Bird")
+    parser.add_argument("--seeds", type=int, default=2000, help="sequências por rodada")
+    parser.add_argument("--rounds", type=int, default=3, help="rodadas, cada uma com sementes novas")
+    parser.add_argument("--pipes", type=int, default=20, help="canos por sequência")
+    parser.add_argument("--paths", type=int, default=100, help="sequências com mínimo de pulos")
+    parser.add_argument("--verify", type=int, default=50, help="caminhos jogados em update_game")
+    parser.add_argument("--gap", type=int)
+    parser.add_argument("--gravity", type=float)
+    parser.add_argument("--jump", type=float)
+    parser.add_argument("--speed", type=int)
+    args = parser.parse_args()
+
+    # O Solver usa as configurações do momento em que é criado, e play() as
+    # do momento em que roda
+    with fb.game_settings(speed=args.speed, gap=args.gap, gravity=args.gravity, jump=args.jump):
+        start = time.perf_counter()
+        solver = Solver()
+        print(f"Tabelas: {len(solver.velocities)} velocidades, passo de {float(solver.y_step)} px, "
+              f"{time.perf_counter() - start:.2f}s{'' if solver.exact else ' (grade aproximada)'}")
+
+        # A primeira rodada começa com a memória vazia; as seguintes usam
+        # sementes novas, mas aproveitam as transições já calculadas
+        for round_index in range(args.rounds):
+            seeds = range(round_index * args.seeds, (round_index + 1) * args.seeds)
+            rate, passed = benchmark(solver.passable, [pipe_heights(seed, args.pipes) for seed in seeds])
+            beatable = sum(count == args.pipes for count in passed)
+            print(f"Rodada {round_index + 1}: {rate:,.0f} seq/s; {beatable}/{args.seeds} vencíveis "
+                  f"({args.pipes} canos), {sum(passed) / args.seeds:.1f} canos passáveis em média")
+        print(", ".join(f"{name}: {value}" for name, value in solver.stats().items()))
+
+        if args.paths:
+            rate, flaps = benchmark(solver.min_flaps, [pipe_heights(seed, args.pipes) for seed in range(args.paths)])
+            flaps = [count for count in flaps if count is not None]
+            print(f"Mínimo de pulos: {rate:,.1f} seq/s, {sum(flaps) / max(len(flaps), 1):.1f} pulos em média "
+                  f"nas {len(flaps)} vencíveis")
+
+        if args.verify:
+            failures = verify(solver, range(args.verify), args.pipes)
+            print(f"Verificação: {args.verify - failures}/{args.verify} caminhos confirmados em update_game")
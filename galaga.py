@@ -1,17 +1,27 @@
-import pygame
 import random
-import math
-import json
 import os
+import sys
+import time
+import argparse
+
+from assets import get_font, init_display  # Antes do pygame (ver assets)
+import pygame
 
-# Inicialização do Pygame
-pygame.init()
+from background import Starfield
+from high_scores import open_store
+from io_worker import get_worker
+from pacing import QUALITY_FULL, QUALITY_MINIMAL, QUALITY_REDUCED, FramePacer
+from pools import SpritePool
+from profiler import profiler
+from renderer import RENDER_MODE, RENDER_MODES, Renderer
+from replay import GALAGA, GAME_NAMES, Replay, save_to_replay_dir
+from spatial_hash import SpatialGroup, groupcollide, spritecollide
+from text_cache import render_text, text_cache
+from trajectories import Trajectory, hold, loop, spline, wave
 
-# Configurações da tela
+# Configurações da tela (a janela só é aberta em main)
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Galaga Clone")
 
 # Cores
 BLACK = (0, 0, 0)
@@ -24,8 +34,10 @@ CYAN = (0, 255, 255)
 PURPLE = (255, 0, 255)
 
 # Configurações do jogo
-FPS = 60
-clock = pygame.time.Clock()
+FPS = 60  # Ticks de lógica por segundo
+RENDER_FPS = 120  # Limite de quadros desenhados no modo interativo
+# Camadas de estrelas omitidas em cada nível de qualidade (ver pacing)
+STAR_LAYERS_SKIPPED = {QUALITY_FULL: 0, QUALITY_REDUCED: 1, QUALITY_MINIMAL: 2}
 
 # Estados do jogo
 MENU = 0
@@ -34,6 +46,11 @@ GAME_OVER = 2
 HIGH_SCORES = 3
 ENTER_NAME = 4
 
+# Ações do jogador (bits combináveis) para GalagaGame.step
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_SHOOT = 4
+
 # Dificuldades
 DIFFICULTIES = {
     "Fácil": {"enemy_speed": 1, "bullet_frequency": 0.005, "enemy_health": 1},
@@ -41,201 +58,515 @@ DIFFICULTIES = {
     "Difícil": {"enemy_speed": 3, "bullet_frequency": 0.015, "enemy_health": 2}
 }
 
-# Arquivo de scores
-SCORES_FILE = "high_scores.json"
+# Inimigos: pontos por enemy_type e padrões de movimento
+ENEMY_POINTS = (10, 20, 50)
+MOVE_PATTERNS = ('straight', 'zigzag', 'dive', 'loop')
+PATTERN_LEVELS = {'loop': 3}  # Nível mínimo dos padrões que não saem desde o início
+ZIGZAG_PERIOD = 63  # Ticks de uma subida e descida completas
+ZIGZAG_AMPLITUDE = 2
+DIVE_DELAY = 100  # Ticks até um inimigo 'dive' começar a descer
+DIVE_SPEED = 3
+LOOP_DELAY = 120  # Ticks na formação entre duas voltas de um inimigo 'loop'
+LOOP_RADIUS = 50
+LOOP_SPEED = 3
+SWOOP_LEVEL = 2  # A partir deste nível as ondas entram voando até a formação
+SWOOP_SPEED = 5
+# Voo de entrada relativo à posição na formação (metade esquerda da onda; a
+# direita usa o espelho): vem de cima, passa por baixo da posição e sobe
+SWOOP_PATH = ((-360, -260), (-200, -40), (-40, 60), (40, 20), (0, 0))
+EDGE_DROP = 20  # Descida ao bater na borda
+SHOOT_COOLDOWN = (60, 180)  # Intervalo sorteado entre tiros inimigos
+
+# Trajetórias pré-calculadas (ver trajectories.py): por tick, o inimigo só
+# soma uma linha da tabela, sem senos nem comparações de padrão
+PATTERN_TRAJECTORIES = {
+    'straight': hold(),
+    'zigzag': wave(ZIGZAG_PERIOD, ZIGZAG_AMPLITUDE),
+    'dive': Trajectory([(0, 0, False)] * DIVE_DELAY + [(0, DIVE_SPEED, False)], DIVE_DELAY, leaves_screen=True),
+    'loop': Trajectory(hold(LOOP_DELAY).steps() + loop(LOOP_RADIUS, LOOP_SPEED).steps()),
+}
+_swoop = spline(SWOOP_PATH, SWOOP_SPEED)
+ENTRY_TRAJECTORIES = {'swoop_left': _swoop, 'swoop_right': _swoop.mirrored()}
+# (entrada, padrão) -> trajetória; entrada None começa direto na formação
+TRAJECTORIES = {(None, pattern): trajectory for pattern, trajectory in PATTERN_TRAJECTORIES.items()}
+TRAJECTORIES.update({(entry, pattern): path.then(trajectory)
+                     for entry, path in ENTRY_TRAJECTORIES.items()
+                     for pattern, trajectory in PATTERN_TRAJECTORIES.items()})
+
+# Velocidade dos tiros (px/tick)
+BULLET_SPEED = 10
+ENEMY_BULLET_SPEED = 5
+
+# Motores de entidades: "sprites" (um objeto por entidade) ou "arrays"
+# (NumPy, para ondas muito grandes; ver galaga_arrays.py)
+ENGINES = ("sprites", "arrays")
+ENGINE = os.environ.get("GALAGA_ENGINE", "sprites")
+
+# Colisões: "mask" confere os retângulos e depois, só nos pares que se tocam,
+# os pixels desenhados (máscaras do atlas); "rect" só os retângulos
+COLLISION_MODES = ("mask", "rect")
+COLLISION_MODE = os.environ.get("GALAGA_COLLISION", "mask")
+
+# Teclas de escolha de dificuldade (menu e tela de high scores)
+DIFFICULTY_KEYS = {pygame.K_1: "Fácil", pygame.K_2: "Médio", pygame.K_3: "Difícil"}
+DEFAULT_DIFFICULTY = "Médio"
+
+# Arquivo de scores (.db/.sqlite para usar SQLite; tcp://host:porta ou
+# unix:/caminho para o servidor de placar, ver leaderboard.py)
+SCORES_FILE = os.environ.get("SCORES_FILE", "high_scores.json")
+
+# Duração da explosão em ticks
+EXPLOSION_LIFETIME = 20
+
+# Sprites livres guardados por pool (tiros e explosões)
+POOL_CAPACITY = 128
+
+def silhouette_mask(image, background=BLACK):
+    """Máscara de colisão com os pixels de image diferentes do fundo"""
+    shape = image.copy()
+    shape.set_colorkey(background)
+    return pygame.mask.from_surface(shape)
+
+class SpriteAtlas:
+    """Imagens de todos os sprites, desenhadas uma única vez e compartilhadas
+    por referência entre as instâncias, com as máscaras de colisão de cada
+    forma (nave, tipo de inimigo, tipo de tiro).
+    """
+    def __init__(self):
+        # Nave do jogador
+        self.player = pygame.Surface((40, 30))
+        pygame.draw.polygon(self.player, GREEN, [(20, 0), (0, 30), (40, 30)])
+        pygame.draw.polygon(self.player, CYAN, [(20, 5), (5, 25), (35, 25)])
+        
+        # Inimigos, indexados por enemy_type
+        self.enemies = []
+        for enemy_type in range(3):
+            image = pygame.Surface((30, 30))
+            if enemy_type == 0:  # Inimigo básico
+                pygame.draw.circle(image, RED, (15, 15), 12)
+                pygame.draw.circle(image, YELLOW, (15, 15), 8)
+            elif enemy_type == 1:  # Inimigo médio
+                pygame.draw.polygon(image, PURPLE, [(15, 0), (0, 30), (30, 30)])
+                pygame.draw.polygon(image, BLUE, [(15, 5), (5, 25), (25, 25)])
+            else:  # Inimigo chefe
+                pygame.draw.rect(image, RED, (0, 0, 30, 30))
+                pygame.draw.rect(image, YELLOW, (5, 5, 20, 20))
+                pygame.draw.circle(image, RED, (15, 15), 5)
+            self.enemies.append(image)
+        
+        # Tiros
+        self.bullet = pygame.Surface((4, 10))
+        self.bullet.fill(CYAN)
+        self.enemy_bullet = pygame.Surface((4, 10))
+        self.enemy_bullet.fill(RED)
+        
+        # Quadros da explosão, indexados pelos ticks já decorridos; crescem,
+        # avermelham e ficam transparentes até sumir
+        self.explosion = []
+        for age in range(EXPLOSION_LIFETIME + 1):
+            size = 30 + age * 2
+            alpha = int(255 * (EXPLOSION_LIFETIME - age) / EXPLOSION_LIFETIME)
+            image = pygame.Surface((size, size), pygame.SRCALPHA)
+            image.fill((255, 255 - age * 10, 0, alpha))
+            self.explosion.append(image)
+        
+        # Máscaras de colisão: só o desenho, sem o fundo preto dos cantos.
+        # convert() não muda os pixels, então elas valem depois dele também
+        self.player_mask = silhouette_mask(self.player)
+        self.enemy_masks = [silhouette_mask(image) for image in self.enemies]
+        self.bullet_mask = silhouette_mask(self.bullet)
+        self.enemy_bullet_mask = silhouette_mask(self.enemy_bullet)
+            
+    def convert(self):
+        """Converte tudo para o formato da tela (requer display.set_mode)"""
+        self.player = self.player.convert()
+        self.enemies = [image.convert() for image in self.enemies]
+        self.bullet = self.bullet.convert()
+        self.enemy_bullet = self.enemy_bullet.convert()
+        self.explosion = [image.convert_alpha() for image in self.explosion]
+
+_atlas = None
+
+def get_atlas():
+    """Retorna o atlas de sprites, criando-o no primeiro uso"""
+    global _atlas
+    if _atlas is None:
+        _atlas = SpriteAtlas()
+    return _atlas
 
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        self.image = pygame.Surface((40, 30))
-        self.image.fill(GREEN)
-        # Desenhando a nave do jogador
-        pygame.draw.polygon(self.image, GREEN, [(20, 0), (0, 30), (40, 30)])
-        pygame.draw.polygon(self.image, CYAN, [(20, 5), (5, 25), (35, 25)])
+        self.image = get_atlas().player
+        self.mask = get_atlas().player_mask
         self.rect = self.image.get_rect()
         self.rect.centerx = SCREEN_WIDTH // 2
         self.rect.bottom = SCREEN_HEIGHT - 20
         self.speed = 5
         self.shoot_cooldown = 0
         
-    def update(self):
+    def update(self, game):
         # Movimento
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and self.rect.left > 0:
+        if game.actions & ACTION_LEFT and self.rect.left > 0:
             self.rect.x -= self.speed
-        if keys[pygame.K_RIGHT] and self.rect.right < SCREEN_WIDTH:
+        if game.actions & ACTION_RIGHT and self.rect.right < SCREEN_WIDTH:
             self.rect.x += self.speed
             
         # Recarregando tiro
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
             
-    def shoot(self):
+    def shoot(self, game):
         if self.shoot_cooldown == 0:
-            bullet = Bullet(self.rect.centerx, self.rect.top)
-            all_sprites.add(bullet)
-            bullets.add(bullet)
+            game.add_bullet(self.rect.centerx, self.rect.top)
             self.shoot_cooldown = 10
 
+def level_patterns(level):
+    """Padrões de movimento sorteados nas ondas do nível"""
+    return tuple(pattern for pattern in MOVE_PATTERNS if PATTERN_LEVELS.get(pattern, 1) <= level)
+
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, enemy_type=0, difficulty="Médio"):
+    def __init__(self, x, y, enemy_type=0, difficulty="Médio", rng=random, patterns=MOVE_PATTERNS, entry=None):
         super().__init__()
         self.enemy_type = enemy_type
         self.difficulty = difficulty
-        self.image = pygame.Surface((30, 30))
-        
-        # Desenhando diferentes tipos de inimigos
-        if enemy_type == 0:  # Inimigo básico
-            pygame.draw.circle(self.image, RED, (15, 15), 12)
-            pygame.draw.circle(self.image, YELLOW, (15, 15), 8)
-            self.points = 10
-        elif enemy_type == 1:  # Inimigo médio
-            pygame.draw.polygon(self.image, PURPLE, [(15, 0), (0, 30), (30, 30)])
-            pygame.draw.polygon(self.image, BLUE, [(15, 5), (5, 25), (25, 25)])
-            self.points = 20
-        else:  # Inimigo chefe
-            pygame.draw.rect(self.image, RED, (0, 0, 30, 30))
-            pygame.draw.rect(self.image, YELLOW, (5, 5, 20, 20))
-            pygame.draw.circle(self.image, RED, (15, 15), 5)
-            self.points = 50
+        
+        # Diferentes tipos de inimigos: básico, médio e chefe
+        self.image = get_atlas().enemies[enemy_type]
+        self.mask = get_atlas().enemy_masks[enemy_type]
+        self.points = ENEMY_POINTS[enemy_type]
             
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
         self.speed_x = DIFFICULTIES[difficulty]["enemy_speed"]
         self.speed_y = 0
-        self.shoot_cooldown = random.randint(60, 180)
-        self.move_pattern = random.choice(['straight', 'zigzag', 'dive'])
+        self.shoot_cooldown = rng.randint(*SHOOT_COOLDOWN)
+        self.move_pattern = rng.choice(patterns)
+        # Tick atual da trajetória; com entrada, o inimigo nasce longe e só
+        # chega a (x, y) no fim do voo
+        self.trajectory = TRAJECTORIES[entry, self.move_pattern]
+        self.step = 0
+        offset_x, offset_y = self.trajectory.entry_offset
+        self.rect = self.image.get_rect()
+        self.rect.x = x - offset_x
+        self.rect.y = y - offset_y
         self.original_x = x
-        self.time = 0
         self.health = DIFFICULTIES[difficulty]["enemy_health"]
         
-    def update(self):
-        self.time += 1
-        
-        # Padrões de movimento
-        if self.move_pattern == 'straight':
-            self.rect.x += self.speed_x
-        elif self.move_pattern == 'zigzag':
-            self.rect.x += self.speed_x
-            self.rect.y += math.sin(self.time * 0.1) * 2
-        elif self.move_pattern == 'dive' and self.time > 100:
-            self.rect.y += 3
-            if self.rect.y > SCREEN_HEIGHT:
-                self.kill()
+    def update(self, game):
+        # Padrões de movimento: a linha do tick atual da trajetória
+        trajectory, step = self.trajectory, self.step
+        self.step = trajectory.next[step]
+        sweep = trajectory.sweep[step]
+        dx = trajectory.dx[step]
+        if sweep:
+            dx += self.speed_x
+        self.rect.move_ip(dx, trajectory.dy[step])
+        if trajectory.leaves_screen and self.rect.y > SCREEN_HEIGHT:
+            self.kill()
                 
-        # Mudar direção nas bordas
-        if self.rect.right >= SCREEN_WIDTH or self.rect.left <= 0:
+        # Mudar direção nas bordas (só quem está acompanhando a formação)
+        if sweep and (self.rect.right >= SCREEN_WIDTH or self.rect.left <= 0):
             self.speed_x *= -1
-            self.rect.y += 20
+            self.rect.y += EDGE_DROP
             
         # Atirar
         self.shoot_cooldown -= 1
-        if self.shoot_cooldown <= 0 and random.random() < DIFFICULTIES[self.difficulty]["bullet_frequency"]:
-            self.shoot()
-            self.shoot_cooldown = random.randint(60, 180)
+        if self.shoot_cooldown <= 0 and game.rng.random() < DIFFICULTIES[self.difficulty]["bullet_frequency"]:
+            self.shoot(game)
+            self.shoot_cooldown = game.rng.randint(*SHOOT_COOLDOWN)
             
-    def shoot(self):
-        bullet = EnemyBullet(self.rect.centerx, self.rect.bottom)
-        all_sprites.add(bullet)
-        enemy_bullets.add(bullet)
+    def shoot(self, game):
+        game.add_enemy_bullet(self.rect.centerx, self.rect.bottom)
 
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((4, 10))
-        self.image.fill(CYAN)
+        self.image = get_atlas().bullet
+        self.mask = get_atlas().bullet_mask
         self.rect = self.image.get_rect()
+        self.speed = -BULLET_SPEED
+        self.reset(x, y)
+        
+    def reset(self, x, y):
+        """Posiciona o tiro; usado também ao reaproveitar do pool"""
         self.rect.centerx = x
         self.rect.bottom = y
-        self.speed = -10
+        self.prev_pos = self.rect.topleft
         
-    def update(self):
+    def update(self, game):
         self.rect.y += self.speed
         if self.rect.bottom < 0:
             self.kill()
+            game.bullet_pool.release(self)
 
 class EnemyBullet(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((4, 10))
-        self.image.fill(RED)
+        self.image = get_atlas().enemy_bullet
+        self.mask = get_atlas().enemy_bullet_mask
         self.rect = self.image.get_rect()
+        self.speed = ENEMY_BULLET_SPEED
+        self.reset(x, y)
+        
+    def reset(self, x, y):
+        """Posiciona o tiro; usado também ao reaproveitar do pool"""
         self.rect.centerx = x
         self.rect.top = y
-        self.speed = 5
+        self.prev_pos = self.rect.topleft
         
-    def update(self):
+    def update(self, game):
         self.rect.y += self.speed
         if self.rect.top > SCREEN_HEIGHT:
             self.kill()
+            game.enemy_bullet_pool.release(self)
 
 class Explosion(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.size = 30
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill(YELLOW)
-        self.rect = self.image.get_rect()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y)
+        
+    def reset(self, x, y):
+        """Reinicia a animação; usado também ao reaproveitar do pool"""
+        self.image = get_atlas().explosion[0]
+        self.rect.size = self.image.get_size()
         self.rect.center = (x, y)
-        self.lifetime = 20
+        self.prev_pos = self.rect.topleft
+        self.lifetime = EXPLOSION_LIFETIME
         
-    def update(self):
+    def update(self, game):
         self.lifetime -= 1
-        self.size += 2
-        self.image = pygame.Surface((self.size, self.size))
-        alpha = int(255 * (self.lifetime / 20))
-        color = (255, 255 - (20 - self.lifetime) * 10, 0)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        self.image = get_atlas().explosion[EXPLOSION_LIFETIME - self.lifetime]
+        center = self.rect.center
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
         
         if self.lifetime <= 0:
             self.kill()
+            game.explosion_pool.release(self)
 
-# Grupos de sprites
-all_sprites = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-bullets = pygame.sprite.Group()
-enemy_bullets = pygame.sprite.Group()
-explosions = pygame.sprite.Group()
-
-# Funções para gerenciar scores
-def load_high_scores():
-    try:
-        with open(SCORES_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_high_scores(scores):
-    with open(SCORES_FILE, 'w') as f:
-        json.dump(scores, f, indent=2)
-
-def add_high_score(name, score):
-    scores = load_high_scores()
-    scores.append({"name": name, "score": score})
-    scores.sort(key=lambda x: x["score"], reverse=True)
-    scores = scores[:10]  # Manter apenas top 10
-    save_high_scores(scores)
-    return scores
-
-def is_high_score(score):
-    scores = load_high_scores()
-    return len(scores) < 10 or score > min(s["score"] for s in scores) if scores else True
+class GalagaGame:
+    """Estado e lógica de uma partida, sem tela e sem controle de tempo.
+    
+    Cada chamada de step() avança exatamente um tick de lógica (1/FPS s).
+    Todo sorteio usa self.rng, criado a partir de self.seed: a mesma semente
+    com as mesmas ações reproduz a partida inteira. collision é um dos
+    COLLISION_MODES.
+    """
+    def __init__(self, difficulty=DEFAULT_DIFFICULTY, seed=None, collision=COLLISION_MODE):
+        if collision not in COLLISION_MODES:
+            raise ValueError(f"Modo de colisão inválido: {collision!r}")
+        self.difficulty = difficulty
+        self.collision = collision
+        # Narrowphase das colisões (None: os retângulos bastam)
+        self.collided = pygame.sprite.collide_mask if collision == "mask" else None
+        # Grupos de sprites
+        self.all_sprites = pygame.sprite.Group()
+        self.explosions = pygame.sprite.Group()
+        # Tiros e explosões que saem de jogo voltam para pools
+        self.explosion_pool = SpritePool(Explosion, POOL_CAPACITY)
+        self.bullet_pool = SpritePool(Bullet, POOL_CAPACITY)
+        self.enemy_bullet_pool = SpritePool(EnemyBullet, POOL_CAPACITY)
+        self.create_entity_groups()
+        self.reset(seed)
+        
+    def create_entity_groups(self):
+        # Inimigos e tiros inimigos ficam indexados numa grade para colisão
+        self.enemies = SpatialGroup()
+        self.bullets = pygame.sprite.Group()
+        self.enemy_bullets = SpatialGroup()
+        
+    def reset(self, seed=None):
+        """Recomeça a partida; sem semente, sorteia uma nova"""
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.score = 0
+        self.lives = 3
+        self.level = 1
+        self.ticks = 0
+        self.actions = 0
+        self.game_over = False
+        for explosion in self.explosions:
+            self.explosion_pool.release(explosion)
+        self.release_bullets()
+        self.all_sprites.empty()
+        self.enemies.empty()
+        self.bullets.empty()
+        self.enemy_bullets.empty()
+        self.explosions.empty()
+        self.player = Player()
+        self.all_sprites.add(self.player)
+        self.create_enemy_wave()
+        
+    def create_enemy_wave(self):
+        self.enemies.empty()
+        rows = 3 + self.level // 2
+        cols = 8
+        patterns = level_patterns(self.level)
+        for row in range(rows):
+            for col in range(cols):
+                x = 100 + col * 70
+                y = 50 + row * 50
+                enemy_type = self.rng.choices([0, 1, 2], weights=[60, 30, 10])[0]
+                if self.level > 3 and self.rng.random() < 0.1:
+                    enemy_type = 2  # Mais chefes em níveis altos
+                # A partir de SWOOP_LEVEL, cada metade da onda entra voando por um lado
+                entry = None
+                if self.level >= SWOOP_LEVEL:
+                    entry = 'swoop_left' if col < cols // 2 else 'swoop_right'
+                self.add_enemy(x, y, enemy_type, patterns, entry)
+                
+    def add_enemy(self, x, y, enemy_type, patterns=MOVE_PATTERNS, entry=None):
+        enemy = Enemy(x, y, enemy_type, self.difficulty, self.rng, patterns, entry)
+        self.all_sprites.add(enemy)
+        self.enemies.add(enemy)
+        
+    def add_bullet(self, x, y):
+        bullet = self.bullet_pool.acquire(x, y)
+        self.all_sprites.add(bullet)
+        self.bullets.add(bullet)
+        
+    def add_enemy_bullet(self, x, y):
+        bullet = self.enemy_bullet_pool.acquire(x, y)
+        self.all_sprites.add(bullet)
+        self.enemy_bullets.add(bullet)
+        
+    def release_bullets(self):
+        """Devolve aos pools os tiros ainda em jogo"""
+        for bullet in self.bullets:
+            self.bullet_pool.release(bullet)
+        for bullet in self.enemy_bullets:
+            self.enemy_bullet_pool.release(bullet)
+        
+    def add_explosion(self, x, y):
+        explosion = self.explosion_pool.acquire(x, y)
+        self.all_sprites.add(explosion)
+        self.explosions.add(explosion)
+        
+    def player_hit(self):
+        self.lives -= 1
+        self.add_explosion(self.player.rect.centerx, self.player.rect.centery)
+        if self.lives <= 0:
+            self.game_over = True
+            
+    def step(self, actions=0):
+        """Avança um tick com as ações (bits ACTION_*) do jogador"""
+        if self.game_over:
+            return
+        self.ticks += 1
+        self.actions = actions
+        
+        # Posições do tick anterior, usadas na interpolação do desenho
+        for sprite in self.all_sprites:
+            sprite.prev_pos = sprite.rect.topleft
+            
+        if actions & ACTION_SHOOT:
+            self.player.shoot(self)
+            
+        # Atualizando
+        self.all_sprites.update(self)
+        profiler.mark("update")
+        self.enemies.refresh()
+        self.enemy_bullets.refresh()
+        profiler.mark("spatial_index")
+        self.collide()
+        
+        # Verificando se todos os inimigos foram derrotados
+        if len(self.enemies) == 0:
+            self.level += 1
+            self.create_enemy_wave()
+            
+    def collide(self):
+        """Colisões do tick: retângulos pela grade e, no modo "mask", os
+        pixels só dos pares cujos retângulos se tocam"""
+        collided = self.collided
+        
+        # Verificando colisões - tiros do jogador com inimigos
+        hits = groupcollide(self.bullets, self.enemies, True, False, collided)
+        for bullet, enemy_list in hits.items():
+            self.bullet_pool.release(bullet)
+            for enemy in enemy_list:
+                enemy.health -= 1
+                if enemy.health <= 0:
+                    self.score += enemy.points
+                    self.add_explosion(enemy.rect.centerx, enemy.rect.centery)
+                    enemy.kill()
+        profiler.mark("collide_bullets")
+        
+        # Verificando colisões - tiros dos inimigos com o jogador
+        hits = spritecollide(self.player, self.enemy_bullets, True, collided)
+        if hits:
+            for bullet in hits:
+                self.enemy_bullet_pool.release(bullet)
+            self.player_hit()
+        profiler.mark("collide_enemy_bullets")
+        
+        # Verificando colisões - inimigos com o jogador
+        if spritecollide(self.player, self.enemies, True, collided):
+            self.player_hit()
+        profiler.mark("collide_enemies")
+            
+    def nearest_enemy_x(self, x):
+        """centerx do inimigo mais próximo de x na horizontal (None sem inimigos)"""
+        if not self.enemies:
+            return None
+        return min(self.enemies, key=lambda e: abs(e.rect.centerx - x)).rect.centerx
+            
+    def draw(self, surface, alpha=1.0, explosions=True):
+        """Desenha os sprites interpolando entre o tick anterior e o atual
+        (sem as explosões, se explosions for falso); retorna os retângulos
+        alterados"""
+        hidden = () if explosions else self.explosions
+        blits = []
+        for sprite in self.all_sprites:
+            if sprite in hidden:
+                continue
+            x, y = sprite.rect.topleft
+            prev_x, prev_y = getattr(sprite, "prev_pos", (x, y))
+            blits.append((sprite.image, (prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha)))
+        return surface.blits(blits)
+
+def get_engine(name=ENGINE):
+    """Classe de partida do motor de entidades escolhido"""
+    if name == "arrays":
+        # NumPy só é necessário para este motor
+        from galaga_arrays import ArrayGalagaGame
+        return ArrayGalagaGame
+    if name != "sprites":
+        raise ValueError(f"Motor de entidades inválido: {name!r}")
+    return GalagaGame
+
+# Funções para gerenciar scores; a leitura do arquivo e as gravações
+# acontecem em segundo plano, no worker de E/S
+_score_store = None
+
+def get_score_store():
+    global _score_store
+    if _score_store is None:
+        _score_store = open_store(SCORES_FILE, DEFAULT_DIFFICULTY, game=GAME_NAMES[GALAGA])
+    return _score_store
+
+def load_high_scores(difficulty=DEFAULT_DIFFICULTY):
+    return get_score_store().top(difficulty)
+
+def add_high_score(name, score, difficulty=DEFAULT_DIFFICULTY):
+    return get_score_store().add(name, score, difficulty)
+
+def is_high_score(score, difficulty=DEFAULT_DIFFICULTY):
+    return get_score_store().is_high_score(score, difficulty)
 
 # Funções de desenho dos menus
 def draw_menu(screen, font, small_font, selected_difficulty):
     screen.fill(BLACK)
     
     # Título
-    title = font.render("GALAGA CLONE", True, YELLOW)
+    title = render_text(font, "GALAGA CLONE", YELLOW)
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
     
     # Opções de dificuldade
     y_start = 250
     for i, difficulty in enumerate(DIFFICULTIES.keys()):
         color = GREEN if difficulty == selected_difficulty else WHITE
-        text = small_font.render(f"{i+1}. {difficulty}", True, color)
+        text = render_text(small_font, f"{i+1}. {difficulty}", color)
         screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y_start + i * 40))
     
     # Instruções
@@ -251,20 +582,21 @@ def draw_menu(screen, font, small_font, selected_difficulty):
     
     y = 400
     for instruction in instructions:
-        text = small_font.render(instruction, True, WHITE)
+        text = render_text(small_font, instruction, WHITE)
         screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
         y += 25
 
-def draw_high_scores(screen, font, small_font):
+def draw_high_scores(screen, font, small_font, difficulty):
     screen.fill(BLACK)
     
-    title = font.render("TOP 10 SCORES", True, YELLOW)
+    title = render_text(font, f"TOP 10 SCORES - {difficulty}", YELLOW)
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
     
-    scores = load_high_scores()
+    scores = load_high_scores(difficulty)
     
     if not scores:
-        no_scores = small_font.render("Nenhum score ainda!", True, WHITE)
+        message = "Nenhum score ainda!" if get_score_store().loaded else "Carregando placar..."
+        no_scores = render_text(small_font, message, WHITE)
         screen.blit(no_scores, (SCREEN_WIDTH // 2 - no_scores.get_width() // 2, 200))
     else:
         y_start = 150
@@ -272,220 +604,284 @@ def draw_high_scores(screen, font, small_font):
             position = f"{i+1:2d}."
             name = score_data["name"]
             score = score_data["score"]
-            text = small_font.render(f"{position} {name:<15} {score:>8}", True, WHITE)
+            text = render_text(small_font, f"{position} {name:<15} {score:>8}", WHITE)
             screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y_start + i * 30))
     
-    back_text = small_font.render("Pressione ESC para voltar", True, GREEN)
+    back_text = render_text(small_font, "1, 2, 3: trocar dificuldade - ESC para voltar", GREEN)
     screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, 500))
 
 def draw_enter_name(screen, font, small_font, player_name, score):
     screen.fill(BLACK)
     
-    title = font.render("NOVO HIGH SCORE!", True, YELLOW)
+    title = render_text(font, "NOVO HIGH SCORE!", YELLOW)
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 150))
     
-    score_text = font.render(f"Sua pontuação: {score}", True, WHITE)
+    score_text = render_text(font, f"Sua pontuação: {score}", WHITE)
     screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 200))
     
-    name_prompt = small_font.render("Digite seu nome:", True, WHITE)
+    name_prompt = render_text(small_font, "Digite seu nome:", WHITE)
     screen.blit(name_prompt, (SCREEN_WIDTH // 2 - name_prompt.get_width() // 2, 280))
     
     # Caixa de texto
     pygame.draw.rect(screen, WHITE, (SCREEN_WIDTH // 2 - 150, 320, 300, 40), 2)
-    name_text = font.render(player_name, True, WHITE)
+    name_text = render_text(font, player_name, WHITE)
     screen.blit(name_text, (SCREEN_WIDTH // 2 - 145, 325))
     
-    instruction = small_font.render("Pressione ENTER para confirmar", True, GREEN)
+    instruction = render_text(small_font, "Pressione ENTER para confirmar", GREEN)
     screen.blit(instruction, (SCREEN_WIDTH // 2 - instruction.get_width() // 2, 400))
 
-# Criando jogador
-player = Player()
-all_sprites.add(player)
-
-# Variáveis do jogo
-score = 0
-lives = 3
-level = 1
-game_state = MENU
-selected_difficulty = "Médio"
-player_name = ""
-font = pygame.font.Font(None, 36)
-small_font = pygame.font.Font(None, 24)
-
-def create_enemy_wave(level, difficulty):
-    enemies.empty()
-    rows = 3 + level // 2
-    cols = 8
-    for row in range(rows):
-        for col in range(cols):
-            x = 100 + col * 70
-            y = 50 + row * 50
-            enemy_type = random.choices([0, 1, 2], weights=[60, 30, 10])[0]
-            if level > 3 and random.random() < 0.1:
-                enemy_type = 2  # Mais chefes em níveis altos
-            enemy = Enemy(x, y, enemy_type, difficulty)
-            all_sprites.add(enemy)
-            enemies.add(enemy)
-
-def reset_game():
-    global score, lives, level, game_state
-    score = 0
-    lives = 3
-    level = 1
-    game_state = PLAYING
-    all_sprites.empty()
-    enemies.empty()
-    bullets.empty()
-    enemy_bullets.empty()
-    explosions.empty()
-    player = Player()
-    all_sprites.add(player)
-    create_enemy_wave(level, selected_difficulty)
-    return player
-
-# Loop principal do jogo
-running = True
-while running:
-    # Manter a taxa de quadros
-    clock.tick(FPS)
+
+def draw_playing(renderer, font, small_font, game, starfield, alpha=1.0, quality=QUALITY_FULL):
+    screen = renderer.screen
+    renderer.begin()
     
-    # Processando eventos
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if game_state == MENU:
-                if event.key == pygame.K_1:
-                    selected_difficulty = "Fácil"
-                elif event.key == pygame.K_2:
-                    selected_difficulty = "Médio"
-                elif event.key == pygame.K_3:
-                    selected_difficulty = "Difícil"
-                elif event.key == pygame.K_RETURN:
-                    player = reset_game()
-                elif event.key == pygame.K_h:
-                    game_state = HIGH_SCORES
-            
-            elif game_state == HIGH_SCORES:
-                if event.key == pygame.K_ESCAPE:
-                    game_state = MENU
-            
-            elif game_state == PLAYING:
-                if event.key == pygame.K_SPACE:
-                    player.shoot()
-            
-            elif game_state == GAME_OVER:
-                if event.key == pygame.K_r:
-                    game_state = MENU
-            
-            elif game_state == ENTER_NAME:
-                if event.key == pygame.K_RETURN:
-                    if player_name.strip():
-                        add_high_score(player_name.strip(), score)
-                        player_name = ""
-                        game_state = HIGH_SCORES
-                elif event.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                else:
-                    if len(player_name) < 15 and event.unicode.isprintable():
-                        player_name += event.unicode
+    # Desenhando estrelas de fundo (menos camadas com a qualidade reduzida)
+    renderer.add(starfield.draw(screen, alpha, STAR_LAYERS_SKIPPED[quality]))
+    profiler.mark("background")
     
-    # Lógica do jogo baseada no estado
-    if game_state == PLAYING:
-        # Atualizando
-        all_sprites.update()
-        
-        # Verificando colisões - tiros do jogador com inimigos
-        hits = pygame.sprite.groupcollide(bullets, enemies, True, False)
-        for bullet, enemy_list in hits.items():
-            for enemy in enemy_list:
-                enemy.health -= 1
-                if enemy.health <= 0:
-                    score += enemy.points
-                    explosion = Explosion(enemy.rect.centerx, enemy.rect.centery)
-                    all_sprites.add(explosion)
-                    explosions.add(explosion)
-                    enemy.kill()
-        
-        # Verificando colisões - tiros dos inimigos com o jogador
-        hits = pygame.sprite.spritecollide(player, enemy_bullets, True)
-        if hits:
-            lives -= 1
-            explosion = Explosion(player.rect.centerx, player.rect.centery)
-            all_sprites.add(explosion)
-            explosions.add(explosion)
-            if lives <= 0:
-                if is_high_score(score):
-                    game_state = ENTER_NAME
-                else:
-                    game_state = GAME_OVER
-        
-        # Verificando colisões - inimigos com o jogador
-        hits = pygame.sprite.spritecollide(player, enemies, True)
-        if hits:
-            lives -= 1
-            explosion = Explosion(player.rect.centerx, player.rect.centery)
-            all_sprites.add(explosion)
-            explosions.add(explosion)
-            if lives <= 0:
-                if is_high_score(score):
-                    game_state = ENTER_NAME
-                else:
-                    game_state = GAME_OVER
-        
-        # Verificando se todos os inimigos foram derrotados
-        if len(enemies) == 0:
-            level += 1
-            create_enemy_wave(level, selected_difficulty)
+    # Desenhando sprites
+    renderer.add(game.draw(screen, alpha, explosions=quality < QUALITY_MINIMAL))
+    profiler.mark("sprites")
+    
+    # Desenhando UI
+    score_text = render_text(font, f"Score: {game.score}", WHITE)
+    renderer.blit(score_text, (10, 10))
+    
+    lives_text = render_text(font, f"Lives: {game.lives}", WHITE)
+    renderer.blit(lives_text, (10, 50))
     
-    # Desenhando baseado no estado
-    if game_state == MENU:
-        draw_menu(screen, font, small_font, selected_difficulty)
+    level_text = render_text(font, f"Level: {game.level}", WHITE)
+    renderer.blit(level_text, (SCREEN_WIDTH - 150, 10))
     
-    elif game_state == HIGH_SCORES:
-        draw_high_scores(screen, font, small_font)
+    diff_text = render_text(small_font, f"Dificuldade: {game.difficulty}", WHITE)
+    renderer.blit(diff_text, (SCREEN_WIDTH - 200, 50))
+    profiler.mark("hud")
     
-    elif game_state == ENTER_NAME:
-        draw_enter_name(screen, font, small_font, player_name, score)
+    # Overlay de desempenho (F3)
+    profiler.draw_overlay(renderer, small_font)
+    profiler.mark("overlay")
+    
+    renderer.present()
+    profiler.mark("flip")
+
+def draw_game_over(screen, font, small_font, score):
+    screen.fill(BLACK)
+    
+    game_over_text = render_text(font, "GAME OVER", RED)
+    restart_text = render_text(small_font, "Pressione R para voltar ao menu", WHITE)
+    final_score_text = render_text(font, f"Pontuação Final: {score}", WHITE)
+    
+    screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+    screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
+    screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2))
+
+def read_actions():
+    """Converte o estado do teclado em bits ACTION_*"""
+    keys = pygame.key.get_pressed()
+    actions = 0
+    if keys[pygame.K_LEFT]:
+        actions |= ACTION_LEFT
+    if keys[pygame.K_RIGHT]:
+        actions |= ACTION_RIGHT
+    return actions
+
+def main(render_mode=RENDER_MODE, engine=ENGINE):
+    screen = init_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Galaga Clone")
+    renderer = Renderer(screen, BLACK, render_mode)
+    get_atlas().convert()
+    starfield = Starfield((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = pygame.time.Clock()
+    font = get_font(36)
+    small_font = get_font(24)
+    score_store = get_score_store()  # Já começa a ler o placar em segundo plano
     
-    elif game_state == PLAYING:
-        screen.fill(BLACK)
+    # Variáveis do jogo
+    game_class = get_engine(engine)
+    game = None
+    game_state = MENU
+    selected_difficulty = DEFAULT_DIFFICULTY
+    player_name = ""
+    shoot_pressed = False
+    pacer = FramePacer(FPS)
+    profiler.watch("text_renders", lambda: text_cache.misses)
+    profiler.watch("skipped_frames", lambda: pacer.skipped)
+    
+    # Loop principal do jogo
+    running = True
+    while running:
+        profiler.begin_frame()
         
-        # Desenhando estrelas de fundo
-        for _ in range(50):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            pygame.draw.circle(screen, WHITE, (x, y), 1)
+        # Em telas estáticas já desenhadas, dorme até chegar uma entrada
+        if renderer.idle:
+            events = [pygame.event.wait()] + pygame.event.get()
+        else:
+            events = pygame.event.get()
         
-        # Desenhando sprites
-        all_sprites.draw(screen)
+        # Processando eventos
+        for event in events:
+            renderer.handle_event(event)
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN:
+                if game_state == MENU:
+                    if event.key in DIFFICULTY_KEYS:
+                        selected_difficulty = DIFFICULTY_KEYS[event.key]
+                    elif event.key == pygame.K_RETURN:
+                        game = game_class(selected_difficulty)
+                        replay = Replay(GALAGA, game.seed, game.difficulty,
+                                        flags=Replay.collision_flags(game.collision))
+                        game_state = PLAYING
+                        shoot_pressed = False
+                    elif event.key == pygame.K_h:
+                        score_store.reload()
+                        game_state = HIGH_SCORES
+                
+                elif game_state == HIGH_SCORES:
+                    if event.key == pygame.K_ESCAPE:
+                        game_state = MENU
+                    elif event.key in DIFFICULTY_KEYS:
+                        selected_difficulty = DIFFICULTY_KEYS[event.key]
+                
+                elif game_state == PLAYING:
+                    if event.key == pygame.K_SPACE:
+                        shoot_pressed = True
+                
+                elif game_state == GAME_OVER:
+                    if event.key == pygame.K_r:
+                        game_state = MENU
+                
+                elif game_state == ENTER_NAME:
+                    if event.key == pygame.K_RETURN:
+                        if player_name.strip():
+                            add_high_score(player_name.strip(), game.score, game.difficulty)
+                            selected_difficulty = game.difficulty
+                            player_name = ""
+                            game_state = HIGH_SCORES
+                    elif event.key == pygame.K_BACKSPACE:
+                        player_name = player_name[:-1]
+                    else:
+                        if len(player_name) < 15 and event.unicode.isprintable():
+                            player_name += event.unicode
+        profiler.mark("events")
         
-        # Desenhando UI
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
+        # Entrega o que o worker de E/S terminou (ex.: a leitura do placar)
+        get_worker().poll()
+        profiler.mark("io")
         
-        lives_text = font.render(f"Lives: {lives}", True, WHITE)
-        screen.blit(lives_text, (10, 50))
+        # Lógica do jogo em ticks fixos, independente da taxa de quadros: o
+        # tempo real desde o último quadro vira ticks (ver pacing)
+        pacer.begin_frame()
+        if game_state == PLAYING:
+            while pacer.tick():
+                actions = read_actions()
+                if shoot_pressed:
+                    actions |= ACTION_SHOOT
+                    shoot_pressed = False
+                replay.record(actions)
+                game.step(actions)
+                starfield.update()
+                if game.game_over:
+                    replay.finish(game.score, game.level)
+                    save_to_replay_dir(replay)
+                    game_state = ENTER_NAME if is_high_score(game.score, game.difficulty) else GAME_OVER
+                    break
+            profiler.count("enemies", len(game.enemies))
+            profiler.count("bullets", len(game.bullets))
+            profiler.count("enemy_bullets", len(game.enemy_bullets))
+            profiler.count("explosions", len(game.explosions))
+            profiler.count("quality", pacer.quality)
+        else:
+            pacer.reset()
+        profiler.mark("logic")
         
-        level_text = font.render(f"Level: {level}", True, WHITE)
-        screen.blit(level_text, (SCREEN_WIDTH - 150, 10))
+        # Desenhando e atualizando a tela baseado no estado; telas estáticas
+        # só são redesenhadas quando a chave muda
+        if game_state == MENU:
+            renderer.static((MENU, selected_difficulty),
+                            lambda s: draw_menu(s, font, small_font, selected_difficulty))
         
-        diff_text = small_font.render(f"Dificuldade: {selected_difficulty}", True, WHITE)
-        screen.blit(diff_text, (SCREEN_WIDTH - 200, 50))
-    
-    elif game_state == GAME_OVER:
-        screen.fill(BLACK)
+        elif game_state == HIGH_SCORES:
+            renderer.static((HIGH_SCORES, selected_difficulty, score_store.version),
+                            lambda s: draw_high_scores(s, font, small_font, selected_difficulty))
         
-        game_over_text = font.render("GAME OVER", True, RED)
-        restart_text = small_font.render("Pressione R para voltar ao menu", True, WHITE)
-        final_score_text = font.render(f"Pontuação Final: {score}", True, WHITE)
+        elif game_state == ENTER_NAME:
+            renderer.static((ENTER_NAME, player_name, game.score),
+                            lambda s: draw_enter_name(s, font, small_font, player_name, game.score))
         
-        screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
-        screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2))
+        elif game_state == PLAYING:
+            # Atrasado, o quadro só roda a lógica (ver pacing)
+            if pacer.render:
+                draw_playing(renderer, font, small_font, game, starfield, pacer.alpha, pacer.quality)
+        
+        elif game_state == GAME_OVER:
+            renderer.static((GAME_OVER, game.score), lambda s: draw_game_over(s, font, small_font, game.score))
+        profiler.mark("draw")
+        
+        pacer.end_frame()
+        clock.tick(RENDER_FPS)
+        profiler.mark("wait")
+        profiler.end_frame()
     
-    # Atualizando a tela
-    pygame.display.flip()
+    # Encerrando o Pygame (depois de gravar os scores e replays pendentes)
+    score_store.close()
+    get_worker().close()
+    print(f"Ritmo: {pacer.report()}")
+    path = profiler.export()
+    if path:
+        print(f"Perfil de {profiler.frame} quadros gravado em {path}")
+    pygame.quit()
+
+def autopilot(game):
+    """Piloto simples: persegue o inimigo mais próximo em x e atira sempre"""
+    player_x = game.player.rect.centerx
+    actions = ACTION_SHOOT
+    target_x = game.nearest_enemy_x(player_x)
+    if target_x is not None:
+        if target_x < player_x - 5:
+            actions |= ACTION_LEFT
+        elif target_x > player_x + 5:
+            actions |= ACTION_RIGHT
+    return actions
+
+def run_headless(difficulty, ticks, seed=None, engine=ENGINE):
+    """Roda partidas sem tela e sem limite de FPS; retorna (resultados, ticks/s)
 
-# Encerrando o Pygame
-pygame.quit()
\ No newline at end of file
+    Com seed, a sequência de partidas (e seus resultados) é sempre a mesma.
+    """
+    seeds = random.Random(seed)
+    game = get_engine(engine)(difficulty, seeds.randrange(2 ** 63))
+    results = []
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.step(autopilot(game))
+        if game.game_over:
+            results.append((game.score, game.level))
+            game.reset(seeds.randrange(2 ** 63))
+    elapsed = time.perf_counter() - start
+    return results, ticks / elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Galaga Clone")
+    parser.add_argument("--headless", action="store_true", help="simula sem tela, na velocidade máxima")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--difficulty", choices=list(DIFFICULTIES), default=DEFAULT_DIFFICULTY)
+    parser.add_argument("--seed", type=int, help="semente das partidas headless")
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE,
+                        help="arrays: inimigos e tiros em arrays NumPy")
+    parser.add_argument("--profile", metavar="ARQUIVO", help="grava o tempo de cada quadro em CSV ou JSON")
+    parser.add_argument("--render", choices=RENDER_MODES, default=RENDER_MODE,
+                        help="dirty: só regiões alteradas; flip: tela inteira todo quadro")
+    args = parser.parse_args()
+    
+    if args.headless:
+        results, rate = run_headless(args.difficulty, args.ticks, args.seed, args.engine)
+        print(f"{args.ticks} ticks em modo headless: {rate:,.0f} ticks/s")
+        for score, level in results:
+            print(f"  Partida: score {score}, nível {level}")
+    else:
+        if args.profile:
+            profiler.enable(args.profile)
+        main(args.render, args.engine)
+        sys.exit()
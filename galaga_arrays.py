@@ -0,0 +1,295 @@
+"""Motor de entidades do Galaga em arrays NumPy (structure of arrays).
+
+Inimigos e tiros ficam em EntityArrays em vez de um Sprite por entidade: o
+movimento (as mesmas tabelas de TRAJECTORIES), as bordas, os tiros e as
+colisões de um tick são operações vetorizadas sobre todas as entidades de
+uma vez; no modo "mask", os pares cujos retângulos se tocam são conferidos
+numa tabela pré-calculada (OverlapTables) de quais deslocamentos entre duas
+máscaras do atlas se tocam, também sem laço por par. Jogador e explosões continuam sendo
+sprites, e o desenho usa as mesmas imagens do
+atlas que os sprites.
+
+As regras são as de Enemy/Bullet/EnemyBullet, inclusive a ordem de consumo
+do rng e o arredondamento de Rect: com a mesma semente e as mesmas ações, o
+resultado é idêntico ao do motor de sprites (replays valem nos dois).
+"""
+import functools
+import itertools
+
+import numpy as np
+
+from entities import EntityArrays
+from profiler import profiler
+from galaga import (ACTION_SHOOT, BULLET_SPEED, COLLISION_MODE, DEFAULT_DIFFICULTY, DIFFICULTIES,
+                    EDGE_DROP, ENEMY_BULLET_SPEED, ENEMY_POINTS, MOVE_PATTERNS, SCREEN_HEIGHT,
+                    SCREEN_WIDTH, SHOOT_COOLDOWN, TRAJECTORIES, GalagaGame, get_atlas)
+
+_POSITION_FIELDS = {"x": np.int64, "y": np.int64, "prev_x": np.int64, "prev_y": np.int64}
+ENEMY_FIELDS = dict(_POSITION_FIELDS, speed_x=np.int64, enemy_type=np.intp, trajectory=np.intp,
+                    step=np.intp, cooldown=np.int64, health=np.int64)
+BULLET_FIELDS = _POSITION_FIELDS
+
+
+def _stack_tables(trajectories):
+    """Tabelas das trajetórias empilhadas, uma linha por trajetória (as mais
+    curtas completadas com zeros): (dx, dy, sweep, next, leaves_screen)"""
+    length = max(len(trajectory) for trajectory in trajectories)
+    tables = []
+    for name, dtype in (("dx", np.int64), ("dy", np.int64), ("sweep", bool), ("next", np.intp)):
+        table = np.zeros((len(trajectories), length), dtype)
+        for i, trajectory in enumerate(trajectories):
+            values = getattr(trajectory, name)
+            table[i, :len(values)] = values
+        tables.append(table)
+    tables.append(np.array([trajectory.leaves_screen for trajectory in trajectories]))
+    return tables
+
+
+# A coluna "trajectory" dos inimigos é o índice da chave em TRAJECTORY_KEYS
+TRAJECTORY_KEYS = list(TRAJECTORIES)
+TRAJECTORY_IDS = {key: i for i, key in enumerate(TRAJECTORY_KEYS)}
+STEP_DX, STEP_DY, STEP_SWEEP, STEP_NEXT, LEAVES_SCREEN = _stack_tables([TRAJECTORIES[key] for key in TRAJECTORY_KEYS])
+
+
+def _overlaps(x, y, size, rect):
+    """Máscara das entidades (x, y, size) que colidem com rect, como colliderect"""
+    width, height = size
+    return (x < rect.right) & (x + width > rect.left) & (y < rect.bottom) & (y + height > rect.top)
+
+
+def _overlap_table(mask, other):
+    """table[ox + w - 1, oy + h - 1] (w, h: tamanho de other): other em (ox,
+    oy) em relação a mask toca mask? Cobre todos os deslocamentos em que os
+    retângulos se cruzam, os únicos consultados depois da broadphase."""
+    width, height = mask.get_size()
+    other_width, other_height = other.get_size()
+    table = np.zeros((width + other_width - 1, height + other_height - 1), bool)
+    for ox in range(1 - other_width, width):
+        for oy in range(1 - other_height, height):
+            table[ox + other_width - 1, oy + other_height - 1] = mask.overlap(other, (ox, oy)) is not None
+    return table
+
+
+class OverlapTables:
+    """Tabelas de _overlap_table para os pares de máscaras do atlas que o
+    collide confere: tiro x inimigo (por tipo), nave x tiro inimigo e nave x
+    inimigo (por tipo)"""
+    def __init__(self, atlas):
+        self.bullet_enemy = np.stack([_overlap_table(atlas.bullet_mask, mask) for mask in atlas.enemy_masks])
+        self.player_enemy_bullet = _overlap_table(atlas.player_mask, atlas.enemy_bullet_mask)
+        self.player_enemy = np.stack([_overlap_table(atlas.player_mask, mask) for mask in atlas.enemy_masks])
+
+
+@functools.lru_cache(maxsize=None)
+def get_overlap_tables():
+    """Calculadas uma vez por processo, na primeira partida no modo mask"""
+    return OverlapTables(get_atlas())
+
+
+def _positions(arrays, alpha):
+    prev_x, prev_y = arrays["prev_x"], arrays["prev_y"]
+    xs = prev_x + (arrays["x"] - prev_x) * alpha
+    ys = prev_y + (arrays["y"] - prev_y) * alpha
+    return zip(xs.tolist(), ys.tolist())
+
+
+class ArrayGalagaGame(GalagaGame):
+    """GalagaGame com inimigos e tiros em arrays; mesma interface de step/draw"""
+    def __init__(self, difficulty=DEFAULT_DIFFICULTY, seed=None, collision=COLLISION_MODE):
+        atlas = get_atlas()
+        self.enemy_size = atlas.enemies[0].get_size()
+        self.bullet_size = atlas.bullet.get_size()
+        self.enemy_bullet_size = atlas.enemy_bullet.get_size()
+        super().__init__(difficulty, seed, collision)
+        self.overlap = get_overlap_tables() if self.collided is not None else None
+
+    def create_entity_groups(self):
+        self.enemies = EntityArrays(ENEMY_FIELDS)
+        self.bullets = EntityArrays(BULLET_FIELDS)
+        self.enemy_bullets = EntityArrays(BULLET_FIELDS)
+
+    def add_enemy(self, x, y, enemy_type, patterns=MOVE_PATTERNS, entry=None):
+        settings = DIFFICULTIES[self.difficulty]
+        # Mesmos sorteios, na mesma ordem, de Enemy.__init__
+        cooldown = self.rng.randint(*SHOOT_COOLDOWN)
+        key = (entry, self.rng.choice(patterns))
+        offset_x, offset_y = TRAJECTORIES[key].entry_offset
+        x, y = x - offset_x, y - offset_y
+        self.enemies.add(x=x, y=y, prev_x=x, prev_y=y, speed_x=settings["enemy_speed"],
+                         enemy_type=enemy_type, trajectory=TRAJECTORY_IDS[key], step=0,
+                         cooldown=cooldown, health=settings["enemy_health"])
+
+    def add_bullet(self, x, y):
+        width, height = self.bullet_size
+        x, y = x - width // 2, y - height  # centerx, bottom
+        self.bullets.add(x=x, y=y, prev_x=x, prev_y=y)
+
+    def add_enemy_bullet(self, x, y):
+        x -= self.enemy_bullet_size[0] // 2  # centerx, top
+        self.enemy_bullets.add(x=x, y=y, prev_x=x, prev_y=y)
+
+    def release_bullets(self):
+        # Tiros são linhas dos arrays: o espaço já é reaproveitado por empty()
+        pass
+
+    def update_bullets(self):
+        bullets = self.bullets
+        bullets["y"] -= BULLET_SPEED
+        bullets.keep(bullets["y"] + self.bullet_size[1] >= 0)
+        enemy_bullets = self.enemy_bullets
+        enemy_bullets["y"] += ENEMY_BULLET_SPEED
+        enemy_bullets.keep(enemy_bullets["y"] <= SCREEN_HEIGHT)
+
+    def update_enemies(self):
+        enemies = self.enemies
+        if not enemies:
+            return
+        x, y, speed_x = enemies["x"], enemies["y"], enemies["speed_x"]
+        trajectory, step = enemies["trajectory"], enemies["step"]
+        width, height = self.enemy_size
+
+        # Padrões de movimento: a linha do tick atual de cada trajetória
+        sweep = STEP_SWEEP[trajectory, step]
+        x += STEP_DX[trajectory, step]
+        x[sweep] += speed_x[sweep]
+        y += STEP_DY[trajectory, step]
+        step[:] = STEP_NEXT[trajectory, step]
+        gone = LEAVES_SCREEN[trajectory] & (y > SCREEN_HEIGHT)
+
+        # Mudar direção nas bordas (só quem está acompanhando a formação)
+        edge = sweep & ((x + width >= SCREEN_WIDTH) | (x <= 0))
+        speed_x[edge] *= -1
+        y[edge] += EDGE_DROP
+
+        # Atirar: só os prontos sorteiam, na ordem de inserção, como no
+        # laço de sprites (inclusive os que acabaram de sair pela borda)
+        cooldown = enemies["cooldown"]
+        cooldown -= 1
+        ready = np.flatnonzero(cooldown <= 0)
+        if len(ready):
+            random = self.rng.random
+            frequency = DIFFICULTIES[self.difficulty]["bullet_frequency"]
+            for i in ready.tolist():
+                if random() < frequency:
+                    self.add_enemy_bullet(int(x[i]) + width // 2, int(y[i]) + height)
+                    cooldown[i] = self.rng.randint(*SHOOT_COOLDOWN)
+
+        if gone.any():
+            enemies.keep(~gone)
+
+    def collide(self):
+        enemies, bullets = self.enemies, self.bullets
+        width, height = self.enemy_size
+
+        # Tiros do jogador com inimigos: todos os pares são apurados antes de
+        # remover alguém, como em groupcollide
+        if enemies and bullets:
+            bullet_width, bullet_height = self.bullet_size
+            bx, by = bullets["x"][:, None], bullets["y"][:, None]
+            x, y = enemies["x"], enemies["y"]
+            hits = (bx < x + width) & (bx + bullet_width > x) & (by < y + height) & (by + bullet_height > y)
+            if self.overlap is not None and hits.any():
+                self.touching_pixels(hits, bx[:, 0], by[:, 0], x, y, enemies["enemy_type"])
+            _, hit_enemies = np.nonzero(hits)
+            if len(hit_enemies):
+                health, enemy_type = enemies["health"], enemies["enemy_type"]
+                killed = np.zeros(len(enemies), dtype=bool)
+                for i in hit_enemies.tolist():
+                    health[i] -= 1
+                    if health[i] <= 0:
+                        self.score += ENEMY_POINTS[enemy_type[i]]
+                        self.add_explosion(int(x[i]) + width // 2, int(y[i]) + height // 2)
+                        killed[i] = True
+                bullets.keep(~hits.any(axis=1))
+                enemies.keep(~killed)
+        profiler.mark("collide_bullets")
+
+        # Tiros dos inimigos com o jogador
+        player_rect = self.player.rect
+        hits = _overlaps(self.enemy_bullets["x"], self.enemy_bullets["y"], self.enemy_bullet_size, player_rect)
+        if self.overlap is not None and hits.any():
+            self.touching_player(hits, self.enemy_bullets["x"], self.enemy_bullets["y"],
+                                 self.overlap.player_enemy_bullet[None])
+        if hits.any():
+            self.enemy_bullets.keep(~hits)
+            self.player_hit()
+        profiler.mark("collide_enemy_bullets")
+
+        # Inimigos com o jogador
+        hits = _overlaps(enemies["x"], enemies["y"], self.enemy_size, player_rect)
+        if self.overlap is not None and hits.any():
+            self.touching_player(hits, enemies["x"], enemies["y"], self.overlap.player_enemy,
+                                 enemies["enemy_type"])
+        if hits.any():
+            enemies.keep(~hits)
+            self.player_hit()
+        profiler.mark("collide_enemies")
+
+    def touching_pixels(self, hits, bx, by, x, y, enemy_type):
+        """Desmarca em hits[tiro, inimigo] os pares cujos retângulos colidem
+        mas as máscaras não (narrowphase, como collide_mask)"""
+        b, e = np.nonzero(hits)
+        table = self.overlap.bullet_enemy
+        other_width, other_height = self.enemy_size
+        touching = table[enemy_type[e], x[e] - bx[b] + other_width - 1, y[e] - by[b] + other_height - 1]
+        hits[b[~touching], e[~touching]] = False
+
+    def touching_player(self, hits, x, y, tables, kinds=None):
+        """Desmarca em hits as entidades cujo retângulo colide com o do
+        jogador mas a máscara não toca a da nave; tables[kinds[i]] é a
+        tabela da entidade i (sem kinds, todas usam tables[0])"""
+        i = np.flatnonzero(hits)
+        player_x, player_y = self.player.rect.topleft
+        _, columns, rows = tables.shape
+        other_width = columns - self.player.rect.width + 1
+        other_height = rows - self.player.rect.height + 1
+        kind = kinds[i] if kinds is not None else 0
+        touching = tables[kind, x[i] - player_x + other_width - 1, y[i] - player_y + other_height - 1]
+        hits[i[~touching]] = False
+
+    def step(self, actions=0):
+        """Avança um tick com as ações (bits ACTION_*) do jogador"""
+        if self.game_over:
+            return
+        self.ticks += 1
+        self.actions = actions
+
+        # Posições do tick anterior, usadas na interpolação do desenho
+        for sprite in self.all_sprites:
+            sprite.prev_pos = sprite.rect.topleft
+        for arrays in (self.enemies, self.bullets, self.enemy_bullets):
+            arrays["prev_x"][:] = arrays["x"]
+            arrays["prev_y"][:] = arrays["y"]
+
+        if actions & ACTION_SHOOT:
+            self.player.shoot(self)
+
+        # Atualizando: jogador e explosões são sprites; tiros inimigos novos
+        # só se movem a partir do próximo tick, como no motor de sprites
+        self.all_sprites.update(self)
+        self.update_bullets()
+        self.update_enemies()
+        profiler.mark("update")
+        self.collide()
+
+        # Verificando se todos os inimigos foram derrotados
+        if len(self.enemies) == 0:
+            self.level += 1
+            self.create_enemy_wave()
+
+    def nearest_enemy_x(self, x):
+        if not self.enemies:
+            return None
+        centers = self.enemies["x"] + self.enemy_size[0] // 2
+        return int(centers[np.argmin(np.abs(centers - x))])
+
+    def draw(self, surface, alpha=1.0, explosions=True):
+        atlas = get_atlas()
+        images = atlas.enemies
+        blits = [(images[enemy_type], pos) for enemy_type, pos
+                 in zip(self.enemies["enemy_type"].tolist(), _positions(self.enemies, alpha))]
+        blits.extend(zip(itertools.repeat(atlas.bullet), _positions(self.bullets, alpha)))
+        blits.extend(zip(itertools.repeat(atlas.enemy_bullet), _positions(self.enemy_bullets, alpha)))
+        rects = surface.blits(blits)
+        rects.extend(super().draw(surface, alpha, explosions))
+        return rects
@@ -0,0 +1,173 @@
+"""Execução em lote de partidas do Galaga sem tela, para balancear a tabela
+DIFFICULTIES.
+
+Cada processo avança centenas de GalagaGame independentes, tick a tick, com
+o autopilot jogando; os lotes são distribuídos entre todos os núcleos e os
+resultados viram estatísticas por dificuldade (nível médio alcançado e
+distribuição dos scores). Todas as dificuldades jogam as mesmas sementes.
+
+Valores da tabela podem ser trocados sem editar galaga.py:
+    python galaga_batch.py --games 2000 --set Difícil.bullet_frequency=0.02
+
+Uso: python galaga_batch.py [--games 1000] [--difficulty Fácil Médio] [--workers N]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import galaga
+
+BATCH_SIZE = 200  # Partidas avançadas juntas em cada processo
+MAX_TICKS = 20000  # Limite por partida (~5min30s de jogo)
+HISTOGRAM_BINS = 10
+
+
+class BatchRunner:
+    """Várias partidas independentes avançadas juntas, um tick por vez"""
+    def __init__(self, difficulty, seeds, engine=galaga.ENGINE, policy=galaga.autopilot):
+        game_class = galaga.get_engine(engine)
+        self.games = [game_class(difficulty, seed) for seed in seeds]
+        self.policy = policy
+        self.running = list(self.games)
+
+    def step(self):
+        """Avança um tick de todas as partidas em andamento; retorna quantas restam"""
+        policy = self.policy
+        for game in self.running:
+            game.step(policy(game))
+        self.running = [game for game in self.running if not game.game_over]
+        return len(self.running)
+
+    def run(self, max_ticks=MAX_TICKS):
+        """Joga até todas terminarem ou max_ticks; retorna (score, nível, ticks) por partida"""
+        for _ in range(max_ticks):
+            if not self.step():
+                break
+        return [(game.score, game.level, game.ticks) for game in self.games]
+
+
+def run_batch(difficulty, settings, seeds, engine=galaga.ENGINE, max_ticks=MAX_TICKS):
+    """Roda um lote com settings instalados como DIFFICULTIES[difficulty]"""
+    previous = galaga.DIFFICULTIES.get(difficulty)
+    galaga.DIFFICULTIES[difficulty] = settings
+    try:
+        return BatchRunner(difficulty, seeds, engine).run(max_ticks)
+    finally:
+        if previous is None:
+            del galaga.DIFFICULTIES[difficulty]
+        else:
+            galaga.DIFFICULTIES[difficulty] = previous
+
+
+def _run_batch(args):
+    return args[0], run_batch(*args)
+
+
+def run_games(table, games, workers=None, engine=galaga.ENGINE, max_ticks=MAX_TICKS,
+              batch_size=BATCH_SIZE, seed=None):
+    """Joga games partidas de cada dificuldade de table (nome -> settings).
+
+    Retorna {dificuldade: [(score, nível, ticks), ...]}, na ordem das sementes.
+    """
+    rng = random.Random(seed)
+    seeds = [rng.randrange(2 ** 63) for _ in range(games)]
+    batches = [(difficulty, settings, seeds[start:start + batch_size], engine, max_ticks)
+               for difficulty, settings in table.items()
+               for start in range(0, games, batch_size)]
+    results = {difficulty: [] for difficulty in table}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        outputs = map(_run_batch, batches)
+        for difficulty, batch in outputs:
+            results[difficulty].extend(batch)
+        return results
+    with ProcessPoolExecutor(workers) as executor:
+        for difficulty, batch in executor.map(_run_batch, batches):
+            results[difficulty].extend(batch)
+    return results
+
+
+def summarize(results):
+    """Estatísticas de uma dificuldade a partir de [(score, nível, ticks), ...]"""
+    scores = sorted(score for score, _, _ in results)
+    levels = [level for _, level, _ in results]
+    deciles = statistics.quantiles(scores, n=10) if len(scores) > 1 else scores * 9
+    return {
+        "games": len(results),
+        "mean_level": statistics.mean(levels),
+        "max_level": max(levels),
+        "mean_score": statistics.mean(scores),
+        "stdev_score": statistics.pstdev(scores),
+        "p10": deciles[0],
+        "median": statistics.median(scores),
+        "p90": deciles[-1],
+        "max_score": scores[-1],
+        "mean_ticks": statistics.mean(ticks for _, _, ticks in results),
+        "histogram": histogram(scores),
+    }
+
+
+def histogram(scores, bins=HISTOGRAM_BINS):
+    """[(início, fim, contagem), ...] com faixas de score de mesma largura"""
+    low, high = scores[0], scores[-1]
+    width = max(1, -(-(high - low + 1) // bins))
+    counts = [0] * bins
+    for score in scores:
+        counts[min((score - low) // width, bins - 1)] += 1
+    return [(low + i * width, low + (i + 1) * width - 1, count) for i, count in enumerate(counts)]
+
+
+def parse_override(text):
+    """"Nome.chave=valor" -> (nome, chave, valor)"""
+    try:
+        target, value = text.split("=", 1)
+        difficulty, key = target.rsplit(".", 1)
+        return difficulty, key, json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Use Nome.chave=valor, recebido {text!r}") from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partidas do Galaga em lote, para balancear dificuldades")
+    parser.add_argument("--games", type=int, default=1000, help="partidas por dificuldade")
+    parser.add_argument("--difficulty", nargs="+", choices=list(galaga.DIFFICULTIES),
+                        default=list(galaga.DIFFICULTIES))
+    parser.add_argument("--set", type=parse_override, action="append", default=[],
+                        metavar="NOME.CHAVE=VALOR", help="troca um valor de DIFFICULTIES")
+    parser.add_argument("--workers", type=int, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--engine", choices=galaga.ENGINES, default=galaga.ENGINE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = {difficulty: dict(galaga.DIFFICULTIES[difficulty]) for difficulty in args.difficulty}
+    for difficulty, key, value in args.set:
+        table.setdefault(difficulty, dict(galaga.DIFFICULTIES[galaga.DEFAULT_DIFFICULTY]))[key] = value
+
+    start = time.perf_counter()
+    results = run_games(table, args.games, args.workers, args.engine, args.max_ticks,
+                        args.batch_size, args.seed)
+    elapsed = time.perf_counter() - start
+    total_games = sum(len(batch) for batch in results.values())
+    total_ticks = sum(ticks for batch in results.values() for _, _, ticks in batch)
+    print(f"{total_games} partidas, {total_ticks:,} ticks em {elapsed:.2f}s "
+          f"({total_games / elapsed:,.1f} partidas/s, {total_ticks / elapsed:,.0f} ticks/s)")
+
+    for difficulty, batch in results.items():
+        stats = summarize(batch)
+        print(f"\n{difficulty} {table[difficulty]}")
+        print(f"  nível médio {stats['mean_level']:.2f} (máx {stats['max_level']}), "
+              f"{stats['mean_ticks']:.0f} ticks por partida")
+        print(f"  score: média {stats['mean_score']:.1f} ± {stats['stdev_score']:.1f}, "
+              f"p10 {stats['p10']:.0f}, mediana {stats['median']:.0f}, p90 {stats['p90']:.0f}, "
+              f"máx {stats['max_score']}")
+        largest = max(count for _, _, count in stats["histogram"])
+        for low, high, count in stats["histogram"]:
+            bar = "#" * round(40 * count / largest) if largest else ""
+            print(f"  {low:>6}-{high:<6} {count:>6} {bar}")
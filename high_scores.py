@@ -0,0 +1,291 @@
+"""Placar de high scores em memória, com leitura e gravação em segundo plano.
+
+Os scores ficam em um ScoreBoard ordenado por dificuldade; consultas (top,
+rank, is_high_score) nunca tocam o disco. Ler o placar (ao abrir e em
+reload()) e gravar cada add() são tarefas do worker de E/S (io_worker), e o
+resultado da leitura entra na memória no poll() do loop. Scores adicionados
+com uma leitura em andamento ficam só em memória e são gravados quando ela
+chega: gravar antes regravaria o JSON sem o que ainda não foi lido.
+
+- JsonScoreBackend: regrava o arquivo inteiro via arquivo temporário +
+  os.replace (nunca deixa um JSON pela metade); gravações pendentes são
+  agrupadas numa só.
+- SQLiteScoreBackend: insere uma linha por score, para placares grandes.
+- LeaderboardScoreBackend: placar compartilhado num servidor (leaderboard.py),
+  para várias máquinas verem os mesmos scores.
+"""
+import bisect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+from io_worker import get_worker
+
+DEFAULT_CAPACITY = 1000  # Entradas mantidas em memória por dificuldade
+TOP_SCORES = 10  # Tamanho do placar exibido e usado em is_high_score
+
+
+class ScoreBoard:
+    """Scores de uma dificuldade em ordem decrescente (empates: o mais antigo primeiro)"""
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._keys = []  # -score, em ordem crescente, para bisect
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def rank(self, score):
+        """Posição (0 = primeiro) que um novo score ocuparia"""
+        return bisect.bisect_right(self._keys, -score)
+
+    def add(self, entry):
+        index = self.rank(entry["score"])
+        if index >= self.capacity:
+            return None
+        self._keys.insert(index, -entry["score"])
+        self.entries.insert(index, entry)
+        if len(self.entries) > self.capacity:
+            self._keys.pop()
+            self.entries.pop()
+        return index
+
+    def top(self, count=TOP_SCORES):
+        return self.entries[:count]
+
+
+class JsonScoreBackend:
+    """Arquivo JSON com a lista de scores, gravado de forma atômica"""
+    def __init__(self, path, worker=None):
+        self.path = path
+        self.worker = worker or get_worker()
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def load(self, capacity=None):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def save(self, entry, store):
+        snapshot = store.snapshot()
+        # Só a versão mais recente importa: gravações seguidas viram uma
+        with self._lock:
+            scheduled = self._pending is not None
+            self._pending = snapshot
+        if not scheduled:
+            self.worker.submit(self._write_pending, label="gravar high scores")
+
+    def _write_pending(self):
+        with self._lock:
+            snapshot, self._pending = self._pending, None
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".high_scores.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def close(self):
+        """Nada a fechar: cada gravação abre e fecha o próprio arquivo"""
+
+
+class SQLiteScoreBackend:
+    """Banco SQLite local; cada score é uma linha, sem limite de tamanho"""
+    def __init__(self, path, worker=None):
+        self.path = path
+        self.worker = worker or get_worker()
+        self._db = None  # Conexão usada só pelas tarefas do worker
+
+    def _connection(self):
+        if self._db is None:
+            # As tarefas do worker rodam uma de cada vez, mas depois de
+            # worker.close() o submit seguinte abre outra thread, que
+            # continua usando esta conexão
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                db.execute("CREATE TABLE IF NOT EXISTS scores ("
+                           "id INTEGER PRIMARY KEY, difficulty TEXT NOT NULL, "
+                           "name TEXT NOT NULL, score INTEGER NOT NULL)")
+                db.execute("CREATE INDEX IF NOT EXISTS scores_rank ON scores (difficulty, score DESC, id)")
+            self._db = db
+        return self._db
+
+    def load(self, capacity=DEFAULT_CAPACITY):
+        rows = self._connection().execute(
+            "SELECT difficulty, name, score FROM ("
+            " SELECT difficulty, name, score, id, ROW_NUMBER() OVER ("
+            "  PARTITION BY difficulty ORDER BY score DESC, id) AS position FROM scores"
+            ") WHERE position <= ? ORDER BY id", (capacity,)).fetchall()
+        return [{"name": name, "score": score, "difficulty": difficulty} for difficulty, name, score in rows]
+
+    def save(self, entry, store):
+        self.worker.submit(self._insert, entry, label="gravar high scores")
+
+    def _insert(self, entry):
+        db = self._connection()
+        with db:
+            db.execute("INSERT INTO scores (difficulty, name, score) VALUES (?, ?, ?)",
+                             (entry["difficulty"], entry["name"], entry["score"]))
+
+    def close(self):
+        self.worker.submit(self._close_db, label="fechar o banco de high scores")
+
+    def _close_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class LeaderboardScoreBackend:
+    """Servidor de placar (leaderboard.py) em tcp://host:porta ou unix:/caminho.
+
+    Cada requisição espera a resposta na thread do worker; o servidor junta
+    os submits de todos os clientes em lotes antes de gravar. Se a conexão
+    cair, a requisição falha e a seguinte reconecta.
+    """
+    def __init__(self, address, game, worker=None):
+        self.address = address
+        self.game = game
+        self.worker = worker or get_worker()
+        self._client = None  # Conexão aberta e usada só na thread do worker
+
+    def _request(self, message):
+        from leaderboard import LeaderboardClient  # Só quem usa o servidor importa o asyncio
+        if self._client is None:
+            self._client = LeaderboardClient(self.address)
+        try:
+            return self._client.request(message)
+        except (OSError, ValueError):
+            self._close_client()
+            raise
+
+    def load(self, capacity=DEFAULT_CAPACITY):
+        return self._request({"op": "load", "game": self.game, "capacity": capacity})["entries"]
+
+    def save(self, entry, store):
+        self.worker.submit(self._request, dict(entry, op="submit", game=self.game), label="enviar high score")
+
+    def close(self):
+        self.worker.submit(self._close_client, label="fechar a conexão com o placar")
+
+    def _close_client(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+class HighScoreStore:
+    """Placar por dificuldade, mantido em memória e lido em segundo plano.
+
+    Entradas antigas sem dificuldade (formato original do arquivo) vão para
+    default_difficulty. loaded diz se a leitura já chegou; version muda a
+    cada leitura entregue, para quem desenha o placar saber quando redesenhar.
+    """
+    def __init__(self, backend, default_difficulty, capacity=DEFAULT_CAPACITY):
+        self.backend = backend
+        self.default_difficulty = default_difficulty
+        self.capacity = capacity
+        self.boards = {}
+        self.loaded = False
+        self.version = 0
+        self._loading = False
+        self._unsaved = []  # Adicionados durante uma leitura; gravados quando ela chegar
+        self.reload()
+
+    def reload(self):
+        """Relê o placar do disco em segundo plano (ex.: para ver scores de
+        outras máquinas); ignorado se já houver uma leitura em andamento"""
+        if self._loading:
+            return
+        self._loading = True
+        self.backend.worker.submit(self.backend.load, self.capacity, on_done=self._loaded,
+                                   on_error=self._load_failed, label="ler high scores")
+
+    def _loaded(self, entries):
+        self.boards = {}
+        for entry in entries:
+            entry.setdefault("difficulty", self.default_difficulty)
+            self._board(entry["difficulty"]).add(entry)
+        for entry in self._unsaved:
+            self._board(entry["difficulty"]).add(entry)
+        self.loaded = True
+        self._loading = False
+        self.version += 1
+        self._save_unsaved()
+
+    def _load_failed(self, error):
+        print(f"Erro ao ler high scores: {error}")
+        self._loading = False
+        if self.loaded:
+            # A memória ainda tem a leitura anterior mais os scores novos
+            self._save_unsaved()
+        else:
+            print("Os scores novos ficam só em memória até o placar ser lido.")
+
+    def _save_unsaved(self):
+        unsaved, self._unsaved = self._unsaved, []
+        for entry in unsaved:
+            self.backend.save(entry, self)
+
+    def _board(self, difficulty):
+        board = self.boards.get(difficulty)
+        if board is None:
+            board = self.boards[difficulty] = ScoreBoard(self.capacity)
+        return board
+
+    def top(self, difficulty, count=TOP_SCORES):
+        return self._board(difficulty).top(count)
+
+    def rank(self, score, difficulty):
+        return self._board(difficulty).rank(score)
+
+    def is_high_score(self, score, difficulty, count=TOP_SCORES):
+        return self.rank(score, difficulty) < count
+
+    def add(self, name, score, difficulty):
+        entry = {"name": name, "score": score, "difficulty": difficulty}
+        self._board(difficulty).add(entry)
+        if self.loaded and not self._loading:
+            self.backend.save(entry, self)
+        else:
+            self._unsaved.append(entry)
+        return self.top(difficulty)
+
+    def snapshot(self):
+        """Cópia de todas as entradas, para gravar fora da thread principal"""
+        return [dict(entry) for board in self.boards.values() for entry in board.entries]
+
+    def flush(self):
+        """Espera a leitura e as gravações pendentes (bloqueia: não usar
+        dentro de um quadro)"""
+        self.backend.worker.flush()
+
+    def close(self):
+        """Fecha o backend depois das gravações pendentes e espera tudo terminar"""
+        self.backend.close()
+        self.flush()
+
+
+def open_store(path, default_difficulty, capacity=DEFAULT_CAPACITY, worker=None, game=None):
+    """Abre o placar e pede a leitura: tcp://host:porta e unix:/caminho usam
+    o servidor de placar (com os scores do jogo game), .db/.sqlite usam SQLite,
+    qualquer outro caminho usa JSON. worker=None usa o worker de E/S
+    compartilhado."""
+    if path.startswith(("tcp://", "unix:")):
+        backend = LeaderboardScoreBackend(path, game, worker)
+    elif os.path.splitext(path)[1] in (".db", ".sqlite", ".sqlite3"):
+        backend = SQLiteScoreBackend(path, worker)
+    else:
+        backend = JsonScoreBackend(path, worker)
+    return HighScoreStore(backend, default_difficulty, capacity)
@@ -0,0 +1,127 @@
+"""Worker de E/S em segundo plano, com fila de conclusões lida pelo loop.
+
+Tudo que toca o disco durante o jogo (gravar e reler o placar, ler imagens)
+é enviado com submit() para uma thread única, que executa as tarefas em
+ordem de chegada. O resultado de cada tarefa vai para uma fila de
+conclusões, e o loop do jogo chama poll() uma vez por quadro: os callbacks
+rodam na thread principal, entre um quadro e outro, então podem mexer no
+estado do jogo sem trava. Nenhum quadro espera o disco; só flush() (usado
+ao fechar o jogo e nos benchmarks) espera as tarefas pendentes.
+
+Como a ordem é a de chegada, uma leitura enviada depois de uma gravação vê
+o arquivo já gravado.
+"""
+import queue
+import threading
+
+
+class Job:
+    """Tarefa enviada ao worker; done, result e error valem depois do poll()
+    que a entrega"""
+    __slots__ = ("function", "args", "label", "on_done", "on_error", "done", "result", "error")
+
+    def __init__(self, function, args, label, on_done, on_error):
+        self.function = function
+        self.args = args
+        self.label = label
+        self.on_done = on_done
+        self.on_error = on_error
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class IOWorker:
+    """Thread única de E/S; a thread só começa na primeira tarefa.
+
+    wake, se definido, é chamado na thread do worker a cada tarefa
+    concluída (ex.: para postar um evento e acordar um loop parado em
+    pygame.event.wait()).
+    """
+    def __init__(self, name="io-worker"):
+        self.name = name
+        self.wake = None
+        self._tasks = queue.Queue()
+        self._completed = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, on_done=None, on_error=None, label="executar tarefa de E/S"):
+        """Agenda function(*args) no worker. on_done(result) ou on_error(error)
+        rodam no poll() seguinte à conclusão; sem on_error, o erro é impresso
+        como "Erro ao <label>: ..."."""
+        job = Job(function, args, label, on_done, on_error)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._tasks.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self._tasks.get()
+            try:
+                if job is None:
+                    return
+                try:
+                    job.result = job.function(*job.args)
+                except Exception as error:
+                    job.error = error
+                self._completed.put(job)
+                if self.wake is not None:
+                    self.wake()
+            finally:
+                self._tasks.task_done()
+
+    @property
+    def pending(self):
+        """Tarefas enviadas e ainda não concluídas no worker"""
+        return self._tasks.unfinished_tasks
+
+    def poll(self):
+        """Entrega as tarefas concluídas, rodando os callbacks nesta thread;
+        retorna quantas foram entregues. Nunca espera."""
+        delivered = 0
+        while True:
+            try:
+                job = self._completed.get_nowait()
+            except queue.Empty:
+                return delivered
+            job.done = True
+            delivered += 1
+            if job.error is None:
+                if job.on_done is not None:
+                    job.on_done(job.result)
+            elif job.on_error is not None:
+                job.on_error(job.error)
+            else:
+                print(f"Erro ao {job.label}: {job.error}")
+
+    def flush(self):
+        """Espera todas as tarefas pendentes e entrega as conclusões,
+        inclusive as das tarefas que os callbacks agendarem"""
+        while True:
+            self._tasks.join()
+            if not self.poll():
+                return
+
+    def close(self):
+        """flush() e encerra a thread; um submit() depois disso abre outra"""
+        self.flush()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._tasks.put(None)
+            thread.join()
+
+
+_worker = None
+
+
+def get_worker():
+    """Worker compartilhado pelo jogo (placar e assets na mesma fila)"""
+    global _worker
+    if _worker is None:
+        _worker = IOWorker()
+    return _worker
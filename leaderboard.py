@@ -0,0 +1,324 @@
+"""Servidor de placar compartilhado (asyncio), para várias máquinas ou jogos.
+
+O protocolo é uma linha JSON por mensagem, por TCP (tcp://host:porta) ou
+socket Unix (unix:/caminho). Cada conexão pode mandar várias requisições
+sem esperar as respostas; as respostas voltam na mesma ordem.
+
+    {"op": "submit", "game", "difficulty", "name", "score"} -> {"rank"}
+    {"op": "top", "game", "difficulty", "count"}            -> {"entries"}
+    {"op": "load", "game", "capacity"}                      -> {"entries"}
+    {"op": "stats"}                                         -> {"submitted", "batches"}
+
+Erros voltam como {"error": "..."}. O servidor mantém um ScoreBoard por
+(jogo, dificuldade) em memória, então top e load nunca tocam o disco. Os
+submits vão para o SQLite (WAL) em lotes: enquanto um lote é gravado, os
+submits seguintes se acumulam e viram o lote seguinte, numa só transação
+(até max_batch linhas). Um submit só entra no ScoreBoard, e só recebe a
+resposta com a sua posição, depois do commit do seu lote; se a gravação
+falhar, nenhum submit do lote entra e todos recebem o erro.
+
+O jogo usa o servidor como backend do placar com SCORES_FILE=tcp://... ou
+unix:... (ver high_scores.LeaderboardScoreBackend).
+
+Uso: python leaderboard.py [--listen tcp://127.0.0.1:8765] [--db leaderboard.db]
+"""
+import argparse
+import asyncio
+import json
+import signal
+import socket
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from high_scores import DEFAULT_CAPACITY, TOP_SCORES, ScoreBoard
+
+DEFAULT_ADDRESS = "tcp://127.0.0.1:8765"
+DEFAULT_DATABASE = "leaderboard.db"
+MAX_BATCH = 512  # Linhas por transação
+CLIENT_TIMEOUT = 5.0
+PUBLIC_FIELDS = ("name", "score", "difficulty")
+
+
+class LeaderboardError(Exception):
+    """Erro devolvido pelo servidor ({"error": ...})"""
+
+
+def parse_address(address):
+    """("tcp", (host, porta)) ou ("unix", caminho)"""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        if host and port.isdigit():
+            return "tcp", (host.strip("[]"), int(port))
+    raise ValueError(f"Endereço do placar inválido: {address!r} (use tcp://host:porta ou unix:/caminho)")
+
+
+def encode(message):
+    return json.dumps(message).encode() + b"\n"
+
+
+async def open_connection(address):
+    """(reader, writer) do asyncio para um endereço tcp:// ou unix:"""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+class LeaderboardClient:
+    """Conexão bloqueante, uma requisição por vez (para threads, como a do
+    worker de E/S)"""
+    def __init__(self, address, timeout=CLIENT_TIMEOUT):
+        kind, target = parse_address(address)
+        if kind == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(target)
+            except BaseException:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection(target, timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket = sock
+        self._file = sock.makefile("rwb")
+
+    def request(self, message):
+        self._file.write(encode(message))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("o servidor de placar fechou a conexão")
+        response = json.loads(line)
+        if "error" in response:
+            raise LeaderboardError(response["error"])
+        return response
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+class LeaderboardServer:
+    """Placar em memória por (jogo, dificuldade), persistido em lotes no SQLite.
+
+    O banco é aberto e usado só numa thread própria (executor de uma
+    thread), para o loop do asyncio nunca esperar o disco.
+    """
+    def __init__(self, path=DEFAULT_DATABASE, capacity=DEFAULT_CAPACITY, max_batch=MAX_BATCH):
+        self.path = path
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.address = None
+        self.boards = {}
+        self.submitted = 0
+        self.batches = 0
+        self._next_id = 1
+        self._pending = []  # (linha, entrada, future) esperando o próximo lote
+        self._wake = None
+        self._closing = False
+        self._server = None
+        self._writer = None
+        self._db = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-db")
+
+    async def start(self, address=DEFAULT_ADDRESS):
+        loop = asyncio.get_running_loop()
+        rows, last_id = await loop.run_in_executor(self._executor, self._open)
+        for row_id, game, difficulty, name, score in rows:
+            self._board(game, difficulty).add({"id": row_id, "name": name, "score": score,
+                                               "difficulty": difficulty})
+        self._next_id = last_id + 1
+        self._wake = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_batches())
+        kind, target = parse_address(address)
+        if kind == "unix":
+            self._server = await asyncio.start_unix_server(self._handle, target)
+            self.address = address
+        else:
+            self._server = await asyncio.start_server(self._handle, *target)
+            host, port = self._server.sockets[0].getsockname()[:2]
+            self.address = f"tcp://{host}:{port}"  # Porta 0 vira a porta escolhida
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Para de aceitar conexões, grava os lotes pendentes e fecha o banco"""
+        if self._server is not None:
+            self._server.close()
+        self._closing = True
+        self._wake.set()
+        await self._writer
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_db)
+        self._executor.shutdown()
+
+    # Banco (só na thread do executor)
+    def _open(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        # Com WAL, NORMAL só sincroniza o disco nos checkpoints: um commit
+        # sobrevive a uma queda do processo, não a uma queda de energia
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS scores ("
+                       "id INTEGER PRIMARY KEY, game TEXT NOT NULL, difficulty TEXT NOT NULL, "
+                       "name TEXT NOT NULL, score INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS scores_rank ON scores (game, difficulty, score DESC, id)")
+        rows = db.execute(
+            "SELECT id, game, difficulty, name, score FROM ("
+            " SELECT id, game, difficulty, name, score, ROW_NUMBER() OVER ("
+            "  PARTITION BY game, difficulty ORDER BY score DESC, id) AS position FROM scores"
+            ") WHERE position <= ? ORDER BY id", (self.capacity,)).fetchall()
+        last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()[0]
+        self._db = db
+        return rows, last_id
+
+    def _insert(self, rows):
+        with self._db:
+            self._db.executemany("INSERT INTO scores (id, game, difficulty, name, score) "
+                                 "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _close_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def _write_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                try:
+                    await loop.run_in_executor(self._executor, self._insert, [row for row, _, _ in batch])
+                except Exception as error:
+                    # Nada do lote foi gravado (a transação voltou atrás)
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                # Gravado: só agora as entradas aparecem no placar em memória
+                for (_, game, difficulty, _, _), entry, future in batch:
+                    rank = self._board(game, difficulty).add(entry)
+                    if not future.done():
+                        future.set_result({"rank": rank})
+                self.batches += 1
+            if self._closing:
+                return
+
+    # Protocolo
+    def _board(self, game, difficulty):
+        board = self.boards.get((game, difficulty))
+        if board is None:
+            board = self.boards[game, difficulty] = ScoreBoard(self.capacity)
+        return board
+
+    async def _handle(self, reader, writer):
+        # As respostas saem na ordem das requisições; um submit espera o
+        # commit do seu lote sem segurar a leitura das requisições seguintes
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self._send(writer, responses))
+        try:
+            while line := await reader.readline():
+                responses.put_nowait(self._dispatch(line))
+        except ConnectionError:
+            pass
+        except (ValueError, asyncio.LimitOverrunError):
+            # Linha maior que o limite do StreamReader: o resto da conexão
+            # não tem mais como ser separado em requisições
+            responses.put_nowait({"error": "requisição grande demais"})
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+
+    async def _send(self, writer, responses):
+        while (response := await responses.get()) is not None:
+            if isinstance(response, asyncio.Future):
+                try:
+                    response = await response
+                except Exception as error:
+                    response = {"error": f"falha ao gravar: {error}"}
+            writer.write(encode(response))
+            if responses.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    return
+
+    def _dispatch(self, line):
+        """Resposta (dict), ou um future com a resposta para submits"""
+        try:
+            request = json.loads(line)
+            op = request["op"]
+            if op == "submit":
+                return self._submit(request["game"], request["difficulty"], request["name"], request["score"])
+            if op == "top":
+                board = self._board(request["game"], request["difficulty"])
+                return {"entries": public(board.top(request.get("count", TOP_SCORES)))}
+            if op == "load":
+                return {"entries": self._load(request["game"], request.get("capacity", self.capacity))}
+            if op == "stats":
+                return {"submitted": self.submitted, "batches": self.batches}
+            return {"error": f"operação desconhecida: {op!r}"}
+        except (ValueError, KeyError, TypeError) as error:
+            return {"error": f"requisição inválida: {error!r}"}
+
+    def _submit(self, game, difficulty, name, score):
+        if not all(isinstance(field, str) for field in (game, difficulty, name)) or type(score) is not int:
+            raise TypeError("game, difficulty e name são textos e score é inteiro")
+        if self._closing:
+            return {"error": "servidor encerrando"}
+        entry = {"id": self._next_id, "name": name, "score": score, "difficulty": difficulty}
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((entry["id"], game, difficulty, name, score), entry, future))
+        self._wake.set()
+        self.submitted += 1
+        return future
+
+    def _load(self, game, capacity):
+        """Os capacity melhores de cada dificuldade do jogo, em ordem de
+        chegada (para quem os reinsere manter a ordem dos empates)"""
+        entries = [entry for (board_game, _), board in self.boards.items() if board_game == game
+                   for entry in board.entries[:capacity]]
+        entries.sort(key=lambda entry: entry["id"])
+        return public(entries)
+
+
+def public(entries):
+    return [{field: entry[field] for field in PUBLIC_FIELDS} for entry in entries]
+
+
+async def serve(address, path, max_batch):
+    server = LeaderboardServer(path, max_batch=max_batch)
+    await server.start(address)
+    print(f"Placar ouvindo em {server.address} (banco: {path})", flush=True)
+    try:
+        # SIGTERM encerra como Ctrl+C, gravando os lotes pendentes
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # Windows
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listen", default=DEFAULT_ADDRESS, help="tcp://host:porta ou unix:/caminho")
+    parser.add_argument("--db", default=DEFAULT_DATABASE)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.listen, args.db, args.max_batch))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,142 @@
+"""Ritmo dos quadros: lógica em ticks fixos, desenho só quando dá tempo.
+
+A lógica dos jogos avança em ticks de duração fixa (1/taxa s), acumulando o
+tempo real de cada quadro, então a velocidade do jogo não depende da máquina:
+um quadro lento só faz o seguinte rodar mais ticks. Para a máquina alcançar
+o relógio, o pacer decide também o que desenhar:
+
+- quadro pulado: depois de um quadro atrasado (trabalho maior que um tick),
+  o seguinte só roda a lógica, sem desenhar; no máximo max_skip seguidos,
+  para a tela nunca congelar;
+- qualidade: com atrasos seguidos, o nível cai (QUALITY_REDUCED: menos
+  estrelas; QUALITY_MINIMAL: também sem explosões); depois de muitos
+  quadros folgados, volta a subir um nível.
+
+Uso no loop: begin_frame() depois de ler os eventos (a espera por eventos
+não é trabalho do quadro), "while pacer.tick(): <um tick>", desenhar a
+partida só se pacer.render, end_frame() antes da espera do clock. Telas
+estáticas são sempre desenhadas. stats() e report() resumem os quadros
+pulados e atrasados da sessão.
+"""
+import time
+
+MAX_FRAME_TIME = 0.25  # Evita a "espiral da morte" depois de um travamento
+MAX_SKIP = 4  # Quadros seguidos sem desenhar, no máximo
+DEGRADE_AFTER = 8  # Quadros atrasados seguidos para baixar a qualidade
+RECOVER_AFTER = 180  # Quadros folgados seguidos para subir a qualidade
+HEADROOM = 0.6  # Folgado: trabalho abaixo desta fração de um tick
+
+QUALITY_FULL = 0
+QUALITY_REDUCED = 1  # Menos estrelas
+QUALITY_MINIMAL = 2  # Menos estrelas e sem explosões
+QUALITY_NAMES = {QUALITY_FULL: "completa", QUALITY_REDUCED: "reduzida", QUALITY_MINIMAL: "mínima"}
+
+
+class FramePacer:
+    """Acumulador de tempo real com pulo de quadros e qualidade adaptativa"""
+    def __init__(self, tick_rate, max_frame_time=MAX_FRAME_TIME, max_skip=MAX_SKIP,
+                 max_quality=QUALITY_MINIMAL, clock=time.perf_counter):
+        self.tick_dt = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.max_skip = max_skip
+        self.max_quality = max_quality  # Nível mais baixo que o jogo sabe desenhar
+        self.clock = clock
+        self.accumulator = 0.0
+        self.render = True  # Este quadro deve ser desenhado
+        self.quality = QUALITY_FULL
+        # Estatísticas da sessão
+        self.frames = 0
+        self.skipped = 0
+        self.late = 0
+        self.ticks = 0
+        self.lost_time = 0.0  # Tempo real descartado por max_frame_time (o jogo ficou mais lento)
+        self.degraded_frames = 0
+        self._previous = None
+        self._start = 0.0
+        self._was_late = False
+        self._skips_in_row = 0
+        self._late_in_row = 0
+        self._fast_in_row = 0
+
+    @property
+    def alpha(self):
+        """Fração do próximo tick já decorrida, para interpolar o desenho"""
+        return self.accumulator / self.tick_dt
+
+    def reset(self):
+        """Zera o acumulador e esquece o quadro anterior (fora da partida, onde
+        não há ticks: o tempo parado num menu não conta como atraso)"""
+        self.accumulator = 0.0
+        self._previous = None
+        self._was_late = False
+
+    def begin_frame(self):
+        now = self.clock()
+        if self._previous is not None:
+            elapsed = now - self._previous
+            if elapsed > self.max_frame_time:
+                self.lost_time += elapsed - self.max_frame_time
+                elapsed = self.max_frame_time
+            self.accumulator += elapsed
+        self._previous = self._start = now
+        self.frames += 1
+        # Depois de um quadro atrasado, este só alcança o relógio
+        self.render = not (self._was_late and self._skips_in_row < self.max_skip)
+        if self.render:
+            self._skips_in_row = 0
+        else:
+            self._skips_in_row += 1
+            self.skipped += 1
+        if self.quality != QUALITY_FULL:
+            self.degraded_frames += 1
+
+    def tick(self):
+        """True se há um tick de lógica a rodar agora (e o desconta)"""
+        if self.accumulator < self.tick_dt:
+            return False
+        self.accumulator -= self.tick_dt
+        self.ticks += 1
+        return True
+
+    def end_frame(self):
+        """Fecha o quadro (antes de esperar o clock) e ajusta a qualidade"""
+        work = self.clock() - self._start
+        self._was_late = work > self.tick_dt
+        if self._was_late:
+            self.late += 1
+        if not self.render:
+            return  # Só a lógica: não diz nada sobre o custo do desenho
+        if self._was_late:
+            self._late_in_row += 1
+            self._fast_in_row = 0
+            if self._late_in_row >= DEGRADE_AFTER and self.quality < self.max_quality:
+                self.quality += 1
+                self._late_in_row = 0
+        else:
+            self._late_in_row = 0
+            if work < self.tick_dt * HEADROOM:
+                self._fast_in_row += 1
+                if self._fast_in_row >= RECOVER_AFTER and self.quality > QUALITY_FULL:
+                    self.quality -= 1
+                    self._fast_in_row = 0
+            else:
+                self._fast_in_row = 0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "rendered": self.frames - self.skipped,
+            "skipped": self.skipped,
+            "late": self.late,
+            "degraded": self.degraded_frames,
+            "ticks": self.ticks,
+            "lost_ms": self.lost_time * 1000,
+        }
+
+    def report(self):
+        """Resumo de uma linha dos quadros da sessão"""
+        stats = self.stats()
+        frames = max(stats["frames"], 1)
+        return (f"{stats['frames']} quadros: {stats['skipped']} pulados ({stats['skipped'] / frames:.1%}), "
+                f"{stats['late']} atrasados, {stats['degraded']} com qualidade reduzida; "
+                f"{stats['ticks']} ticks, {stats['lost_ms']:.0f} ms descartados")
@@ -0,0 +1,91 @@
+"""Reaproveitamento de entidades de vida curta (tiros, explosões, canos).
+
+Em vez de criar um objeto por tiro e deixá-lo para o coletor de lixo, os
+objetos que saem de jogo voltam para um pool e são reiniciados com reset()
+quando alguém precisa de um novo. Os objetos só precisam de um construtor e
+de um reset() com os mesmos argumentos.
+"""
+
+
+class SpritePool:
+    """Guarda objetos que saíram de jogo para reaproveitá-los.
+
+    acquire() reinicia um objeto livre com reset(*args) ou, se não houver
+    nenhum, cria um novo com factory(*args). No máximo capacity objetos
+    livres são guardados; capacity=0 desliga o reaproveitamento.
+    """
+    def __init__(self, factory, capacity=None):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.created = 0
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            sprite = self.factory(*args)
+            self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        if self.capacity is None or len(self.free) < self.capacity:
+            self.free.append(sprite)
+
+
+class RingBuffer:
+    """Fila de tamanho fixo para entidades que expiram na ordem em que
+    nasceram (ex.: canos que andam todos na mesma velocidade).
+
+    append() entra no fim e popleft() expira o mais antigo, ambos O(1) e sem
+    mover os demais. O objeto de cada posição é criado uma vez com
+    factory(*args) e depois só reiniciado com reset(*args).
+    """
+    def __init__(self, capacity, factory):
+        self.capacity = capacity
+        self.factory = factory
+        self._slots = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self.created = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RingBuffer index out of range")
+        return self._slots[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        slots, capacity = self._slots, self.capacity
+        for index in range(self._start, self._start + self._count):
+            yield slots[index % capacity]
+
+    def append(self, *args):
+        if self._count == self.capacity:
+            raise IndexError("RingBuffer cheio")
+        index = (self._start + self._count) % self.capacity
+        item = self._slots[index]
+        if item is None:
+            item = self._slots[index] = self.factory(*args)
+            self.created += 1
+        else:
+            item.reset(*args)
+        self._count += 1
+        return item
+
+    def popleft(self):
+        if not self._count:
+            raise IndexError("popleft de RingBuffer vazio")
+        item = self._slots[self._start]
+        self._start = (self._start + 1) % self.capacity
+        self._count -= 1
+        return item
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
@@ -0,0 +1,175 @@
+"""Profiler de tempo de quadro, compartilhado pelos dois jogos.
+
+O loop marca o fim de cada fase com profiler.mark("fase"): o tempo desde a
+marca anterior vai para aquela fase, então as fases somam o quadro inteiro
+(inclusive a espera de clock.tick, na fase "wait"). Por quadro também são
+guardadas contagens de entidades e contadores de alocação.
+
+Desligado, cada chamada só testa um bool. Ligado, os últimos quadros
+alimentam o overlay (F3 nos jogos) e, se houver arquivo de exportação, cada
+quadro vira uma linha de CSV ou um objeto JSON (pela extensão), gravados ao
+sair. O padrão vem da variável de ambiente PROFILE (caminho do arquivo).
+"""
+import csv
+import gc
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+PROFILE = os.environ.get("PROFILE", "")
+DEFAULT_HISTORY = 120  # Quadros usados nas médias do overlay
+OVERLAY_REFRESH = 15  # Quadros entre atualizações do texto do overlay
+OVERLAY_COLOR = (0, 255, 0)
+OVERLAY_BACKGROUND = (0, 0, 0, 180)
+
+
+def _gc_collections():
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+class FrameProfiler:
+    """Tempos por fase, contagens e alocações de cada quadro"""
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.enabled = False
+        self.overlay = False
+        self.path = None
+        self.history = deque(maxlen=history)
+        self.records = []  # Todos os quadros, quando há exportação
+        self.frame = 0
+        # Contadores cumulativos; o registro guarda quanto cresceram no quadro
+        self.counters = {"alloc_blocks": sys.getallocatedblocks, "gc_collections": _gc_collections}
+        self._phases = {}
+        self._counts = {}
+        self._start = self._last = 0.0
+        self._counter_start = {}
+        self._panel = None
+
+    def enable(self, path=None):
+        """Liga a medição; com path, guarda todos os quadros para export()"""
+        self.enabled = True
+        if path:
+            self.path = path
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self._panel = None
+        if self.overlay:
+            self.enabled = True
+        elif not self.path:
+            self.enabled = False
+
+    def watch(self, name, counter):
+        """Registra um contador cumulativo (função sem argumentos) por quadro"""
+        self.counters[name] = counter
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._phases = {}
+        self._counts = {}
+        self._counter_start = {name: counter() for name, counter in self.counters.items()}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Atribui a phase o tempo desde a marca anterior"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def count(self, name, value):
+        if self.enabled:
+            self._counts[name] = value
+
+    def end_frame(self):
+        if not self.enabled or not self._start:
+            return
+        now = time.perf_counter()
+        record = {
+            "frame": self.frame,
+            "total_ms": (now - self._start) * 1000,
+            "phases": {phase: seconds * 1000 for phase, seconds in self._phases.items()},
+            "counts": self._counts,
+            "counters": {name: counter() - self._counter_start.get(name, 0)
+                         for name, counter in self.counters.items()},
+        }
+        self.frame += 1
+        # Um quadro ligado no meio (ex.: F3) só conta a partir de begin_frame
+        self._start = 0.0
+        self.history.append(record)
+        if self.path:
+            self.records.append(record)
+        if self.overlay and self.frame % OVERLAY_REFRESH == 0:
+            self._panel = None
+
+    def summary(self):
+        """Médias dos quadros recentes: (ms por quadro, {fase: ms}, últimas contagens)"""
+        if not self.history:
+            return 0.0, {}, {}
+        frames = len(self.history)
+        phases = {}
+        for record in self.history:
+            for phase, ms in record["phases"].items():
+                phases[phase] = phases.get(phase, 0.0) + ms
+        total = sum(record["total_ms"] for record in self.history) / frames
+        last = self.history[-1]
+        return total, {phase: ms / frames for phase, ms in phases.items()}, dict(last["counts"], **last["counters"])
+
+    def _render_panel(self, font):
+        total, phases, counts = self.summary()
+        fps = 1000 / total if total else 0.0
+        lines = [f"{total:6.2f} ms  {fps:5.0f} FPS"]
+        lines += [f"{phase:<12}{ms:7.3f} ms" for phase, ms in phases.items()]
+        lines += [f"{name:<15}{value:>6}" for name, value in counts.items()]
+        images = [font.render(line, True, OVERLAY_COLOR) for line in lines]
+        height = font.get_linesize()
+        panel = pygame.Surface((max(image.get_width() for image in images) + 8, height * len(images) + 8),
+                               pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+        for i, image in enumerate(images):
+            panel.blit(image, (4, 4 + i * height))
+        return panel
+
+    def draw_overlay(self, renderer, font, pos=(10, 90)):
+        """Desenha o painel (se ligado) pelo renderer; o texto é refeito a cada
+        OVERLAY_REFRESH quadros, não a cada quadro"""
+        if not self.overlay:
+            return
+        if self._panel is None:
+            self._panel = self._render_panel(font)
+        renderer.blit(self._panel, pos)
+
+    def export(self, path=None):
+        """Grava os quadros guardados em CSV ou JSON, conforme a extensão"""
+        path = path or self.path
+        if not path or not self.records:
+            return None
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, "w") as f:
+                json.dump(self.records, f, indent=1)
+            return path
+        phases, counts, counters = {}, {}, {}
+        for record in self.records:
+            phases.update(dict.fromkeys(record["phases"]))
+            counts.update(dict.fromkeys(record["counts"]))
+            counters.update(dict.fromkeys(record["counters"]))
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{phase}_ms" for phase in phases] + list(counts) + list(counters))
+            for record in self.records:
+                writer.writerow([record["frame"], f"{record['total_ms']:.4f}"]
+                                + [f"{record['phases'].get(phase, 0.0):.4f}" for phase in phases]
+                                + [record["counts"].get(name, "") for name in counts]
+                                + [record["counters"].get(name, "") for name in counters])
+        return path
+
+
+# Profiler padrão usado pelos jogos
+profiler = FrameProfiler()
+if PROFILE:
+    profiler.enable(PROFILE)
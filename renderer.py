@@ -0,0 +1,106 @@
+"""Apresentação dos quadros na tela, em dois modos comparáveis:
+
+- "flip": limpa e apresenta a tela inteira todo quadro (comportamento antigo);
+- "dirty": apaga e apresenta só as regiões desenhadas neste quadro e no
+  anterior, e telas estáticas (menus) só são redesenhadas quando mudam, o que
+  permite ao loop dormir em pygame.event.wait() até chegar uma entrada.
+
+O modo padrão vem da variável de ambiente RENDER_MODE.
+"""
+import os
+
+import pygame
+
+FLIP = "flip"
+DIRTY = "dirty"
+RENDER_MODES = (DIRTY, FLIP)
+RENDER_MODE = os.environ.get("RENDER_MODE", DIRTY)
+
+# Eventos que indicam que o conteúdo da janela se perdeu
+_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+
+class Renderer:
+    """Controla o que precisa ser apagado, desenhado e enviado para a tela.
+
+    background é uma cor ou uma Surface do tamanho da tela usada para apagar.
+    """
+    def __init__(self, screen, background=(0, 0, 0), mode=RENDER_MODE):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Modo de renderização inválido: {mode!r}")
+        self.screen = screen
+        self.background = background
+        self.mode = mode
+        self.dirty = []  # Regiões desenhadas neste quadro
+        self._previous = []  # Regiões desenhadas no quadro anterior
+        self._full = True  # O próximo quadro precisa ir inteiro para a tela
+        self.scene = None  # Chave da última tela estática desenhada
+
+    @property
+    def idle(self):
+        """True quando a tela estática atual já está desenhada e apresentada"""
+        return self.mode == DIRTY and self.scene is not None
+
+    def invalidate(self):
+        """Força o redesenho completo no próximo quadro"""
+        self._full = True
+        self.scene = None
+
+    def set_background(self, background):
+        """Troca o fundo (ex.: quando a imagem termina de carregar) e redesenha tudo"""
+        if background is not self.background:
+            self.background = background
+            self.invalidate()
+
+    def handle_event(self, event):
+        if event.type in _EXPOSE_EVENTS:
+            self.invalidate()
+
+    def _clear(self, rect=None):
+        if isinstance(self.background, pygame.Surface):
+            if rect is None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.background, rect)
+
+    def begin(self):
+        """Começa um quadro animado apagando o que o quadro anterior desenhou"""
+        if self.mode == FLIP or self._full:
+            self._clear()
+        else:
+            for rect in self._previous:
+                self._clear(rect)
+        self.scene = None
+
+    def blit(self, image, pos):
+        rect = self.screen.blit(image, pos)
+        self.dirty.append(rect)
+        return rect
+
+    def add(self, rects):
+        """Registra regiões desenhadas diretamente na tela (primitivas, blits())"""
+        self.dirty.extend(rects)
+
+    def present(self):
+        """Envia o quadro animado para a tela"""
+        if self.mode == FLIP or self._full:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(self._previous + self.dirty)
+        self._previous = self.dirty
+        self.dirty = []
+
+    def static(self, key, draw):
+        """Tela estática: draw(screen) só roda quando key muda (ou sempre, em flip)"""
+        if self.mode == DIRTY and key == self.scene:
+            return
+        draw(self.screen)
+        pygame.display.flip()
+        self.scene = key
+        # O próximo quadro animado parte de uma tela desconhecida
+        self._full = True
+        self._previous = []
+        self.dirty = []
@@ -0,0 +1,234 @@
+"""Gravação e replay determinístico de partidas dos dois jogos.
+
+Cada partida usa um random.Random próprio criado a partir de uma semente, e
+a única entrada externa são as teclas de cada tick; com a semente e as
+entradas, a partida pode ser refeita sem tela e na velocidade máxima para
+conferir a pontuação (ex.: validar envios para o placar).
+
+Formato binário (little-endian):
+    cabeçalho  "<4sBBBQIII": b"RPLY", versão, jogo, flags, semente, ticks, score, nível
+    flags:     regras escolhidas na partida (FLAG_*), ex.: o modo de colisão
+    dificuldade: 1 byte de tamanho + texto UTF-8 (vazio no Flappy Bird)
+    entradas:  pares (ação: 1 byte, repetições: varint LEB128), em sequência
+
+Uso: python replay.py ARQUIVO.rpl [...]   (verifica em lote)
+"""
+import argparse
+import os
+import struct
+import time
+
+from io_worker import get_worker
+
+MAGIC = b"RPLY"
+VERSION = 4  # Muda junto com as regras: replays de outra versão não se repetem
+_HEADER = struct.Struct("<4sBBBQIII")
+
+# Jogos
+FLAPPY_BIRD = 0
+GALAGA = 1
+GAME_NAMES = {FLAPPY_BIRD: "flappy_bird", GALAGA: "galaga"}
+
+# Entrada do Flappy Bird (o Galaga usa os bits ACTION_* de galaga.py)
+FLAP = 1
+
+# Bits de Replay.flags
+FLAG_RECT_COLLISION = 1  # Galaga com colisão só por retângulos (sem o bit: "mask")
+
+# Pasta onde as partidas jogadas são salvas (desligado se vazia)
+REPLAY_DIR = os.environ.get("REPLAY_DIR", "")
+
+
+class ReplayError(ValueError):
+    pass
+
+
+class Replay:
+    """Semente + entradas por tick + resultado declarado de uma partida"""
+    def __init__(self, game, seed, difficulty="", actions=None, score=0, level=0, flags=0):
+        self.game = game
+        self.seed = seed
+        self.difficulty = difficulty
+        self.flags = flags
+        self.actions = bytearray(actions or b"")
+        self.score = score
+        self.level = level
+
+    @property
+    def ticks(self):
+        return len(self.actions)
+
+    @staticmethod
+    def collision_flags(collision):
+        """flags de uma partida do Galaga no modo de colisão collision"""
+        return FLAG_RECT_COLLISION if collision == "rect" else 0
+
+    @property
+    def collision(self):
+        """Modo de colisão do Galaga (galaga.COLLISION_MODES) com que a partida foi jogada"""
+        return "rect" if self.flags & FLAG_RECT_COLLISION else "mask"
+
+    def record(self, actions):
+        self.actions.append(actions)
+
+    def finish(self, score, level=0):
+        self.score = score
+        self.level = level
+
+    def to_bytes(self):
+        difficulty = self.difficulty.encode("utf-8")
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.game, self.flags, self.seed, self.ticks, self.score, self.level))
+        out.append(len(difficulty))
+        out += difficulty
+        # Run-length: teclas costumam ficar iguais por vários ticks seguidos
+        actions = self.actions
+        i = 0
+        while i < len(actions):
+            value = actions[i]
+            run = 1
+            while i + run < len(actions) and actions[i + run] == value:
+                run += 1
+            i += run
+            out.append(value)
+            while run >= 0x80:
+                out.append((run & 0x7F) | 0x80)
+                run >>= 7
+            out.append(run)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size + 1:
+            raise ReplayError("Replay truncado")
+        magic, version, game, flags, seed, ticks, score, level = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Arquivo não é um replay")
+        if version != VERSION:
+            raise ReplayError(f"Versão de replay não suportada: {version}")
+        pos = _HEADER.size
+        size = data[pos]
+        try:
+            difficulty = data[pos + 1:pos + 1 + size].decode("utf-8")
+        except UnicodeDecodeError:
+            raise ReplayError("Dificuldade com UTF-8 inválido") from None
+        pos += 1 + size
+        actions = bytearray()
+        try:
+            while pos < len(data):
+                value = data[pos]
+                pos += 1
+                run = shift = 0
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    run |= (byte & 0x7F) << shift
+                    shift += 7
+                    if byte < 0x80:
+                        break
+                actions += bytes((value,)) * run
+        except IndexError:
+            raise ReplayError("Replay truncado") from None
+        if len(actions) != ticks:
+            raise ReplayError("Número de ticks não confere com o cabeçalho")
+        return cls(game, seed, difficulty, actions, score, level, flags)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def _write_file(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def save_to_replay_dir(replay):
+    """Salva em REPLAY_DIR, se configurada; retorna o caminho ou None. A
+    gravação fica para o worker de E/S (o replay é serializado aqui mesmo)."""
+    if not REPLAY_DIR:
+        return None
+    name = f"{GAME_NAMES[replay.game]}_{int(time.time())}_{replay.seed:016x}.rpl"
+    path = os.path.join(REPLAY_DIR, name)
+    get_worker().submit(_write_file, path, replay.to_bytes(), label=f"gravar o replay {path}")
+    return path
+
+
+def run_flappy(replay):
+    """Refaz uma partida do Flappy Bird; retorna (score, nível, ticks até o fim)"""
+    import random
+    import flappy_bird as fb
+
+    rng = random.Random(replay.seed)
+    bird = fb.Bird()
+    pipes = fb.new_pipes(rng)
+    score = 0
+    for tick, actions in enumerate(replay.actions, 1):
+        if actions & FLAP:
+            bird.jump()
+        score, game_over = fb.update_game(bird, pipes, score, rng)
+        if game_over:
+            return score, 0, tick
+    return score, 0, None
+
+
+def run_galaga(replay):
+    """Refaz uma partida do Galaga; retorna (score, nível, ticks até o fim)"""
+    import galaga
+
+    if replay.difficulty not in galaga.DIFFICULTIES:
+        raise ReplayError(f"Dificuldade desconhecida: {replay.difficulty!r}")
+    game = galaga.GalagaGame(replay.difficulty, replay.seed, replay.collision)
+    for actions in replay.actions:
+        game.step(actions)
+        if game.game_over:
+            return game.score, game.level, game.ticks
+    return game.score, game.level, None
+
+
+RUNNERS = {FLAPPY_BIRD: run_flappy, GALAGA: run_galaga}
+
+
+def verify(replay):
+    """True se refazer a partida leva ao mesmo resultado, terminando no último tick"""
+    runner = RUNNERS.get(replay.game)
+    if runner is None:
+        raise ReplayError(f"Jogo desconhecido: {replay.game}")
+    score, level, end_tick = runner(replay)
+    return score == replay.score and level == replay.level and end_tick == replay.ticks
+
+
+def verify_files(paths, report=print):
+    """Verifica os arquivos em ordem, relatando cada um com report; um
+    arquivo ilegível ou inválido não interrompe os seguintes. Retorna
+    {caminho: True (confere), False (não confere) ou None (inválido)}"""
+    results = {}
+    for path in paths:
+        try:
+            replay = Replay.load(path)
+            ok = verify(replay)
+        except (OSError, ReplayError) as error:
+            report(f"{path}: inválido ({error})")
+            results[path] = None
+            continue
+        results[path] = ok
+        status = "ok" if ok else "NÃO CONFERE"
+        report(f"{path}: {GAME_NAMES[replay.game]} score {replay.score} em {replay.ticks} ticks - {status}")
+    return results
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    parser = argparse.ArgumentParser(description="Verifica replays em lote, sem tela")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    valid = sum(ok is True for ok in verify_files(args.files).values())
+    elapsed = time.perf_counter() - start
+    print(f"{valid}/{len(args.files)} replays válidos em {elapsed:.2f}s")
@@ -0,0 +1,174 @@
+"""Broadphase de colisão por grade uniforme (spatial hash) para sprites.
+
+SpatialGroup é um pygame.sprite.Group que também indexa cada sprite pelas
+células da grade cobertas pelo seu rect. spritecollide/groupcollide deste
+módulo consultam só as células vizinhas e retornam exatamente o mesmo
+resultado (mesmos sprites, mesma ordem) que as funções de pygame.sprite.
+Com collided (ex.: pygame.sprite.collide_mask), a grade e os rects são a
+broadphase e collided só é chamado nos pares cujos rects colidem; por isso
+collided precisa implicar colisão dos rects, como collide_mask.
+
+Uso: python spatial_hash.py  (benchmark contra pygame.sprite.groupcollide)
+"""
+import random
+import time
+
+import pygame
+
+DEFAULT_CELL_SIZE = 64
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Grupo de sprites indexado por uma grade uniforme.
+
+    O índice acompanha add()/remove()/kill() automaticamente. Depois de mover
+    os sprites, chame refresh() para re-indexar os que trocaram de célula.
+    """
+    def __init__(self, *sprites, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._bounds = {}  # sprite -> células (x0, y0, x1, y1) cobertas
+        self._order = {}  # sprite -> ordem de inserção, igual à do grupo
+        self._counter = 0
+        super().__init__(*sprites)
+
+    def _cell_bounds(self, rect):
+        size = self.cell_size
+        # Rects de largura/altura zero não ocupam célula nenhuma, assim como
+        # nunca colidem em Rect.colliderect
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _insert(self, sprite, bounds):
+        cells = self.cells
+        x0, y0, x1, y1 = bounds
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = {sprite}
+                else:
+                    cell.add(sprite)
+
+    def _discard(self, sprite, bounds):
+        cells = self.cells
+        x0, y0, x1, y1 = bounds
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cells[(cx, cy)].discard(sprite)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        bounds = self._cell_bounds(sprite.rect)
+        self._bounds[sprite] = bounds
+        self._order[sprite] = self._counter
+        self._counter += 1
+        self._insert(sprite, bounds)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._discard(sprite, self._bounds.pop(sprite))
+        del self._order[sprite]
+
+    def refresh(self):
+        """Re-indexa os sprites cujo rect mudou de célula desde a última vez"""
+        cell_bounds = self._cell_bounds
+        moved = []
+        for sprite, old in self._bounds.items():
+            new = cell_bounds(sprite.rect)
+            if new != old:
+                moved.append((sprite, old, new))
+        for sprite, old, new in moved:
+            self._discard(sprite, old)
+            self._insert(sprite, new)
+            self._bounds[sprite] = new
+
+    def candidates(self, rect):
+        """Sprites nas células cobertas por rect (pode incluir falsos positivos)"""
+        x0, y0, x1, y1 = self._cell_bounds(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def collide(self, rect):
+        """Sprites cujo rect colide com rect, na ordem do grupo"""
+        hits = [sprite for sprite in self.candidates(rect) if rect.colliderect(sprite.rect)]
+        if len(hits) > 1:
+            hits.sort(key=self._order.__getitem__)
+        return hits
+
+
+def spritecollide(sprite, group, dokill, collided=None):
+    """Equivalente a pygame.sprite.spritecollide usando o índice do grupo"""
+    if not isinstance(group, SpatialGroup):
+        return pygame.sprite.spritecollide(sprite, group, dokill, collided)
+    hits = group.collide(sprite.rect)
+    if collided is not None and hits:
+        hits = [group_sprite for group_sprite in hits if collided(sprite, group_sprite)]
+    if dokill:
+        for group_sprite in hits:
+            group_sprite.kill()
+    return hits
+
+
+def groupcollide(groupa, groupb, dokilla, dokillb, collided=None):
+    """Equivalente a pygame.sprite.groupcollide usando o índice de groupb"""
+    crashed = {}
+    for sprite in groupa.sprites():
+        collision = spritecollide(sprite, groupb, dokillb, collided)
+        if collision:
+            crashed[sprite] = collision
+            if dokilla:
+                sprite.kill()
+    return crashed
+
+
+def _make_sprite(x, y, w, h):
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(x, y, w, h)
+    return sprite
+
+
+def benchmark(counts=(100, 1000, 10000, 20000), rounds=5, seed=0):
+    """Compara groupcollide da pygame com a grade, com densidade constante"""
+    rng = random.Random(seed)
+    print(f"{'inimigos':>9} {'tiros':>7} {'pygame (ms)':>12} {'grade (ms)':>11} {'ganho':>7}")
+    for count in counts:
+        # Área cresce com o número de entidades: ~60x60 px por inimigo
+        side = int((count ** 0.5) * 60)
+        enemies = [_make_sprite(rng.randrange(side), rng.randrange(side), 30, 30) for _ in range(count)]
+        bullets = [_make_sprite(rng.randrange(side), rng.randrange(side), 4, 10) for _ in range(count // 10)]
+        plain = pygame.sprite.Group(enemies)
+        indexed = SpatialGroup(enemies)
+        shots = pygame.sprite.Group(bullets)
+
+        plain_time = grid_time = 0.0
+        for _ in range(rounds):
+            for enemy in enemies:
+                enemy.rect.move_ip(rng.randint(-3, 3), rng.randint(-3, 3))
+
+            start = time.perf_counter()
+            expected = pygame.sprite.groupcollide(shots, plain, False, False)
+            plain_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            indexed.refresh()
+            got = groupcollide(shots, indexed, False, False)
+            grid_time += time.perf_counter() - start
+
+            assert got == expected, "resultado diferente de pygame.sprite.groupcollide"
+
+        plain_ms = plain_time / rounds * 1000
+        grid_ms = grid_time / rounds * 1000
+        print(f"{count:>9} {len(bullets):>7} {plain_ms:>12.3f} {grid_ms:>11.3f} {plain_ms / grid_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,67 @@
+"""Verificação de replays em lote (python replay.py): um arquivo inválido é
+relatado e não interrompe a verificação dos seguintes."""
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pytest
+
+import replay as rp
+
+
+def flappy_replay(seed):
+    """Partida sem pulos até o pássaro cair, com o resultado declarado certo"""
+    import flappy_bird as fb
+
+    rng = random.Random(seed)
+    bird, pipes = fb.Bird(), fb.new_pipes(rng)
+    recorded = rp.Replay(rp.FLAPPY_BIRD, seed)
+    score = 0
+    game_over = False
+    while not game_over:
+        recorded.record(0)
+        score, game_over = fb.update_game(bird, pipes, score, rng)
+    recorded.finish(score)
+    return recorded
+
+
+def bad_utf8_difficulty():
+    data = bytearray(rp.Replay(rp.GALAGA, 1, "Fácil", bytes(10)).to_bytes())
+    size = data[rp._HEADER.size]
+    start = rp._HEADER.size + 1
+    data[start:start + size] = b"\xff" * size
+    return bytes(data)
+
+
+def write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_bad_utf8_difficulty_is_a_replay_error():
+    with pytest.raises(rp.ReplayError):
+        rp.Replay.from_bytes(bad_utf8_difficulty())
+
+
+def test_unknown_galaga_difficulty_is_a_replay_error():
+    with pytest.raises(rp.ReplayError):
+        rp.verify(rp.Replay(rp.GALAGA, 1, "Hacker", bytes(10)))
+
+
+def test_batch_continues_after_invalid_files(tmp_path):
+    paths = [
+        write(tmp_path, "utf8.rpl", bad_utf8_difficulty()),
+        write(tmp_path, "hacker.rpl", rp.Replay(rp.GALAGA, 1, "Hacker", bytes(10)).to_bytes()),
+        write(tmp_path, "ok1.rpl", flappy_replay(1).to_bytes()),
+        write(tmp_path, "ok2.rpl", flappy_replay(2).to_bytes()),
+    ]
+    lines = []
+    results = rp.verify_files(paths, report=lines.append)
+    assert results == {paths[0]: None, paths[1]: None, paths[2]: True, paths[3]: True}
+    assert "inválido" in lines[0] and "inválido" in lines[1]
+    assert lines[2].endswith("ok") and lines[3].endswith("ok")
@@ -0,0 +1,66 @@
+"""Cache de textos renderizados, compartilhado pelos dois jogos.
+
+font.render é caro e os textos de HUD e menus quase nunca mudam: a chave é
+(fonte, texto, cor), então um valor novo (ex.: "Score: 130") só gera uma
+renderização quando aparece, e as entradas antigas saem por LRU.
+"""
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class TextCache:
+    """Cache LRU de Surfaces de texto, com contadores de acerto e memória"""
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        self.bytes += _surface_bytes(surface)
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= _surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.bytes,
+        }
+
+
+def _surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+# Cache padrão usado pelos jogos
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    """Equivalente a font.render(text, True, color), com cache"""
+    return text_cache.render(font, text, color)
@@ -0,0 +1,134 @@
+"""Trajetórias pré-calculadas para os padrões de movimento dos inimigos.
+
+Uma Trajectory é uma tabela com o deslocamento inteiro (dx, dy) de cada tick
+e se, naquele tick, o inimigo acompanha o vaivém da formação (speed_x, com
+troca de sentido nas bordas). O inimigo guarda só o índice do tick atual: a
+cada update soma a linha da tabela e avança o índice, que no fim volta para
+loop_start. Assim uma tabela pode ter uma entrada tocada uma vez (ex.: o voo
+até a formação) seguida de um trecho que se repete.
+
+As curvas são splines Catmull-Rom amostradas uma vez, com velocidade
+constante ao longo do caminho. As posições são arredondadas antes de virar
+deslocamentos, então os deslocamentos somam exatamente o caminho e o
+inimigo termina sempre no ponto final.
+"""
+import bisect
+import math
+
+SPLINE_SAMPLES = 32  # Amostras por trecho da spline no cálculo do comprimento
+
+
+class Trajectory:
+    """Deslocamento (dx, dy) e flag de vaivém de cada tick de um padrão"""
+    def __init__(self, steps, loop_start=0, leaves_screen=False):
+        """steps: [(dx, dy, sweep), ...], um por tick; leaves_screen: o
+        inimigo sai de jogo ao passar da parte de baixo da tela"""
+        if not 0 <= loop_start < len(steps):
+            raise ValueError(f"loop_start fora da tabela: {loop_start} (tamanho {len(steps)})")
+        self.dx = tuple(int(dx) for dx, _, _ in steps)
+        self.dy = tuple(int(dy) for _, dy, _ in steps)
+        self.sweep = tuple(bool(sweep) for _, _, sweep in steps)
+        # Índice do tick seguinte, já com a volta para loop_start
+        self.next = tuple(range(1, len(steps))) + (loop_start,)
+        self.loop_start = loop_start
+        self.leaves_screen = leaves_screen
+        # Deslocamento total da entrada (os ticks antes de loop_start)
+        self.entry_offset = sum(self.dx[:loop_start]), sum(self.dy[:loop_start])
+
+    def __len__(self):
+        return len(self.dx)
+
+    def steps(self):
+        return list(zip(self.dx, self.dy, self.sweep))
+
+    def then(self, other):
+        """Esta trajetória uma vez, seguida de other (que mantém o seu laço)"""
+        return Trajectory(self.steps() + other.steps(), len(self) + other.loop_start, other.leaves_screen)
+
+    def mirrored(self):
+        """A mesma trajetória espelhada na horizontal"""
+        return Trajectory([(-dx, dy, sweep) for dx, dy, sweep in self.steps()], self.loop_start,
+                          self.leaves_screen)
+
+
+def hold(ticks=1, sweep=True):
+    """Parado (só o vaivém da formação, se sweep) por ticks ticks"""
+    return Trajectory([(0, 0, sweep)] * ticks)
+
+
+def wave(period, amplitude, sweep=True):
+    """Sobe e desce com velocidade vertical amplitude * seno, num período
+    inteiro de ticks (os deslocamentos somam zero), acompanhando o vaivém"""
+    return Trajectory([(0, round(amplitude * math.sin(2 * math.pi * t / period)), sweep)
+                       for t in range(1, period + 1)])
+
+
+def _catmull_rom(p0, p1, p2, p3, t):
+    t2, t3 = t * t, t * t * t
+    return tuple(0.5 * (2 * b + (c - a) * t + (2 * a - 5 * b + 4 * c - d) * t2 + (3 * b - a - 3 * c + d) * t3)
+                 for a, b, c, d in zip(p0, p1, p2, p3))
+
+
+def _sample_spline(points, closed):
+    """Pontos densos da spline que passa por todos os points, em ordem"""
+    samples = [points[0]]
+    last = len(points) - 1
+    for i in range(last):
+        # Nas pontas, o vizinho que falta é o próprio ponto (curva aberta) ou
+        # o do outro lado (curva fechada, points[-1] == points[0])
+        if i > 0:
+            p0 = points[i - 1]
+        else:
+            p0 = points[-2] if closed else points[0]
+        if i + 2 <= last:
+            p3 = points[i + 2]
+        else:
+            p3 = points[1] if closed else points[last]
+        for step in range(1, SPLINE_SAMPLES + 1):
+            samples.append(_catmull_rom(p0, points[i], points[i + 1], p3, step / SPLINE_SAMPLES))
+    return samples
+
+
+def spline(points, speed, sweep=False, closed=False):
+    """Caminho pela spline que passa por points, a speed px por tick.
+
+    Os deslocamentos são relativos: o inimigo anda points[-1] - points[0] no
+    total, de onde quer que comece. closed: points[-1] repete points[0] e a
+    curva fecha sem bico.
+    """
+    if len(points) < 2:
+        raise ValueError("A spline precisa de pelo menos dois pontos")
+    samples = _sample_spline(points, closed)
+    lengths = [0.0]
+    for (x0, y0), (x1, y1) in zip(samples, samples[1:]):
+        lengths.append(lengths[-1] + math.hypot(x1 - x0, y1 - y0))
+    total = lengths[-1]
+    ticks = max(1, math.ceil(total / speed))
+
+    # Posições igualmente espaçadas ao longo do caminho (velocidade constante)
+    start_x, start_y = points[0]
+    xs, ys = [0], [0]
+    for tick in range(1, ticks + 1):
+        distance = total * tick / ticks
+        i = min(bisect.bisect_left(lengths, distance), len(lengths) - 1)
+        segment = lengths[i] - lengths[i - 1] if i else 0.0
+        fraction = (distance - lengths[i - 1]) / segment if segment else 1.0
+        (x0, y0), (x1, y1) = samples[max(i - 1, 0)], samples[i]
+        xs.append(round(x0 + (x1 - x0) * fraction - start_x))
+        ys.append(round(y0 + (y1 - y0) * fraction - start_y))
+    # O último ponto é exato, para os deslocamentos somarem o caminho inteiro
+    end_x, end_y = points[-1]
+    xs[-1], ys[-1] = round(end_x - start_x), round(end_y - start_y)
+    return Trajectory(_deltas(xs, ys, sweep))
+
+
+def loop(radius, speed, points=8, sweep=False):
+    """Volta completa para baixo, num círculo de raio radius, terminando
+    onde começou"""
+    circle = [(radius * math.sin(2 * math.pi * i / points), radius * (1 - math.cos(2 * math.pi * i / points)))
+              for i in range(points)]
+    return spline(circle + circle[:1], speed, sweep, closed=True)
+
+
+def _deltas(xs, ys, sweep):
+    return [(x1 - x0, y1 - y0, sweep) for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:])]